@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" batch.py summarizes the convergence of every run case under ``data/convergence`` in a single table instead of a
+figure per run, see :py:class:`analysis.convergence.ConvergencePlot`. Run cases are analyzed by a pool of worker
+processes, for every run the table holds:
+
+* ``state``, ``converged`` or ``stalled`` following the criteria of :py:class:`analysis.monitor.ConvergenceMonitor`,
+  otherwise ``too_short`` if the run holds fewer iterations than the window and else ``unconverged``
+* ``min_drop`` and ``max_drop``, the least and most orders of magnitude any residual dropped from its peak, together
+  with the ``worst`` residual
+* ``iter_<threshold>``, the first iteration at which all residuals are below the threshold
+* ``inlet_drift``, the change of the inlet momentum over the last ``window`` iterations relative to its mean
+* ``inlet_oscillation``, the amplitude of the inlet momentum about a straight line fitted through the last ``window``
+  iterations, relative to its mean
+"""
+
+import os
+import csv
+from collections import OrderedDict
+from multiprocessing import Pool, cpu_count
+import numpy as np
+from directories import DIRS
+from analysis.cfx import read_cfx
+from analysis.monitor import ConvergenceMonitor, RUNNING
+
+__all__ = ['discover', 'analyze', 'summarize', 'report', 'write_csv']
+
+RESIDUALS = ('heat', 'momentum', 'turbulence')
+THRESHOLDS = (1e-4, 1e-5, 1e-6)
+
+
+def discover(directory=None, required=RESIDUALS + ('inlet',)):
+    """ Finds every run case directory that holds all required convergence histories
+
+    :param str directory: Directory of the run cases (Optional: Defaults to ``data/convergence``)
+    :param tuple required: Names of the ``.csv`` files a run case has to hold
+    :return: Paths of the run cases in alphabetical order
+    :rtype: list[str]
+    """
+    directory = directory if directory is not None else os.path.join(DIRS['DATA_DIR'], 'convergence')
+    runs = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isdir(path) and all(os.path.isfile(os.path.join(path, '{}.csv'.format(key))) for key in required):
+            runs.append(path)
+    return runs
+
+
+def analyze(directory, thresholds=THRESHOLDS, window=200):
+    """ Computes the convergence measures of a single run case, see the module docstring
+
+    :param str directory: Directory of the run case holding ``heat.csv``, ``inlet.csv``, ``momentum.csv`` and
+                          ``turbulence.csv``
+    :param tuple thresholds: Residuals for which the first iteration with all residuals below it is given
+    :param int window: Number of final iterations over which the inlet momentum is evaluated
+    :rtype: collections.OrderedDict
+    """
+    histories = [read_cfx(os.path.join(directory, '{}.csv'.format(name))) for name in RESIDUALS]
+    iterations = histories[0][histories[0].dtype.names[0]]
+
+    # Residuals of all files as columns on the common iterations, columns that are zero throughout are left out
+    labels, columns = [], []
+    for history in histories:
+        steps = history[history.dtype.names[0]]
+        for label in history.dtype.names[1:]:
+            if history[label].max() > 0.:
+                labels.append(label)
+                columns.append(np.interp(iterations, steps, history[label]))
+    residuals = np.maximum(np.column_stack(columns), 1e-300)
+    drops = np.log10(residuals.max(axis=0) / residuals[-1])
+    envelope = residuals.max(axis=1)
+
+    inlet = read_cfx(os.path.join(directory, 'inlet.csv'))
+    momentum = inlet[inlet.dtype.names[1]][-window:]
+    scale = max(abs(momentum.mean()), 1e-300)
+    steps = np.arange(momentum.size)
+    trend = np.polyval(np.polyfit(steps, momentum, 1), steps) if momentum.size > 1 else momentum
+
+    # A finished run is never running, it either lacks the iterations to judge it or did not converge
+    state = ConvergenceMonitor(directory, window=window, capacity=max(2048, window)).poll()['state']
+    if state == RUNNING:
+        state = 'too_short' if min(iterations.size, inlet.size) < window else 'unconverged'
+
+    row = OrderedDict([('run', os.path.basename(os.path.normpath(directory))),
+                       ('state', state),
+                       ('iterations', int(iterations[-1])),
+                       ('min_drop', float(drops.min())), ('max_drop', float(drops.max())),
+                       ('worst', labels[int(np.argmin(drops))]),
+                       ('final_residual', float(envelope[-1]))])
+    for threshold in thresholds:
+        below = envelope <= threshold
+        row['iter_{:.0e}'.format(threshold)] = int(iterations[np.argmax(below)]) if below.any() else None
+    row['inlet_drift'] = float((momentum[-1] - momentum[0]) / scale)
+    row['inlet_oscillation'] = float(np.ptp(momentum - trend) / 2. / scale)
+    return row
+
+
+def _analyze(task):
+    directory, options = task
+    return analyze(directory, **options)
+
+
+def summarize(directories=None, processes=None, **options):
+    """ Analyzes run cases with a pool of worker processes, one run case per task
+
+    :param list directories: Directories of the run cases (Optional: Defaults to all cases found by :py:func:`discover`)
+    :param int processes: Number of worker processes (Optional: Defaults to the number of CPUs, 1 runs serially)
+    :param options: Keyword arguments of :py:func:`analyze`
+    :return: One row per run case in the order of ``directories``
+    :rtype: list[collections.OrderedDict]
+    """
+    directories = directories if directories is not None else discover()
+    tasks = [(directory, options) for directory in directories]
+    processes = min(processes if processes is not None else cpu_count(), len(tasks))
+    if processes <= 1:
+        return [_analyze(task) for task in tasks]
+    pool = Pool(processes)
+    try:
+        return pool.map(_analyze, tasks, chunksize=max(1, len(tasks) // (4 * processes)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _format(value):
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return '{:.3g}'.format(value)
+    return str(value)
+
+
+def report(rows):
+    """ Formats the summary of the run cases as an aligned text table
+
+    :param list rows: Rows returned by :py:func:`summarize`
+    :rtype: str
+    """
+    if not rows:
+        return ''
+    keys = list(rows[0].keys())
+    cells = [keys] + [[_format(row[key]) for key in keys] for row in rows]
+    widths = [max(len(line[column]) for line in cells) for column in range(len(keys))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in cells)
+
+
+def write_csv(rows, filename):
+    """ Writes the summary of the run cases to a ``.csv`` file
+
+    :param list rows: Rows returned by :py:func:`summarize`
+    :param str filename: Path of the file
+    """
+    with open(filename, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(rows[0].keys()) if rows else [])
+        for row in rows:
+            writer.writerow(['' if value is None else value for value in row.values()])
+
+
+if __name__ == '__main__':
+    print(report(summarize()))
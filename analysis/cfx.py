@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" cfx.py reads the CSV files exported by CFX-Post and the CFX-Solver Manager, such as polyline charts and monitor
+plots, which consist of a ``[Name]`` and a ``[Data]`` section::
+
+    [Name]
+    Series 1 at PressurePorts
+
+    [Data]
+    X [ m ],Cp [ m s^-1 ]
+    3.56211931e-001, -2.03411296e-001
+
+The numeric block is converted at once into a structured array with a field per column, named after the column header
+without its unit. Converted files are cached as ``.npy`` files in ``data/cache/cfx``, an entry is valid as long as the
+size and modification time of the exported file are unchanged.
+"""
+
+import os
+import re
+import glob
+import hashlib
+import tempfile
+from collections import OrderedDict
+import numpy as np
+from directories import DIRS
+from utils import Attribute
+
+__all__ = ['CFXFile', 'parse_header', 'read_cfx']
+
+# Atomic rename that overwrites an existing entry, ``os.rename`` does the same on POSIX for Python 2
+_replace = getattr(os, 'replace', os.rename)
+
+_COLUMN = re.compile(r'^\s*"?\s*(.*?)\s*(?:\[\s*(.*?)\s*\])?\s*"?\s*$')
+
+
+def parse_header(line):
+    """ Splits the header line of a ``[Data]`` section into the label and unit of every column, the unit is empty for
+    dimensionless columns
+
+    :param str line: Header line, e.g. ``X [ m ],Cp [ m s^-1 ]``
+    :rtype: collections.OrderedDict
+    """
+    return OrderedDict(_COLUMN.match(column).groups('') for column in line.strip().split(','))
+
+
+class CFXFile(object):
+
+    cache_directory = os.path.join(DIRS['DATA_DIR'], 'cache', 'cfx')
+
+    def __init__(self, filename, cache=True):
+        """ CSV file exported by CFX with a single ``[Data]`` section
+
+        :param str filename: Path of the exported file
+        :param bool cache: Toggles reading from and writing to the ``.npy`` cache
+        """
+        self.filename = filename
+        self.cache = cache
+
+    @Attribute
+    def raw(self):
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
+    @Attribute
+    def sections(self):
+        """ Byte-offsets of the header line and of the end of the ``[Data]`` section, which ends at the next section or
+        at the end of the file
+
+        :rtype: tuple
+        """
+        match = re.search(br'^\[Data\][ \t]*\r?$', self.raw, re.MULTILINE)
+        if match is None:
+            raise ValueError('{} holds no [Data] section'.format(self.filename))
+        end = re.compile(br'^\[[A-Za-z ]+\][ \t]*\r?$', re.MULTILINE).search(self.raw, match.end())
+        return match.end() + 1, end.start() if end is not None else len(self.raw)
+
+    @Attribute
+    def name(self):
+        """ Name of the exported series or monitor given in the ``[Name]`` section """
+        match = re.search(br'^\[Name\][ \t]*\r?\n\s*([^\r\n]*)', self.raw, re.MULTILINE)
+        return match.group(1).decode('latin-1').strip() if match is not None else ''
+
+    @Attribute
+    def header(self):
+        """ Label and unit of every column, the unit is empty for dimensionless columns
+
+        :rtype: collections.OrderedDict
+        """
+        start, end = self.sections
+        return parse_header(self.raw[start:end].lstrip().splitlines()[0].decode('latin-1'))
+
+    @property
+    def labels(self):
+        return list(self.header.keys())
+
+    @property
+    def units(self):
+        return list(self.header.values())
+
+    @property
+    def cache_filename(self):
+        """ Cache entry of the file, named after a hash of its absolute path together with its size and modification
+        time such that an exported file that is overwritten invalidates its entry """
+        stat = os.stat(self.filename)
+        digest = hashlib.sha1(os.path.abspath(self.filename).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_directory, '{}_{}_{}.npy'.format(digest, stat.st_size,
+                                                                        int(stat.st_mtime * 1e6)))
+
+    def parse(self):
+        """ Converts the numeric block of the ``[Data]`` section in a single call
+
+        :rtype: numpy.ndarray
+        """
+        start, end = self.sections
+        body = self.raw[start:end].lstrip()
+        body = body[body.find(b'\n') + 1:] if b'\n' in body else b''
+        values = np.array(body.replace(b',', b' ').split(), dtype=np.float64)
+        columns = len(self.header)
+        if values.size % columns:
+            raise ValueError('{} holds {} values, which do not fill {} columns'.format(self.filename, values.size,
+                                                                                        columns))
+        dtype = np.dtype([(label, np.float64) for label in self.labels])
+        return values.reshape(-1, columns).copy().view(dtype).reshape(-1)
+
+    @Attribute
+    def data(self):
+        """ Numeric block of the ``[Data]`` section as a structured array with a field per column
+
+        :rtype: numpy.ndarray
+        """
+        if not self.cache:
+            return self.parse()
+
+        filename = self.cache_filename
+        try:
+            return np.load(filename)
+        except (IOError, OSError, ValueError):
+            pass  # Missing or unreadable entries are treated as a miss
+
+        data = self.parse()
+        try:
+            os.makedirs(self.cache_directory)
+        except OSError:
+            if not os.path.isdir(self.cache_directory):
+                raise
+        for stale in glob.glob(filename.rsplit('_', 2)[0] + '_*.npy'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=self.cache_directory)
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                np.save(output, data)
+            _replace(temporary, filename)
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return data
+
+
+def read_cfx(filename, cache=True):
+    """ Reads the ``[Data]`` section of a CSV file exported by CFX, see :py:class:`CFXFile`
+
+    :param str filename: Path of the exported file
+    :param bool cache: Toggles reading from and writing to the ``.npy`` cache
+    :return: Structured array with a field per column, named after the column header without its unit
+    :rtype: numpy.ndarray
+    """
+    return CFXFile(filename, cache=cache).data
+
+
+if __name__ == '__main__':
+    from timeit import default_timer as timer
+    exports = [os.path.join(root, name) for root, _, names in os.walk(DIRS['DATA_DIR'])
+               for name in names if 'cache' not in root and name.endswith(('.csv', '.dat'))]
+    exports = [filename for filename in exports if b'[Data]' in CFXFile(filename).raw]
+    for attempt in ('parsed', 'cached'):
+        start = timer()
+        rows = sum(read_cfx(filename).size for filename in exports)
+        print('{} {} rows of {} files in {:.1f} ms'.format(attempt, rows, len(exports), (timer() - start) * 1e3))
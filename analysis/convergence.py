@@ -19,6 +19,7 @@ import os
 import matplotlib.pyplot as plt
 from directories import DIRS
 from utils import Attribute
+from analysis.cfx import read_cfx
 
 
 class ConvergencePlot(object):
@@ -47,20 +48,8 @@ class ConvergencePlot(object):
     def data_dict(self):
         _dict = {}
         for plot in self.required_plots:
-            with open(os.path.join(self.working_directory, '{}.csv'.format(plot))) as file:
-                data = [line.replace('\n', '') for line in file.readlines() if line != '\n']
-                header_idx = data.index('[Data]') + 1
-
-                data = data[header_idx:]
-                header = data.pop(0).split(',')
-                labels = [l.replace('"', '') for l in header]
-                #
-                # Converting string lines to
-                data = [[float(num) if i > 0 else int(num) for i, num in enumerate(line.split(','))]
-                        for line in data if line != []]
-
-                # Assigning current data-set to dictionary
-                _dict[plot] = {'data': data, 'labels': labels}
+            data = read_cfx(os.path.join(self.working_directory, '{}.csv'.format(plot)))
+            _dict[plot] = {'data': data, 'labels': list(data.dtype.names)}
         return _dict
 
     def plot(self, show=False):
@@ -120,11 +109,8 @@ class ConvergencePlot(object):
         fig.savefig(fname=os.path.join(DIRS['FIGURE_DIR'], '%s' % fig.get_label()))
 
     def fetch_column(self, key, col):
-        _d, idx = self.data_dict, self.required_plots.index(key)
-        try:
-            return [x[col] for x in _d[key]['data']]
-        except IndexError as e:
-            raise e
+        _d = self.data_dict[key]
+        return _d['data'][_d['labels'][col]]
 
 
 if __name__ == '__main__':
@@ -20,6 +20,7 @@ import matplotlib.pyplot as plt
 from directories import DIRS
 from utils import Attribute
 from analysis.inflow import V
+from analysis.cfx import read_cfx
 
 
 class FarfieldPlot(object):
@@ -41,21 +42,13 @@ class FarfieldPlot(object):
     def data_dict(self):
         _dict = {}
         for csv_file in os.listdir(self.working_directory):
-            with open(os.path.join(self.working_directory, csv_file)) as f:
-                data = [line.replace('\n', '') for line in f.readlines() if line != '\n']
-                header_idx = data.index('[Data]') + 1
-
-                data = data[header_idx:]
-                header = data.pop(0).split(',')
-                labels = [l.replace('"', '') for l in header]
-                #
-                # Converting string lines to
-                data = [[float(num) for num in line.split(',')] for line in data if line != []]
+            if csv_file.endswith('.csv'):
+                data = read_cfx(os.path.join(self.working_directory, csv_file))
 
                 # Type of Run
                 run = 'SST' if 'SST' in csv_file else 'SSG'
                 # Assigning current data-set to dictionary
-                _dict[run] = {'data': data, 'labels': labels}
+                _dict[run] = {'data': data, 'labels': list(data.dtype.names)}
         return _dict
 
     def plot(self, save=True):
@@ -142,10 +135,8 @@ class FarfieldPlot(object):
     #     fig.savefig(fname=os.path.join(DIRS['FIGURE_DIR'], '%s' % fig.get_label()))
 
     def fetch_column(self, key, col):
-        try:
-            return [x[col] for x in self.data_dict[key]['data']]
-        except IndexError as e:
-            raise e
+        _d = self.data_dict[key]
+        return _d['data'][_d['labels'][col]]
 
 
 if __name__ == '__main__':
@@ -29,22 +29,12 @@ def sutherland():
 
 mu = sutherland()
 
-print(mu)
-print('Density = {}'.format(rho))
-print('Velocity = {}'.format(V))
-print('Temperature = {}'.format(t_static))
-print('Static Pressure = {}'.format(p_static))
-print('Dynamic Pressure = {}'.format(0.5 * rho * V**2))
-
 # V_pres = sqrt((p_total - p_static)/(0.5 * rho))
 # print(V_pres)
 
 c = (Re * mu) / (rho * V)
-print('Chord Length = {}'.format(c))
 # print(c/2.)
 
-sqrt(170.847/rho)
-
 
 def yplus():
     return
@@ -54,4 +44,13 @@ def get_coefficient(force):
     return force / (0.5 * rho * (V**2) * c**2)
 
 
-print(get_coefficient(3679.2))
+if __name__ == '__main__':
+    print(mu)
+    print('Density = {}'.format(rho))
+    print('Velocity = {}'.format(V))
+    print('Temperature = {}'.format(t_static))
+    print('Static Pressure = {}'.format(p_static))
+    print('Dynamic Pressure = {}'.format(0.5 * rho * V**2))
+    print('Chord Length = {}'.format(c))
+    print(sqrt(170.847/rho))
+    print(get_coefficient(3679.2))
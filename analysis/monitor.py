@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" monitor.py follows the convergence histories of running CFX jobs, the same ``heat.csv``, ``inlet.csv``,
+``momentum.csv`` and ``turbulence.csv`` as read by :py:class:`analysis.convergence.ConvergencePlot`, while the solver
+appends to them. Every poll only reads the bytes that were appended since the previous poll and keeps the last rows of
+every file in a fixed-size ring buffer, thus following a run costs the same at the first as at the ten-thousandth
+iteration.
+
+A run is ``converged`` once every residual is either below an absolute target or has dropped by a number of orders of
+magnitude from its peak, and every monitor point has settled. A run is ``stalled`` if none of its residuals dropped by
+more than a fraction of an order of magnitude over the last ``window`` iterations while it is not converged, the drop
+follows from a straight line fitted through the logarithm of the residual over the window.
+"""
+
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+from analysis.cfx import parse_header
+
+__all__ = ['RingBuffer', 'TailFile', 'ConvergenceMonitor', 'watch']
+
+RUNNING, CONVERGED, STALLED = 'running', 'converged', 'stalled'
+
+
+class RingBuffer(object):
+
+    def __init__(self, capacity, columns):
+        """ Fixed-size buffer of the last ``capacity`` rows appended to it
+
+        :param int capacity: Maximum number of rows that are held
+        :param int columns: Number of columns of every row
+        """
+        self.capacity = capacity
+        self.array = np.empty((capacity, columns))
+        self.count = 0  # Number of rows appended in total
+        self.position = 0  # Row of the array the next row is written to
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, rows):
+        """ Appends a block of rows of shape (n, columns), only the last ``capacity`` rows of a large block are kept """
+        rows = np.atleast_2d(rows)
+        self.count += rows.shape[0]
+        rows = rows[-self.capacity:]
+        head = min(rows.shape[0], self.capacity - self.position)
+        self.array[self.position:self.position + head] = rows[:head]
+        self.array[:rows.shape[0] - head] = rows[head:]
+        self.position = (self.position + rows.shape[0]) % self.capacity
+
+    @property
+    def values(self):
+        """ Rows held in the order they were appended
+
+        :rtype: numpy.ndarray
+        """
+        if self.count <= self.capacity:
+            return self.array[:self.count]
+        return np.concatenate((self.array[self.position:], self.array[:self.position]))
+
+
+class TailFile(object):
+
+    def __init__(self, filename, capacity=2048):
+        """ Follows a CFX monitor export that grows while the solver runs
+
+        :param str filename: Path of the export, it does not have to exist yet
+        :param int capacity: Number of rows kept in the ring buffer
+        """
+        self.filename = filename
+        self.capacity = capacity
+        self.reset()
+
+    def reset(self):
+        """ Forgets everything read so far, e.g. once the file was truncated by a restarted run """
+        self.offset, self.pending = 0, b''
+        self.header, self.buffer = None, None
+        self.peak = None
+
+    @property
+    def labels(self):
+        return list(self.header.keys()) if self.header is not None else []
+
+    def _data(self, text):
+        """ Skips up to the header line of the ``[Data]`` section, which is parsed once, and returns what follows """
+        if self.header is not None:
+            return text
+        marker = text.find(b'[Data]')
+        if marker < 0:
+            return None
+        lines = text[marker:].split(b'\n', 2)
+        if len(lines) < 3:
+            return None  # The header line is not complete yet
+        self.header = parse_header(lines[1].decode('latin-1'))
+        self.buffer = RingBuffer(self.capacity, len(self.header))
+        return lines[2]
+
+    def poll(self):
+        """ Parses the complete lines appended since the previous poll
+
+        :return: Number of rows appended
+        :rtype: int
+        """
+        try:
+            size = os.path.getsize(self.filename)
+        except OSError:
+            return 0
+        if size < self.offset:
+            self.reset()
+        if size == self.offset:
+            return 0
+
+        with open(self.filename, 'rb') as f:
+            f.seek(self.offset)
+            text = self.pending + f.read(size - self.offset)
+        self.offset = size
+
+        # A line that is still being written is kept until the next poll
+        end = text.rfind(b'\n') + 1
+        data = self._data(text[:end])
+        if data is None:
+            self.pending = text
+            return 0
+        self.pending = text[end:]
+
+        values = np.array(data.replace(b',', b' ').split(), dtype=np.float64)
+        if not values.size:
+            return 0
+        rows = values.reshape(-1, len(self.header))
+        self.buffer.append(rows)
+        self.peak = rows.max(axis=0) if self.peak is None else np.maximum(self.peak, rows.max(axis=0))
+        return rows.shape[0]
+
+    @property
+    def values(self):
+        return self.buffer.values if self.buffer is not None else np.empty((0, len(self.labels)))
+
+
+class ConvergenceMonitor(object):
+
+    def __init__(self, directory, residuals=('heat', 'momentum', 'turbulence'), monitors=('inlet',), target=1e-6,
+                 orders=4., window=200, plateau=0.05, settled=1e-4, capacity=2048):
+        """ Follows the convergence histories of a single run, see the module docstring for the criteria
+
+        :param str directory: Directory the solver writes ``<name>.csv`` into, e.g. ``data/convergence/<run_case>``
+        :param tuple residuals: Names of the files holding RMS residuals
+        :param tuple monitors: Names of the files holding monitor points, which have to settle
+        :param float target: Residual below which a residual is converged
+        :param float orders: Orders of magnitude a residual has to drop from its peak to be converged
+        :param int window: Number of iterations over which the plateau and settling criteria are evaluated
+        :param float plateau: Orders of magnitude of the largest drop over the window below which a run is stalled
+        :param float settled: Largest change of a monitor point relative to its mean over the window
+        :param int capacity: Number of rows kept per file, at least ``window``
+        """
+        if capacity < window:
+            raise ValueError('The capacity of {} rows cannot hold a window of {} iterations'.format(capacity, window))
+        self.directory = directory
+        self.target, self.orders, self.window, self.plateau, self.settled = target, orders, window, plateau, settled
+        self.files = OrderedDict((name, TailFile(os.path.join(directory, '{}.csv'.format(name)), capacity))
+                                 for name in tuple(residuals) + tuple(monitors))
+        self.residuals, self.monitors = tuple(residuals), tuple(monitors)
+
+    def poll(self):
+        """ Reads the new rows of every file and evaluates the criteria
+
+        :rtype: collections.OrderedDict
+        """
+        for tail in self.files.values():
+            tail.poll()
+        return self.status()
+
+    def _residuals(self, tail):
+        """ Latest value, drop from the peak and largest drop over the window in orders of magnitude of every residual,
+        columns that are zero throughout, such as the W-momentum of a 2D case, are left out """
+        values, result = tail.values, OrderedDict()
+        for column, label in enumerate(tail.labels[1:], start=1):
+            if tail.peak[column] <= 0.:
+                continue
+            history = np.log10(np.maximum(values[-self.window:, column], 1e-300))
+            # Drop of a straight line fitted through the window, which is insensitive to the noise of a plateau
+            slope = np.polyfit(np.arange(history.size), history, 1)[0] if history.size >= self.window else None
+            result[label] = {'value': float(values[-1, column]),
+                             'drop': float(np.log10(tail.peak[column] / max(values[-1, column], 1e-300))),
+                             'window_drop': float(-slope * (history.size - 1)) if slope is not None else None}
+        return result
+
+    def _monitor(self, tail):
+        """ Change of every monitor point over the window relative to its mean """
+        window, result = tail.values[-self.window:], OrderedDict()
+        for column, label in enumerate(tail.labels[1:], start=1):
+            span = window[:, column].max() - window[:, column].min()
+            scale = max(abs(window[:, column].mean()), 1e-300)
+            result[label] = {'value': float(window[-1, column]),
+                             'change': float(span / scale) if window.shape[0] >= self.window else None}
+        return result
+
+    def status(self):
+        """ State of the run together with the latest iteration and the measures of every residual and monitor point
+
+        :rtype: collections.OrderedDict
+        """
+        tails = self.files.values()
+        if not all(tail.buffer is not None and len(tail.buffer) for tail in tails):
+            return OrderedDict([('state', RUNNING), ('iteration', 0), ('residuals', {}), ('monitors', {})])
+
+        residuals = OrderedDict((name, self._residuals(self.files[name])) for name in self.residuals)
+        monitors = OrderedDict((name, self._monitor(self.files[name])) for name in self.monitors)
+        entries = [entry for group in residuals.values() for entry in group.values()]
+        points = [entry for group in monitors.values() for entry in group.values()]
+
+        converged = (all(entry['value'] <= self.target or entry['drop'] >= self.orders for entry in entries) and
+                     all(entry['change'] is not None and entry['change'] <= self.settled for entry in points))
+        stalled = (not converged and bool(entries) and
+                   all(entry['window_drop'] is not None and entry['window_drop'] < self.plateau
+                       for entry in entries))
+        state = CONVERGED if converged else STALLED if stalled else RUNNING
+        return OrderedDict([('state', state), ('iteration', int(min(tail.values[-1, 0] for tail in tails))),
+                            ('residuals', residuals), ('monitors', monitors)])
+
+
+def watch(directories, interval=10., timeout=None, callback=None, **criteria):
+    """ Polls several runs in turn until every run is either converged or stalled
+
+    :param list directories: Directories of the runs, see :py:class:`ConvergenceMonitor`
+    :param float interval: Seconds between two polls of all runs
+    :param float timeout: Seconds after which watching stops (Optional: Defaults to watching until all runs finished)
+    :param callable callback: Called as ``callback(directory, status)`` once a run converged or stalled, e.g. to stop
+                              the job with ``cfx5stop -directory <run directory>``
+    :param criteria: Keyword arguments of :py:class:`ConvergenceMonitor`
+    :return: Latest status of every run
+    :rtype: collections.OrderedDict
+    """
+    monitors = OrderedDict((directory, ConvergenceMonitor(directory, **criteria)) for directory in directories)
+    states = OrderedDict((directory, None) for directory in directories)
+    start = time.time()
+    while True:
+        for directory, monitor in monitors.items():
+            if states[directory] is not None and states[directory]['state'] != RUNNING:
+                continue
+            states[directory] = monitor.poll()
+            if states[directory]['state'] != RUNNING and callback is not None:
+                callback(directory, states[directory])
+        if all(state['state'] != RUNNING for state in states.values()):
+            return states
+        if timeout is not None and time.time() - start + interval > timeout:
+            return states
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    from directories import DIRS
+    root = os.path.join(DIRS['DATA_DIR'], 'convergence')
+    for run_case, run_status in watch([os.path.join(root, name) for name in sorted(os.listdir(root))],
+                                      timeout=0.).items():
+        print('{}: {} at iteration {}'.format(run_case, run_status['state'], run_status['iteration']))
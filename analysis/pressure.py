@@ -16,9 +16,11 @@
 # limitations under the License.
 
 import os
+import numpy as np
 import matplotlib.pyplot as plt
 from geometry.airfoil import Airfoil
 from directories import DIRS
+from analysis.cfx import read_cfx
 
 
 class PressureCoefficient(object):
@@ -81,26 +83,17 @@ class PressureCoefficient(object):
         filename = filename if filename is not None else os.path.join(DIRS['DATA_DIR'], 'pressure',
                                                                       self.airfoil_in.__name__ + extension)
 
-        with open(filename, 'r') as data:
-
-            read_lines = data.readlines()[5:]
-            float_tuples = [[float(num) for num in line.replace('\n', '').split(', ') if num != '']
-                            for line in read_lines if line != '\n']
-
-            # Fixing un-ordered data that starts somehwere on the upper-surface due to polyline
-            min_idx = float_tuples.index(min(float_tuples, key=lambda x: x[0]))
-            max_idx = float_tuples.index(max(float_tuples, key=lambda x: x[0]))
-            min_x = float_tuples[min_idx][0]
-            max_x = float_tuples[max_idx][0]
+        data = read_cfx(filename)
+        x, y = (data[label] for label in data.dtype.names[:2])
 
-            top_rear_half = float_tuples[0:min_idx+1]
-            top_front_half = float_tuples[max_idx:]
-            top_surface = top_front_half + top_rear_half
-            bottom_surface = float_tuples[min_idx:max_idx+1]
-            complete_curve = top_surface + bottom_surface
+        # Fixing un-ordered data that starts somehwere on the upper-surface due to polyline
+        min_idx, max_idx = int(np.argmin(x)), int(np.argmax(x))
+        top_surface = np.concatenate((np.arange(max_idx, x.size), np.arange(0, min_idx + 1)))
+        bottom_surface = np.arange(min_idx, max_idx + 1)
+        complete_curve = np.concatenate((top_surface, bottom_surface))
 
-        return {'x': [((entry[0] - min_x) / (max_x - min_x)) for entry in complete_curve],
-                'y': [entry[1] for entry in complete_curve]}
+        return {'x': (x[complete_curve] - x[min_idx]) / (x[max_idx] - x[min_idx]),
+                'y': y[complete_curve]}
 
     def plot_turbulence(self, save=True):
         """ Plots the difference in pressure coefficients between experimental data, a coarse and fine mesh with SST
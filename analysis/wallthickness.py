@@ -16,9 +16,11 @@
 # limitations under the License.
 
 import os
+import numpy as np
 import matplotlib.pyplot as plt
 from directories import DIRS
 from utils import Attribute
+from analysis.cfx import read_cfx
 
 
 class WallThickness(object):
@@ -47,32 +49,18 @@ class WallThickness(object):
 
         :rtype: dict
         """
-        with open(filename, 'r') as data:
+        data = read_cfx(filename)
+        x, y = (data[label] for label in data.dtype.names[:2])
 
-            read_lines = data.readlines()[5:]
-            float_tuples = [[float(num) for num in line.replace('\n', '').split(', ') if num != '']
-                            for line in read_lines if line != '\n']
+        # Fixing un-ordered data that starts somehwere on the upper-surface due to polyline
+        min_idx, max_idx = int(np.argmin(x)), int(np.argmax(x))
+        x = (x - x[min_idx]) / (x[max_idx] - x[min_idx])
 
-            # Fixing un-ordered data that starts somehwere on the upper-surface due to polyline
-            min_idx = float_tuples.index(min(float_tuples, key=lambda x: x[0]))
-            max_idx = float_tuples.index(max(float_tuples, key=lambda x: x[0]))
-            min_x = float_tuples[min_idx][0]
-            max_x = float_tuples[max_idx][0]
+        top_surface = np.concatenate((np.arange(min_idx, x.size), np.arange(0, max_idx + 1)))
+        bottom_surface = np.arange(max_idx, min_idx + 1)
 
-            top_rear_half = float_tuples[0:max_idx+1]
-            top_front_half = float_tuples[min_idx:]
-            top_surface = top_front_half + top_rear_half
-            bottom_surface = float_tuples[max_idx:min_idx+1]
-
-            print(top_surface)
-
-            def normalize(e):
-                return (e[0] - min_x) / (max_x - min_x)
-
-        return {'x_top': [normalize(entry) for entry in top_surface],
-                'y_top': [entry[1] for entry in top_surface],
-                'x_bot': [normalize(entry) for entry in bottom_surface],
-                'y_bot': [entry[1] for entry in bottom_surface]}
+        return {'x_top': x[top_surface], 'y_top': y[top_surface],
+                'x_bot': x[bottom_surface], 'y_bot': y[bottom_surface]}
 
     def plot_fine(self, save=True):
         """ Plots fine mesh y-plus"""
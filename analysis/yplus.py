@@ -2,6 +2,7 @@ from directories import DIRS
 import os
 from math import sqrt
 from analysis.inflow import rho, mu
+from analysis.cfx import read_cfx
 
 
 class YPlus(object):
@@ -9,11 +10,8 @@ class YPlus(object):
     def __init__(self, ):
 
 
-        with open(os.path.join(DIRS['DATA_DIR'], 'shear', 'coarse_wallshear.csv')) as f:
-            lines = f.readlines()[5:]
-            lines = [[float(entry) for entry in line.replace(' ', '').replace('\n', '').split(',') if entry != '']
-                     for line in lines]
-            average_shear = sum([i[1] for i in lines])/len(lines)
+        data = read_cfx(os.path.join(DIRS['DATA_DIR'], 'shear', 'coarse_wallshear.csv'))
+        average_shear = data[data.dtype.names[1]].mean()
 
         u_tau = sqrt(average_shear/rho)
 
@@ -27,5 +25,5 @@ def first_cell_height(y_plus=0.5):
 
 print('First Cell Height <= {:.10f} for y+ <1'.format(first_cell_height(1.0) * 4.))
 
-# WATCH OUT FOR ASPECT RATIO!
+# WATCH OUT FOR ASPECT RATIO! Measured by mesh.quality, see LIMITS there
 # Since there is no seperated flow, ~10,000 aspect ratio is fine, but beyond this can pose problems
\ No newline at end of file
@@ -16,12 +16,15 @@
 # limitations under the License.
 
 import os
-from geometry.definitions import Point, Curve
+from geometry.definitions import Point, PointArray, Curve
+from geometry.parser import read_airfoil
+from geometry.library import AirfoilLibrary
+from geometry.writer import write_dat, write_npz
 from directories import DIRS
+from utils import Attribute, Input
 from matplotlib import pyplot as plt
 import numpy as np
 # import scipy.interpolate as si
-import scipy.optimize as so
 
 # Reference:
 # https://github.com/chiefenne/PyAero/blob/master/src/SplineRefine.py
@@ -29,65 +32,82 @@ import scipy.optimize as so
 
 class Airfoil(object):
 
-    def __init__(self, airfoil_name='RAE2822', angle=0., position=Point(0, 0, 0)):
+    resample_samples = 4000
+
+    angle = Input()
+    position = Input()
+    base_ordinates = Input()
+
+    def __init__(self, airfoil_name='RAE2822', angle=0., position=Point(0, 0, 0), ordinates=None):
         """
 
         :param str airfoil_name: Name of the airfoil w/o file extension
         :param float angle: Angle of Attack in SI degree [deg]
+        :param dict ordinates: Top and bottom :py:class:`PointArray` running from LE to TE at 0 deg AoA (Optional: If
+                               not provided the ordinates are read from the .dat file of ``airfoil_name``)
         """
-        self.__cache__ = {}
-        self.__name__, self.angle, self.ordinates, self.position = airfoil_name, angle, None, position
+        self.__name__, self.angle, self.position = airfoil_name, angle, position
 
         # Updates ordinates from .dat file
-        self.read_dat()
+        if ordinates is None:
+            self.read_dat()
+        else:
+            self.base_ordinates = {key: PointArray.from_points(ordinates[key]) for key in ('top', 'bot')}
+
+    @classmethod
+    def from_library(cls, library, airfoil_name, angle=0., position=Point(0, 0, 0)):
+        """ Opens an airfoil from a memory-mapped airfoil library, only the pages holding its ordinates are read
+
+        :param library: Opened library or path to the library file
+        :type library: AirfoilLibrary or str
+        :param str airfoil_name: Name of the airfoil within the library
+        :param float angle: Angle of Attack in SI degree [deg]
+        :rtype: Airfoil
+        """
+        library = library if isinstance(library, AirfoilLibrary) else AirfoilLibrary(library)
+        return cls(airfoil_name, angle=angle, position=position, ordinates=library[airfoil_name])
+
+    def at_angle(self, angle):
+        """ Returns a copy of the airfoil at another Angle of Attack which shares the ordinates and the curves fitted at
+        0 deg AoA with this airfoil, thus nothing is read or fitted again
+
+        :param float angle: Angle of Attack in SI degree [deg]
+        :rtype: Airfoil
+        """
+        airfoil = self.__class__(self.__name__, angle=angle, position=self.position, ordinates=self.base_ordinates)
+        airfoil.base_curves = self.base_curves
+        return airfoil
 
     @property
     def default_directory(self):
         return os.path.join(DIRS['DATA_DIR'], 'geom')
 
     def read_dat(self, filename=None, extension='.dat'):
-        """ Reads airfoil ordinates from .dat file """
+        """ Reads airfoil ordinates from .dat file, see :py:func:`geometry.parser.parse_airfoil` for the layouts """
         filename = filename if filename is not None else os.path.join(self.default_directory, self.__name__ + extension)
+        self.base_ordinates = read_airfoil(filename)
 
-        def str_to_point(str_list):
-            """ List must be a str of format `  x  y  z` """
-            # TODO make automatic detection of delimeter
-            return [Point(*[float(entry) for entry in line.split('  ') if entry != '']) for line in str_list]
+    @Attribute
+    def ordinates(self):
+        """ Top and bottom :py:class:`PointArray` running from LE to TE rotated to the Angle of Attack
 
-        with open(filename, 'r') as data:
-            read_lines = [line.replace('\n', '') for line in data.readlines()]
-            [read_lines.pop(i) for i, line in enumerate(read_lines) if '#' in line]  # Removing comments
-
-            # Finding top & bottom curve groups
-            group_indices = [i for i, line in enumerate(read_lines) if not line.startswith('  ')]
-            top_lines = read_lines[group_indices[0]+1:group_indices[-1]]
-            bottom_lines = read_lines[group_indices[-1]+1:]
-
-            top_points, bottom_points = str_to_point(top_lines), str_to_point(bottom_lines)
-
-            # Applying rotation to points to achieve AoA
-            top_points = [pnt.rotate(-self.angle) for pnt in top_points]
-            bottom_points = [pnt.rotate(-self.angle) for pnt in bottom_points]
+        :rtype: dict
+        """
+        return {key: self.base_ordinates[key].rotate(-self.angle) for key in ('top', 'bot')}
 
-            setattr(self, 'ordinates', {'top': top_points, 'bot': bottom_points})
+    def write_dat(self, filename=None, extension='_mod.dat', binary=False):
+        """ Writes modified airfoil ordinates to .dat file
 
-    def write_dat(self, filename=None, extension='_mod.dat'):
-        """ Writes modified airfoil ordinates to .dat file """
+        :param bool binary: Toggles writing an exact ``.npz`` companion file next to the .dat file
+        """
         filename = filename if filename is not None else os.path.join(self.default_directory, self.__name__ + extension)
-        top_pnts, bot_pnts = self.ordinates['top'], self.ordinates['bot']
+        header = '{} AIRFOIL MODDED AoA = {} deg'.format(self.__name__, self.angle)
+        curves = (self.ordinates['top'], self.ordinates['bot'])
+        write_dat(filename, curves=curves, header=header)
+        if binary:
+            write_npz(os.path.splitext(filename)[0] + '.npz', curves=curves, header=header)
 
-        def point_format(open_file, point):
-            return open_file.write('  {:1.6f}  {:1.6f}  {:1.6f}\n'.format(point.x, point.y, point.z).replace('-0', '-'))
-
-        with open(filename, 'w') as output:
-            output.write('# {} AIRFOIL MODDED AoA = {} deg\n'.format(self.__name__, self.angle))
-            output.write(' {:d} 0\n'.format(len(top_pnts)))
-            [point_format(output, pnt) for pnt in top_pnts]  # Writes top points in group to file w/ list comprehension
-
-            output.write(' {:d} 0\n'.format(len(bot_pnts)))
-            [point_format(output, pnt) for pnt in bot_pnts]
-
-    @property
+    @Attribute
     def leading_edge(self):
         """ Fetches the leading-edge point from the ordinates
 
@@ -95,7 +115,7 @@ class Airfoil(object):
         """
         return self.ordinates['top'][0]
 
-    @property
+    @Attribute
     def trailing_edge(self):
         """ Fetches the trailing-edge point from the ordinates
 
@@ -159,83 +179,55 @@ class Airfoil(object):
     #         self.__cache__['spline'] = top_spline, bot_spline
     #         return top_spline, bot_spline
 
-    @property
-    def curve(self):
-        pass
+    @Attribute
+    def base_curves(self):
+        """ Curves fitted to the ordinates at 0 deg AoA, see :py:attr:`curve`
+
+        :rtype: dict
+        """
+        top, bot = self.base_ordinates['top'], self.base_ordinates['bot']
+        complete = PointArray.concatenate((top[::-1][:-1], bot))
+        return {'top': Curve(top), 'bot': Curve(bot), 'complete': Curve(complete)}
 
-    @curve.getter
+    @Attribute
     def curve(self):
         """ Returns a dictionary of airfoil curves. ['top'] = Top curve f/ LE -> TE, ['bot] = Bottom curve f/ LE -> TE
-        ['complete'] = Complete airfoil curve from TE -> Top-Curve -> LE -> Bottom-Curve -> TE
+        ['complete'] = Complete airfoil curve from TE -> Top-Curve -> LE -> Bottom-Curve -> TE. The curves are obtained
+        by rotating :py:attr:`base_curves` to the Angle of Attack, see :py:meth:`Curve.rotate`
 
         :rtype: dict
         """
-        if 'curve' in self.__cache__.keys():
-            return self.__cache__['curve']
-        else:
-            top_curve, bot_curve = Curve(self.ordinates['top']), Curve(self.ordinates['bot'])
-            top_pnts_reversed = list(reversed(self.ordinates['top']))[:-1]
-            complete_curve = Curve(top_pnts_reversed + self.ordinates['bot'])
-            self.__cache__['curve'] = {'top': top_curve, 'bot': bot_curve, 'complete': complete_curve}
-            return self.__cache__['curve']
-
-    # def make_spline(self):
-    #     top, bot = self.read_dat()
-    #     top_x, top_y = [pnt.x for pnt in top], [pnt.y for pnt in top]
-    #     bot_x, bot_y = [pnt.x for pnt in bot], [pnt.y for pnt in bot]
-    #     top_x = list(reversed(top_x))[:-1]
-    #     top_y = list(reversed(top_y))[:-1]
-    #
-    #     x = top_x + bot_x
-    #     y = top_y + bot_y
-    #
-    #     spline_data = self.spline(x, y)
-    #
-    #     curvature = self.getCurvature(spline_data)
-    #
-    #     plt.plot(spline_data[0][0], spline_data[0][1])
-    #     plt.plot(curvature[3], curvature[4])
-    #     plt.axis([0, 1, -0.5, 0.5])
-    #     plt.show()
-    #     return spline_data
-
-    @staticmethod
-    def getCurvature(spline_data):
-        """Curvature and radius of curvature of a parametric curve
-        der1 is dx/dt and dy/dt at each point
-        der2 is d2x/dt2 and d2y/dt2 at each point
-
-        Returns:
-            list: Tuple of numpy arrays carrying gradient of the curve,
-                   the curvature, radiusses of curvature circles and
-                   curvature circle centers for each point of the curve
-        """
-
-        coo = spline_data[0]
-        der1 = spline_data[3]
-        der2 = spline_data[4]
-
-        xd = der1[0]
-        yd = der1[1]
-        x2d = der2[0]
-        y2d = der2[1]
-        n = xd ** 2 + yd ** 2
-        d = xd * y2d - yd * x2d
-
-        # gradient dy/dx = dy/du / dx/du
-        gradient = der1[1] / der1[0]
-
-        # radius of curvature
-        R = n ** (3. / 2.) / abs(d)
+        return {key: crv.rotate(-self.angle) for key, crv in self.base_curves.items()}
 
-        # curvature
-        C = d / n ** (3. / 2.)
+    def resample(self, n, strategy='curvature', weight=1.):
+        """ Redistributes ``n`` points along both the top and bottom curves in a single pass. The points are placed at
+        equal increments of the measure ``m(s) = int (1 + weight * sqrt(|k| * L)) ds`` where ``k`` is the local
+        curvature and ``L`` the length of the curve. Thus, with the ``'curvature'`` strategy, points cluster where the
+        curvature is high, such as at the leading edge, whereas the ``'arclength'`` strategy spaces them evenly.
 
-        # coordinates of curvature-circle center points
-        xc = coo[0] - R * yd / np.sqrt(n)
-        yc = coo[1] + R * xd / np.sqrt(n)
+        :param int n: Number of points on each of the top and bottom curves, including the LE and TE
+        :param str strategy: Either ``'curvature'`` or ``'arclength'``
+        :param float weight: Relative importance of the curvature w.r.t the arc-length
 
-        return [gradient, C, R, xc, yc]
+        :return: New airfoil built from the resampled ordinates at the same angle of attack
+        :rtype: Airfoil
+        """
+        if strategy not in ('curvature', 'arclength'):
+            raise ValueError('{} is not a valid resampling strategy'.format(strategy))
+        weight = weight if strategy == 'curvature' else 0.
+
+        def resample_curve(curve):
+            length = curve.length()
+            s = np.linspace(0., length, self.resample_samples)
+            u = curve.u_at_length(s)
+            density = 1. + weight * np.sqrt(np.abs(curve.curvature(u)) * length)
+            measure = np.concatenate(([0.], np.cumsum(np.diff(s) * (density[1:] + density[:-1]) / 2.)))
+            s_new = np.interp(np.linspace(0., measure[-1], n), measure, s)
+            return PointArray(curve.point_at_length(s_new))
+
+        # Resampled points are rotated back to 0 deg AoA as the new Airfoil applies the rotation itself
+        ordinates = {key: resample_curve(self.curve[key]).rotate(self.angle) for key in ('top', 'bot')}
+        return Airfoil(self.__name__, angle=self.angle, position=self.position, ordinates=ordinates)
 
     def get_maxima(self):
         """ Returns the parameter ``u`` on the top and bottom curves where the local tangent vector is parallel with the
@@ -244,21 +236,24 @@ class Airfoil(object):
         :return [0] Top curve ``u``, [1] Bottom curve ``u``
         :rtype: tuple[float]
         """
+        return self.maxima
 
-        top, bot = self.curve['top'], self.curve['bot']
-
-        def objective(u, *args):
-            curve = args[0]
-            tan = curve.tangent(u)
-            slope = tan.y/tan.x  # slope dy/dx = Vector.y/Vector.x
-            return slope**2  # Finding where slope = zero
+    @Attribute
+    def maxima(self):
+        """ Cached result of :py:meth:`get_maxima`
 
-        u_top = so.fminbound(objective, 0., 1., args=(top,))
-        u_bot = so.fminbound(objective, 0., 1., args=(bot,))
+        :rtype: tuple[float]
+        """
+        def extremum(curve, pick):
+            """ Picks the root of ``dy/du = 0`` (slope dy/dx = zero) with the largest thickness on ``curve`` """
+            roots = curve.derivative_roots(0., 1.)
+            if roots.size == 0:
+                raise ValueError('{} has no point where the tangent is parallel with the x-axis'.format(curve))
+            return float(roots[pick(curve.points_at_parameters(roots)[:, 1])])
 
-        return u_top, u_bot
+        return extremum(self.curve['top'], np.argmax), extremum(self.curve['bot'], np.argmin)
 
-    @property
+    @Attribute
     def center(self):
         """ Defines the Point where the C-mesh should transform into an H-mesh for maximum orthogonality of the mesh.
         The location is defined by the average x-value of the top and bottom maxima as obtained by
@@ -286,14 +281,13 @@ class Airfoil(object):
     #     return None
 
     def get_ordinates(self):
-        """ Retrieves the top and bottom coordinates of the airfoil. Both set of ordinates run from LE to TE.
+        """ Retrieves the top and bottom coordinates of the airfoil. Both set of ordinates run from LE to TE. The
+        returned arrays are views of the :py:class:`PointArray` buffers, thus no copies are made.
 
         :rtype: dict
         """
         top, bot = self.ordinates['top'], self.ordinates['bot']
-        top_x, top_y = [pnt.x for pnt in top], [pnt.y for pnt in top]
-        bot_x, bot_y = [pnt.x for pnt in bot], [pnt.y for pnt in bot]
-        return {'top': (top_x, top_y), 'bot': (bot_x, bot_y)}
+        return {'top': (top.x, top.y), 'bot': (bot.x, bot.y)}
 
     def read_cp(self, filename=None, extension='_cp.dat'):
         """ Reads airfoil ordinates from .dat file """
@@ -364,11 +358,8 @@ class Airfoil(object):
         plt.plot(bot_x, bot_y, label='Bottom Surface', marker='.')
 
         control_u = np.linspace(0, 1, 100)
-        top_pnts = [self.curve['top'].point_at_parameter(u) for u in control_u]
-        bot_pnts = [self.curve['bot'].point_at_parameter(u) for u in control_u]
-
-        top_x, top_y = [[getattr(pnt, key) for pnt in top_pnts] for key in ('x', 'y')]
-        bot_x, bot_y = [[getattr(pnt, key) for pnt in bot_pnts] for key in ('x', 'y')]
+        top_x, top_y = self.curve['top'].points_at_parameters(control_u).T
+        bot_x, bot_y = self.curve['bot'].points_at_parameters(control_u).T
 
         plt.plot(top_x, top_y, linewidth=0.5, linestyle='-.', label='Top Spline')
         plt.plot(bot_x, bot_y, linewidth=0.5, linestyle='-.', label='Bottom Spline')
@@ -17,92 +17,130 @@
 
 import os
 from directories import DIRS
-from geometry.definitions import Point, Vector
-import scipy.optimize as so
+from utils import Attribute, Input
+from geometry.definitions import Point, PointArray, Vector
+from geometry.writer import write_dat, write_npz
 from matplotlib import pyplot as plt
-from math import atan, degrees
+from math import degrees
+import numpy as np
 
 
 class Blocking(object):
 
+    domain_in = Input()
+    le_angle = Input()
+    refine_distance = Input()
+
     def __init__(self, domain_in=None, le_angle=35, refine_distance=0.3):
         self.domain_in = domain_in
-        self.airfoil_in = self.domain_in.airfoil_in
-        self.crv_top = self.airfoil_in.curve['top']
-        self.crv_bot = self.airfoil_in.curve['bot']
         self.le_angle = le_angle
-        self.le_zone = self.find_le_zone(le_angle)
         self.refine_distance = refine_distance
 
+    @Attribute
+    def airfoil_in(self):
+        return self.domain_in.airfoil_in
+
+    @Attribute
+    def crv_top(self):
+        return self.airfoil_in.curve['top']
+
+    @Attribute
+    def crv_bot(self):
+        return self.airfoil_in.curve['bot']
+
+    @Attribute
+    def le_zone(self):
+        return self.find_le_zone(self.le_angle)
+
     @property
     def default_directory(self):
         return os.path.join(DIRS['DATA_DIR'], 'geom')
 
     def find_le_zone(self, angle):
+        """ Finds the parameters on the top and bottom curves where the normal vector forms ``angle`` with the x-axis
+        in the 1st quadrant. This is done to ensure that the LE refinement zone has an equal angle all the way up to the
+        airfoil surface for optimum orthogonality of the mesh. The roots are extracted analytically, see
+        :py:meth:`geometry.definitions.Curve.normal_angle_roots`.
+
+        :param float angle: Angle of the LE refinement zone in SI degree [deg]
+        :rtype: dict
+        """
         top, bot = self.crv_top, self.crv_bot
 
-        def objective(u, *args):
-            """ Returns the angle formed between the x-axis and the normal vector in the 1st quadrant. This is done
-            to ensure that the LE refinement zone has an equal angle all the way up to the airfoil surface for optimum
-            orthogonality of the mesh. """
-            crv, target_angle = args
-            normal = crv.normal(u)
-            return degrees(atan(abs(normal.y/normal.x))) - target_angle
-
-        u_top = so.brentq(objective, 0., 0.5, args=(top, angle))
-        u_bot = so.brentq(objective, 0., 0.3, args=(bot, angle))
-
-        return {'top': u_top, 'bot': u_bot}
-
-    @property
+        def first_root(crv, upper):
+            roots = crv.normal_angle_roots(angle)
+            roots = roots[(roots > 0.) & (roots <= upper)]
+            if roots.size == 0:
+                raise ValueError('No LE zone found for an angle of {} deg on the interval [0, {}]'.format(angle, upper))
+            return float(roots[0])
+
+        return {'top': first_root(top, 0.5), 'bot': first_root(bot, 0.3)}
+
+    def find_le_zones(self, angles):
+        """ Batched counterpart of :py:meth:`find_le_zone` which solves the LE refinement zone for a whole array of
+        angles at once, see :py:meth:`geometry.definitions.Curve.normal_angle_parameters`
+
+        :param angles: Angles of the LE refinement zone in SI degree [deg], array-like of shape (n_angles,)
+        :return: Dictionary of the top and bottom parameters, each of shape (n_angles,)
+        :rtype: dict
+        """
+        angles = np.atleast_1d(np.asarray(angles, dtype=np.float64))
+        zones = {'top': self.crv_top.normal_angle_parameters(angles, upper=0.5),
+                 'bot': self.crv_bot.normal_angle_parameters(angles, upper=0.3)}
+        missing = np.isnan(zones['top']) | np.isnan(zones['bot'])
+        if np.any(missing):
+            raise ValueError('No LE zone found for angles of {} deg'.format(angles[missing].tolist()))
+        return zones
+
+    @Attribute
     def pt_1(self):
         u_top, _ = self.airfoil_in.get_maxima()
         return self.crv_top.point_at_parameter(u_top)
 
-    @property
+    @Attribute
     def pt_1_top(self):
         u_top, _ = self.airfoil_in.get_maxima()
         return self.pt_1.translate(self.crv_top.normal(u_top) * self.refine_distance)
 
-    @property
+    @Attribute
     def pt_2(self):
         return self.airfoil_in.trailing_edge
 
-    @property
+    @Attribute
     def pt_2_top(self):
         return self.pt_2.translate(self.crv_top.normal(1.0)*self.refine_distance)
 
-    @property
+    @Attribute
     def pt_2_bot(self):
         return self.pt_2.translate(self.crv_bot.normal(1.0) * - self.refine_distance)
 
-    @property
+    @Attribute
     def pt_3(self):
         _, u_bot = self.airfoil_in.get_maxima()
         return self.crv_bot.point_at_parameter(u_bot)
 
-    @property
+    @Attribute
     def pt_3_bot(self):
         _, u_bot = self.airfoil_in.get_maxima()
         return self.pt_3.translate(self.crv_bot.normal(u_bot) * -self.refine_distance)
 
-    @property
+    @Attribute
     def pt_4(self):
         return self.crv_bot.point_at_parameter(self.le_zone['bot'])
 
-    @property
+    @Attribute
     def pt_4_bot(self):
         return self.pt_4.translate(self.crv_bot.normal(self.le_zone['bot']) * -self.refine_distance)
 
-    @property
+    @Attribute
     def pt_5(self):
         return self.crv_top.point_at_parameter(self.le_zone['top'])
 
-    @property
+    @Attribute
     def pt_5_top(self):
         return self.pt_5.translate(self.crv_top.normal(self.le_zone['top']) * self.refine_distance)
 
-    @property
+    @Attribute
     def pt_le_proj(self):
         return self.airfoil_in.leading_edge.translate(Vector(-self.refine_distance, 0, 0))
 
@@ -164,49 +202,51 @@ class Blocking(object):
             raise ValueError('{} is not a valid side of the domain')
         return pt
 
-    def write_dat(self, filename=None, extension='_BLOCKING.dat'):
-        """ Writes modified airfoil ordinates to .dat file """
-        name = self.airfoil_in.__name__
-        filename = filename if filename is not None else os.path.join(self.default_directory, name + extension)
+    @Attribute
+    def points(self):
+        """ Blocking points at the trailing edge, their projections onto the domain, and the points on the airfoil
+        surface
 
-        def point_format(open_file, point):
-            return open_file.write('  {:1.6f}  {:1.6f}  {:1.6f}\n'.format(point.x, point.y, point.z).replace('-0', '-'))
-
-        with open(filename, 'w') as output:
-            output.write('# {} AIRFOIL BLOCKING POINTS\n'.format(name))
+        :rtype: PointArray
+        """
+        # Airfoil Trailing Edge Upper Top Projection
+        # TODO Turn this into a function inside project
+        y = self.domain_in.pt_2.y - self.pt_2_top.y
+        v_norm = self.crv_top.normal(1.0)
+        x = y / (v_norm.y / v_norm.x)
 
+        return PointArray.from_points([
             # Airfoil Trailing Edge
-            point_format(output, self.project(self.pt_2, 'wake'))
-            point_format(output, self.project(self.pt_2_top, 'wake'))
+            self.project(self.pt_2, 'wake'),
+            self.project(self.pt_2_top, 'wake'),
+            Point(self.pt_2.x + x, self.domain_in.pt_2.y, 0),
+            self.project(self.pt_2_bot, 'wake'),
+            self.project(self.pt_2_bot, 'bot'),
+            # Airfoil Surface Points
+            self.pt_1, self.pt_2, self.pt_3, self.pt_4, self.pt_5])
 
-            # Airfoil Trailing Edge Upper Top Projection
-            # TODO Turn this into a function inside project
-            pt_2 = self.pt_2_top
-            y = self.domain_in.pt_2.y - self.pt_2_top.y
-            v_norm = self.crv_top.normal(1.0)
-            x = y / (v_norm.y / v_norm.x)
-            point_format(output, Point(self.pt_2.x + x, self.domain_in.pt_2.y, 0))
-            print(degrees(v_norm.y / v_norm.x))
+    @Attribute
+    def refinement_points(self):
+        """ Points of the refinement spline running around the airfoil from the bottom to the top trailing edge
 
-            point_format(output, self.project(self.pt_2_bot, 'wake'))
-            point_format(output, self.project(self.pt_2_bot, 'bot'))
+        :rtype: PointArray
+        """
+        return PointArray.from_points([self.pt_2_bot, self.pt_3_bot, self.pt_4_bot, self.pt_le_proj, self.pt_5_top,
+                                       self.pt_1_top, self.pt_2_top])
 
-            # Airfoil Surface Points
-            point_format(output, self.pt_1)
-            point_format(output, self.pt_2)
-            point_format(output, self.pt_3)
-            point_format(output, self.pt_4)
-            point_format(output, self.pt_5)
-
-            # Airfoil Refinment Spline
-            output.write(' {:d} 0\n'.format(9))
-            point_format(output, self.pt_2_bot)
-            point_format(output, self.pt_3_bot)
-            point_format(output, self.pt_4_bot)
-            point_format(output, self.pt_le_proj)
-            point_format(output, self.pt_5_top)
-            point_format(output, self.pt_1_top)
-            point_format(output, self.pt_2_top)
+    def write_dat(self, filename=None, extension='_BLOCKING.dat', binary=False):
+        """ Writes the blocking points and the refinement spline to .dat file
+
+        :param bool binary: Toggles writing an exact ``.npz`` companion file next to the .dat file
+        """
+        name = self.airfoil_in.__name__
+        filename = filename if filename is not None else os.path.join(self.default_directory, name + extension)
+        header = '{} AIRFOIL BLOCKING POINTS'.format(name)
+        points, curves = self.points, (self.refinement_points,)
+
+        write_dat(filename, curves=curves, points=points, header=header)
+        if binary:
+            write_npz(os.path.splitext(filename)[0] + '.npz', curves=curves, points=points, header=header)
 
 
 if __name__ == '__main__':
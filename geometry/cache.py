@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import hashlib
+import tempfile
+import zipfile
+import numpy as np
+from directories import DIRS
+
+# Atomic rename that overwrites an existing entry, ``os.rename`` does the same on POSIX for Python 2
+_replace = getattr(os, 'replace', os.rename)
+
+
+class SplineCache(object):
+
+    def __init__(self, directory=None, max_size=64 * 1024 ** 2):
+        """ Persistent on-disk cache of fitted B-splines shared between processes. Every entry holds the knots,
+        coefficients and degree of a spline in a ``.npz`` file named after a hash of the fitted coordinates and the
+        degree. Entries are written to a temporary file first and then renamed into place, thus concurrent workers never
+        observe a partially written entry. Once the total size exceeds ``max_size`` the least recently used entries are
+        evicted.
+
+        Enable it for all :py:class:`geometry.definitions.Curve` instances with:
+
+        >>> Curve.disk_cache = SplineCache()
+
+        :param str directory: Cache directory (Optional: Defaults to ``data/cache/spline``)
+        :param int max_size: Maximum total size of all entries in bytes
+        """
+        self.directory = directory if directory is not None else os.path.join(DIRS['DATA_DIR'], 'cache', 'spline')
+        self.max_size = max_size
+        try:
+            os.makedirs(self.directory)
+        except OSError:
+            if not os.path.isdir(self.directory):
+                raise
+
+    @staticmethod
+    def key(x, y, degree):
+        """ Hashes the coordinates and degree that define a spline fit
+
+        :param numpy.ndarray x: X-coordinates of the fitted points
+        :param numpy.ndarray y: Y-coordinates of the fitted points
+        :param int degree: Degree of the spline
+        :rtype: str
+        """
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(x, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+        digest.update('degree={:d}'.format(degree).encode('ascii'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, '{}.npz'.format(key))
+
+    def get(self, key):
+        """ Loads a spline from the cache
+
+        :param str key: Hash obtained from :py:meth:`key`
+        :return: Spline in the ``(t, c, k)`` form returned by :py:func:`scipy.interpolate.splprep` or None on a miss
+        :rtype: list or None
+        """
+        filename = self.path(key)
+        try:
+            with np.load(filename) as entry:
+                tck = [entry['knots'], list(entry['coefficients']), int(entry['degree'])]
+        except (IOError, OSError, ValueError, KeyError, zipfile.BadZipfile):
+            return None  # Missing, evicted by another process, or unreadable entries are treated as a miss
+
+        try:
+            os.utime(filename, None)  # Marks the entry as recently used
+        except OSError:
+            pass
+        return tck
+
+    def put(self, key, tck):
+        """ Stores a spline in the cache and evicts old entries if the cache grew beyond ``max_size``
+
+        :param str key: Hash obtained from :py:meth:`key`
+        :param list tck: Spline in the ``(t, c, k)`` form returned by :py:func:`scipy.interpolate.splprep`
+        """
+        knots, coefficients, degree = tck
+        handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                np.savez(output, knots=knots, coefficients=np.asarray(coefficients), degree=degree)
+            _replace(temporary, self.path(key))
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        self.evict()
+
+    def entries(self):
+        """ Lists the cached entries as ``(last access time, size, filename)`` with the least recently used first
+
+        :rtype: list[tuple]
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                filename = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue  # Removed by another process in the meantime
+                entries.append((stat.st_mtime, stat.st_size, filename))
+        return sorted(entries)
+
+    def evict(self):
+        """ Removes the least recently used entries until the cache is within ``max_size`` """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, filename in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, filename in self.entries():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" cases.py generates the airfoil, domain and blocking input files of a whole matrix of mesh cases. The airfoil is
+read and its splines are fitted once at 0 deg AoA, every worker then obtains the airfoil at the required AoA by
+rotating these splines, see :py:meth:`geometry.airfoil.Airfoil.at_angle`. Cases are grouped by AoA such that the
+maxima and curves of a rotated airfoil are shared by the domains and blockings built around it.
+"""
+
+import os
+import csv
+import itertools
+from collections import OrderedDict
+from multiprocessing import Pool, cpu_count
+from directories import DIRS
+from geometry.airfoil import Airfoil
+from geometry.domain import Domain
+from geometry.blocking import Blocking
+from geometry.tetin import write_tin
+
+__all__ = ['CaseMatrix']
+
+# Base airfoil at 0 deg AoA of the current worker process, set by :py:func:`_initialize`
+_BASE_AIRFOIL = None
+
+
+def _initialize(airfoil, base_curves):
+    """ Stores the base airfoil of the worker process, the fitted curves are passed separately as cached attributes
+    are not pickled along with the airfoil """
+    global _BASE_AIRFOIL
+    airfoil.base_curves = base_curves
+    _BASE_AIRFOIL = airfoil
+
+
+def _write_cases(task):
+    """ Writes the files of all cases sharing the same AoA
+
+    :param tuple task: AoA, the list of cases to write and whether to write a tetin file
+    :return: Case names that were written
+    :rtype: list[str]
+    """
+    angle, cases, tetin = task
+    airfoil = _BASE_AIRFOIL.at_angle(angle)
+    name = airfoil.__name__
+    for case in cases:
+        domain = Domain(airfoil, upstream=case['upstream'], top=case['top'], bottom=case['bottom'], wake=case['wake'])
+        blocking = Blocking(domain, le_angle=case['le_angle'], refine_distance=case['refine_distance'])
+        airfoil.write_dat(filename=os.path.join(case['directory'], name + '_mod.dat'))
+        domain.write_dat(filename=os.path.join(case['directory'], name + '_DOMAIN.dat'))
+        blocking.write_dat(filename=os.path.join(case['directory'], name + '_BLOCKING.dat'))
+        if tetin:
+            write_tin(os.path.join(case['directory'], name + '.tin'), airfoil, domain, blocking)
+    return [case['case'] for case in cases]
+
+
+class CaseMatrix(object):
+
+    parameters = ('angle', 'upstream', 'top', 'bottom', 'wake', 'le_angle', 'refine_distance')
+
+    def __init__(self, airfoil_name='RAE2822', angle=(2.31,), upstream=(13.,), top=(13.,), bottom=(13.,),
+                 wake=(20.,), le_angle=(35,), refine_distance=(0.3,), directory=None):
+        """ Full-factorial matrix of mesh cases, every argument other than ``airfoil_name`` and ``directory`` is a
+        sequence of values which are combined with all values of the other arguments
+
+        :param str airfoil_name: Name of the airfoil w/o file extension
+        :param collections.Sequence angle: Angles of Attack in SI degree [deg]
+        :param collections.Sequence upstream: Normalized dimensions in front of the leading edge of the airfoil
+        :param collections.Sequence top: Normalized dimensions above the airfoil
+        :param collections.Sequence bottom: Normalized dimensions below the airfoil
+        :param collections.Sequence wake: Normalized dimensions behind the trailing edge of the airfoil
+        :param collections.Sequence le_angle: Angles of the LE refinement zone in SI degree [deg]
+        :param collections.Sequence refine_distance: Normalized thicknesses of the refinement zone
+        :param str directory: Output directory holding one sub-directory per case (Optional: Defaults to
+                              ``data/cases/<airfoil_name>``)
+        """
+        self.airfoil_name = airfoil_name
+        self.values = OrderedDict((key, tuple(value)) for key, value in zip(self.parameters, (
+            angle, upstream, top, bottom, wake, le_angle, refine_distance)))
+        self.directory = (directory if directory is not None else
+                          os.path.join(DIRS['DATA_DIR'], 'cases', airfoil_name))
+
+    def __len__(self):
+        return len(self.cases)
+
+    @property
+    def cases(self):
+        """ List of all cases, each a dictionary of the parameter values, the case name and its directory
+
+        :rtype: list[dict]
+        """
+        cases = []
+        for i, combination in enumerate(itertools.product(*self.values.values())):
+            case = OrderedDict([('case', 'case_{:04d}'.format(i))])
+            case.update(zip(self.parameters, combination))
+            case['directory'] = os.path.join(self.directory, case['case'])
+            cases.append(case)
+        return cases
+
+    def write_index(self, cases=None):
+        """ Writes ``cases.csv`` listing the parameters of every case to the output directory """
+        cases = cases if cases is not None else self.cases
+        with open(os.path.join(self.directory, 'cases.csv'), 'w') as output:
+            writer = csv.writer(output, lineterminator='\n')
+            writer.writerow(('case',) + self.parameters)
+            for case in cases:
+                writer.writerow([case['case']] + [case[key] for key in self.parameters])
+
+    def run(self, processes=None, tetin=True):
+        """ Writes the airfoil, domain and blocking files of all cases to their directories
+
+        :param int processes: Number of worker processes (Optional: Defaults to the number of CPUs, 1 writes serially)
+        :param bool tetin: Toggles writing a ready-to-mesh ICEM CFD tetin file for every case
+        :return: The written cases
+        :rtype: list[dict]
+        """
+        cases = self.cases
+        for case in cases:
+            if not os.path.isdir(case['directory']):
+                os.makedirs(case['directory'])
+        self.write_index(cases)
+
+        # Parsing and fitting once at 0 deg AoA, the fitted splines are sent to the workers
+        airfoil = Airfoil(self.airfoil_name, angle=0.)
+        base_curves = airfoil.base_curves
+
+        # Grouping by AoA, large groups are split such that all workers are kept busy
+        processes = processes if processes is not None else cpu_count()
+        groups = OrderedDict()
+        for case in cases:
+            groups.setdefault(case['angle'], []).append(case)
+        size = max(1, -(-len(cases) // (4 * processes)))
+        tasks = [(angle, group[i:i + size], tetin)
+                 for angle, group in groups.items() for i in range(0, len(group), size)]
+
+        processes = min(processes, len(tasks))
+        if processes <= 1:
+            _initialize(airfoil, base_curves)
+            [_write_cases(task) for task in tasks]
+        else:
+            pool = Pool(processes, initializer=_initialize, initargs=(airfoil, base_curves))
+            try:
+                pool.map(_write_cases, tasks, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        return cases
+
+
+if __name__ == '__main__':
+    matrix = CaseMatrix(angle=(0., 1., 2.31, 3.), le_angle=(30, 35, 40), refine_distance=(0.2, 0.3))
+    matrix.run()
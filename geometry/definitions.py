@@ -19,6 +19,45 @@ from math import sqrt
 from timeit import default_timer as timer
 import numpy as np
 import scipy.interpolate as si
+from scipy.spatial import cKDTree
+
+
+def rotate_many(xyz, angle):
+    """ Rotates a whole set of points about the z-axis through the reference ``Point(0, 0, 0)`` in a single pass.
+
+    :param xyz: Array-like of shape (N, 3) or a :py:class:`PointArray`
+    :param angle: Rotation angle in SI degree [deg], either a scalar or an array of shape (n_angles,)
+
+    :return: Rotated coordinates of shape (N, 3) for a scalar ``angle``, else a stack of shape (n_angles, N, 3)
+    :rtype: numpy.ndarray
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    a = np.radians(np.asarray(angle, dtype=np.float64))
+    cos, sin = np.cos(a)[..., np.newaxis], np.sin(a)[..., np.newaxis]
+
+    rotated = np.empty(a.shape + xyz.shape)
+    rotated[..., 0] = cos * xyz[:, 0] - sin * xyz[:, 1]
+    rotated[..., 1] = sin * xyz[:, 0] + cos * xyz[:, 1]
+    rotated[..., 2] = xyz[:, 2]
+    return rotated
+
+
+def translate_many(xyz, vector):
+    """ Translates a whole set of points in a single pass.
+
+    :param xyz: Array-like of shape (N, 3), (n_angles, N, 3) or a :py:class:`PointArray`
+    :param vector: :py:class:`Vector` or array-like of shape (3,), or a (M, 3) stack of translations which returns an
+                   array of shape (M, N, 3)
+
+    :rtype: numpy.ndarray
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    if isinstance(vector, Vector):
+        vector = (vector.x, vector.y, vector.z)
+    vector = np.asarray(vector, dtype=np.float64)
+    if vector.ndim == 2:
+        return xyz + vector[:, np.newaxis, :]
+    return xyz + vector
 
 
 class Point(object):
@@ -43,29 +82,22 @@ class Point(object):
         :rtype: float
         """
         try:
-            d = sqrt(sum([(getattr(self, key) - getattr(other, key))**2 for key in self.__slots__]))
+            d = sqrt(sum([(getattr(self, key) - getattr(other, key))**2 for key in Point.__slots__]))
             return d
         except AttributeError:
             raise AttributeError('Input must be a valid Point Instance')
 
     def rotate(self, angle):
-        """ Rotates about the reference ``Point(0, 0, 0)`` """
+        """ Rotates about the reference ``Point(0, 0, 0)``, see :py:func:`rotate_many` for whole sets of points """
         # TODO make more axis possible, currently only z-axis for AoA of airfoil
-        a = np.radians(angle)
-
-        rotate_z = np.matrix([[np.cos(a), -np.sin(a), 0],
-                              [np.sin(a), np.cos(a), 0],
-                              [0, 0, 1]])
-
         if angle != 0.0:
-            rotated = rotate_z * np.matrix([self.x, self.y, self.z]).T
-            return Point(rotated[0], rotated[1], rotated[2])
+            return Point(*rotate_many([[self.x, self.y, self.z]], angle)[0])
         else:
             return self
 
     def translate(self, vector):
         if isinstance(vector, Vector):
-            return Point(*(np.matrix([self.x, self.y, self.z]).T + np.matrix([vector.x, vector.y, vector.z]).T))
+            return Point(self.x + vector.x, self.y + vector.y, self.z + vector.z)
         else:
             raise TypeError("`{}` is not a valid Vector".format(vector))
 
@@ -76,17 +108,17 @@ class Point(object):
         return None
 
     def __neg__(self):
-        return self.__class__(*[-getattr(self, key) for key in self.__slots__])
+        return self.__class__(*[-getattr(self, key) for key in Point.__slots__])
 
     def __eq__(self, other):
         if isinstance(other, Point):
-            return all([True if getattr(self, key) == getattr(other, key) else False for key in self.__slots__])
+            return all([True if getattr(self, key) == getattr(other, key) else False for key in Point.__slots__])
         else:
             raise TypeError("`{}` is not a valid Point".format(other))
 
     def __getitem__(self, item):
         try:
-            return getattr(self, self.__slots__[item])
+            return getattr(self, Point.__slots__[item])
         except IndexError or KeyError as error:
             raise error
 
@@ -107,7 +139,7 @@ class Vector(Point):
         :rtype: Vector
         """
         try:
-            return Vector(*(np.matrix([self.x, self.y, self.z]).T * other))
+            return Vector(self.x * other, self.y * other, self.z * other)
         except Exception as e:
             raise e
 
@@ -125,16 +157,177 @@ class Vector(Point):
         return Vector(*[getattr(self, key) / mag for key in self.__slots__])
 
 
+class PointView(Point):
+
+    __slots__ = ['_row']
+
+    def __init__(self, row):
+        """ Lightweight :py:class:`Point` that reads and writes its coordinates straight from a row of the buffer of a
+        :py:class:`PointArray` instead of holding a copy of them
+
+        :param numpy.ndarray row: View of a single (3,) row of a :py:class:`PointArray` buffer
+        """
+        self._row = row
+
+    @property
+    def x(self):
+        return float(self._row[0])
+
+    @x.setter
+    def x(self, value):
+        self._row[0] = value
+
+    @property
+    def y(self):
+        return float(self._row[1])
+
+    @y.setter
+    def y(self, value):
+        self._row[1] = value
+
+    @property
+    def z(self):
+        return float(self._row[2])
+
+    @z.setter
+    def z(self, value):
+        self._row[2] = value
+
+    def __neg__(self):
+        return Point(*[-getattr(self, key) for key in Point.__slots__])
+
+
+class PointArray(object):
+
+    __slots__ = ['xyz']
+
+    def __init__(self, xyz):
+        """ Structure-of-arrays container of points backed by a single contiguous (N, 3) float64 buffer. Indexing
+        returns a :py:class:`PointView` into the buffer while slicing returns a new :py:class:`PointArray`
+
+        :param xyz: Array-like of shape (N, 2) or (N, 3) (Optional: If only 2 columns are given points will be on the
+                    XY plane)
+        """
+        xyz = np.asarray(xyz, dtype=np.float64)
+        if xyz.size == 0:
+            xyz = xyz.reshape(0, 3)
+        if xyz.ndim != 2 or xyz.shape[1] not in (2, 3):
+            raise ValueError('Expected an array of shape (N, 2) or (N, 3), got {}'.format(xyz.shape))
+        if xyz.shape[1] == 2:
+            xyz = np.column_stack((xyz, np.zeros(xyz.shape[0])))
+        self.xyz = np.ascontiguousarray(xyz)
+
+    @classmethod
+    def from_points(cls, points):
+        """ Constructs a :py:class:`PointArray` from an iterable of :py:class:`Point`, arrays of coordinates are wrapped
+        directly
+
+        :param points: Points to copy into the buffer
+        :type points: list[Point] or numpy.ndarray
+        :rtype: PointArray
+        """
+        if isinstance(points, cls):
+            return points
+        elif isinstance(points, np.ndarray):
+            return cls(points)
+        return cls([[pnt.x, pnt.y, pnt.z] for pnt in points])
+
+    @classmethod
+    def concatenate(cls, arrays):
+        """ Joins several :py:class:`PointArray` end-to-end into a new buffer
+
+        :param list[PointArray] arrays: Arrays to join in order
+        :rtype: PointArray
+        """
+        return cls(np.concatenate([cls.from_points(arr).xyz for arr in arrays], axis=0))
+
+    @property
+    def x(self):
+        """ View of all X-coordinates
+
+        :rtype: numpy.ndarray
+        """
+        return self.xyz[:, 0]
+
+    @property
+    def y(self):
+        """ View of all Y-coordinates
+
+        :rtype: numpy.ndarray
+        """
+        return self.xyz[:, 1]
+
+    @property
+    def z(self):
+        """ View of all Z-coordinates
+
+        :rtype: numpy.ndarray
+        """
+        return self.xyz[:, 2]
+
+    def copy(self):
+        return PointArray(self.xyz.copy())
+
+    def rotate(self, angle):
+        """ Rotates all points about the reference ``Point(0, 0, 0)`` in a single pass
+
+        :param float angle: Rotation angle in SI degree [deg]
+        :rtype: PointArray
+        """
+        return PointArray(rotate_many(self.xyz, angle)) if angle != 0.0 else self
+
+    def translate(self, vector):
+        """ Translates all points by ``vector`` in a single pass
+
+        :param Vector vector: Translation vector
+        :rtype: PointArray
+        """
+        if isinstance(vector, Vector):
+            return PointArray(translate_many(self.xyz, vector))
+        else:
+            raise TypeError("`{}` is not a valid Vector".format(vector))
+
+    def __len__(self):
+        return self.xyz.shape[0]
+
+    def __iter__(self):
+        return (PointView(row) for row in self.xyz)
+
+    def __reversed__(self):
+        return (PointView(row) for row in self.xyz[::-1])
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return PointArray(self.xyz[item])
+        return PointView(self.xyz[item])
+
+    def __reduce__(self):
+        return PointArray, (self.xyz,)
+
+    def __array__(self, dtype=None):
+        return self.xyz if dtype is None else self.xyz.astype(dtype)
+
+    def __repr__(self):
+        return '<{}({} points) object at {}>'.format(self.__class__.__name__, len(self), hex(id(self)))
+
+
 class Curve(object):
 
+    arc_length_subdivisions = 4
+    gauss_points = 5
+    projection_samples = 2000
+    normal_angle_subdivisions = 8
+    disk_cache = None  # Optional :py:class:`geometry.cache.SplineCache` shared by all instances
+
     def __init__(self, built_from, degree=3):
         """ Constructs a 2D B-spline from a list of :py:class:`Point` making use of the SciPy spline functions
 
-        :param list[Point] built_from: Specifies the points the curve should be built-from
+        :param PointArray built_from: Specifies the points the curve should be built-from, a list of
+                                      :py:class:`Point` is converted to a :py:class:`PointArray`
         :param int degree: Degree of the spline used to fit to the data
         """
         self.__cache__ = {}
-        self.built_from = built_from
+        self.built_from = PointArray.from_points(built_from)
         self.degree = degree
 
     @property
@@ -147,17 +340,110 @@ class Curve(object):
         if 'spline' in self.__cache__.keys():
             return self.__cache__['spline']
         else:
-            _x, _y = [pnt.x for pnt in self.built_from], [pnt.y for pnt in self.built_from]
+            _x, _y = self.built_from.x, self.built_from.y
+
+            # Consulting the persistent cache shared between processes, see :py:class:`geometry.cache.SplineCache`
+            key = self.disk_cache.key(_x, _y, self.degree) if self.disk_cache is not None else None
+            _spline = self.disk_cache.get(key) if key is not None else None
+
+            if _spline is None:
+                # TODO: Allow user specification of smoothing
+                # Smoothing hardcoded for now s = 0.0
+                _spline, u, = si.splprep((_x, _y), s=0.0, k=self.degree)  # Ignore unpacking warning, due to Numpy doc
+                if key is not None:
+                    self.disk_cache.put(key, _spline)
 
-            # TODO: Allow user specification of smoothing
-            # Smoothing hardcoded for now s = 0.0
-            _spline, u, = si.splprep((_x, _y), s=0.0, k=self.degree)  # Ignore unpacking warning, it is due to Numpy doc
             self.__cache__['spline'] = _spline
             return _spline
 
+    def __getstate__(self):
+        """ Pickles the points and the fitted spline only, all other cached quantities are cheap to rebuild from the
+        spline and are thus not sent to worker processes """
+        state = dict(self.__dict__)
+        state['__cache__'] = {key: value for key, value in self.__cache__.items() if key == 'spline'}
+        return state
+
+    def rotate(self, angle):
+        """ Rotates the curve about the z-axis through the reference ``Point(0, 0, 0)``. Since B-splines are invariant
+        under affine transformations the fitted spline is carried over by rotating its coefficients instead of
+        re-fitting the rotated points.
+
+        :param float angle: Rotation angle in SI degree [deg]
+        :rtype: Curve
+        """
+        knots, (c_x, c_y), degree = self.spline
+        coefficients = rotate_many(np.column_stack((c_x, c_y, np.zeros(len(c_x)))), angle)
+
+        curve = Curve(self.built_from.rotate(angle), degree=self.degree)
+        curve.__cache__['spline'] = [knots, [coefficients[:, 0], coefficients[:, 1]], degree]
+        return curve
+
+    def evaluate(self, u, der=0):
+        """ Evaluates the spline, or one of its derivatives, at an array of parameters with a single ``splev`` call
+
+        :param u: Scalar or array-like of parameters in the interval [0, 1]
+        :param int der: Order of the derivative to evaluate (Optional: Defaults to the position on the curve)
+
+        :return: Array of shape (N, 2) holding the x and y components
+        :rtype: numpy.ndarray
+        """
+        return np.column_stack(si.splev(np.atleast_1d(np.asarray(u, dtype=np.float64)), self.spline, der=der))
+
+    def points_at_parameters(self, u):
+        """ Returns the points on the curve at an array of parameters ``u``
+
+        :rtype: numpy.ndarray
+        """
+        return self.evaluate(u, der=0)
+
+    def tangents(self, u):
+        """ Returns the curve unit tangent vectors evaluated at an array of parameters ``u``
+
+        :rtype: numpy.ndarray
+        """
+        d1 = self.evaluate(u, der=1)
+        return d1 / np.hypot(d1[:, 0], d1[:, 1])[:, np.newaxis]
+
+    def normals(self, u):
+        """ Returns the curve unit normal vectors evaluated at an array of parameters ``u``, see :py:meth:`normal`
+        for the sign convention
+
+        :rtype: numpy.ndarray
+        """
+        t = self.tangents(u)
+        return np.column_stack((-t[:, 1], t[:, 0]))
+
+    def curvature(self, u):
+        """ Returns the signed curvature at an array of parameters ``u``. Positive curvature turns the tangent
+        counter-clockwise, i.e. towards the normal vector.
+
+        :rtype: numpy.ndarray
+        """
+        d1, d2 = self.evaluate(u, der=1), self.evaluate(u, der=2)
+        cross = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+        return cross / np.hypot(d1[:, 0], d1[:, 1])**3
+
+    def curvature_field(self, u):
+        """ Evaluates the complete curvature field at an array of parameters ``u`` from one evaluation of the first
+        and second derivatives
+
+        :return: Dictionary of the slope ``dy/dx``, signed ``curvature``, ``radius`` of curvature and the (N, 2)
+                 ``center`` of the osculating circles
+        :rtype: dict
+        """
+        points, d1, d2 = self.evaluate(u, der=0), self.evaluate(u, der=1), self.evaluate(u, der=2)
+        speed = np.hypot(d1[:, 0], d1[:, 1])
+        curvature = (d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]) / speed**3
+        with np.errstate(divide='ignore'):
+            radius = 1. / np.abs(curvature)
+            slope = d1[:, 1] / d1[:, 0]
+        normals = np.column_stack((-d1[:, 1], d1[:, 0])) / speed[:, np.newaxis]
+        return {'slope': slope, 'curvature': curvature, 'radius': radius,
+                'center': points + normals / curvature[:, np.newaxis]}
+
     def tangent(self, u):
         """ Returns the curve unit tangent vector evaluated at the parameter ``u`` """
-        return Vector(*si.splev(u, self.spline, der=1)).normalize()
+        return Vector(*self.tangents(u)[0])
 
     def normal(self, u):
         """ Returns the curve unit normal vector evaluated at the parameter ``u``
@@ -167,14 +453,251 @@ class Curve(object):
 
         :rtype: Vector
         """
-        return self.tangent(u).cross(Vector(0, 0, -1))
+        return Vector(*self.normals(u)[0])
 
     def point_at_parameter(self, u):
         """ Returns a point on the curve at a parameter ``u``
 
         :rtype: Point
         """
-        return Point(*si.splev(u, self.spline, der=0))
+        return Point(*self.points_at_parameters(u)[0])
+
+    @property
+    def polynomials(self):
+        """ Cached piecewise-polynomial (:py:class:`scipy.interpolate.PPoly`) representation of the derivatives
+        ``dx/du`` and ``dy/du`` of the B-spline, which allows roots to be extracted analytically per knot span
+
+        :rtype: tuple[scipy.interpolate.PPoly]
+        """
+        if 'polynomials' in self.__cache__.keys():
+            return self.__cache__['polynomials']
+        else:
+            knots, coefficients, degree = self.spline
+            polynomials = tuple(si.PPoly.from_spline((knots, c, degree)).derivative() for c in coefficients)
+            self.__cache__['polynomials'] = polynomials
+            return polynomials
+
+    def derivative_roots(self, a, b):
+        """ Returns all parameters ``u`` in the interval [0, 1] where ``a * dx/du + b * dy/du = 0``. For instance
+        ``derivative_roots(0, 1)`` yields the points where the slope of the curve is zero. Results are cached per
+        combination of ``a`` and ``b``.
+
+        :param float a: Weight of ``dx/du``
+        :param float b: Weight of ``dy/du``
+        :rtype: numpy.ndarray
+        """
+        key = ('derivative_roots', float(a), float(b))
+        if key in self.__cache__.keys():
+            return self.__cache__[key]
+        else:
+            dx, dy = self.polynomials
+            roots = si.PPoly(a * dx.c + b * dy.c, dx.x, extrapolate=False).roots(discontinuity=False)
+            roots = np.unique(roots[np.isfinite(roots) & (roots >= 0.) & (roots <= 1.)])
+            self.__cache__[key] = roots
+            return roots
+
+    def normal_angle_roots(self, angle):
+        """ Returns all parameters ``u`` where the normal vector forms an angle of ``angle`` with the x-axis in the
+        1st quadrant, i.e. where ``atan(|n_y / n_x|) = angle``. As the normal is the tangent rotated by 90 deg this is
+        equivalent to ``|dx/du| = tan(angle) |dy/du|``, which is solved analytically on both branches.
+
+        :param float angle: Target angle in SI degree [deg]
+        :rtype: numpy.ndarray
+        """
+        tan = np.tan(np.radians(angle))
+        return np.union1d(self.derivative_roots(1., -tan), self.derivative_roots(1., tan))
+
+    @property
+    def normal_angle_table(self):
+        """ Cached table of the angle ``atan(|n_y / n_x|)`` between the normal vector and the x-axis in SI degree [deg]
+        at a set of parameters ``u``, every knot span is split into ``normal_angle_subdivisions`` intervals
+
+        :rtype: dict
+        """
+        if 'normal_angle_table' in self.__cache__.keys():
+            return self.__cache__['normal_angle_table']
+        else:
+            knots, _, degree = self.spline
+            breaks = np.unique(knots[degree:-degree])
+            fractions = np.linspace(0., 1., self.normal_angle_subdivisions + 1)[:-1]
+            u = np.append((breaks[:-1, np.newaxis] + np.diff(breaks)[:, np.newaxis] * fractions).ravel(), breaks[-1])
+
+            d1 = np.abs(self.evaluate(u, der=1))
+            table = {'u': u, 'angle': np.degrees(np.arctan2(d1[:, 0], d1[:, 1]))}
+            self.__cache__['normal_angle_table'] = table
+            return table
+
+    def normal_angle_parameters(self, angles, lower=0., upper=1., tolerance=1e-14, max_iterations=50):
+        """ Batched counterpart of :py:meth:`normal_angle_roots` which returns the first parameter ``u`` in the
+        interval (``lower``, ``upper``] where the normal vector forms the target angle with the x-axis, for a whole
+        array of target angles at once. The crossing of every target is located in :py:attr:`normal_angle_table`
+        after which safeguarded Newton iterations on ``cos(angle) |dx/du| - sin(angle) |dy/du| = 0`` refine all
+        parameters simultaneously, falling back to bisection whenever a step leaves the bracket.
+
+        :param angles: Target angles in SI degree [deg], array-like of shape (n_angles,)
+        :param float lower: Exclusive lower bound of the parameter
+        :param float upper: Inclusive upper bound of the parameter
+        :param float tolerance: Convergence criterion on the width of the bracket
+        :param int max_iterations: Maximum number of iterations
+
+        :return: Parameters of shape (n_angles,), NaN where no crossing exists within the interval
+        :rtype: numpy.ndarray
+        """
+        angles = np.atleast_1d(np.asarray(angles, dtype=np.float64))
+        table = self.normal_angle_table
+        inside = (table['u'] > lower) & (table['u'] < upper)
+        u = np.concatenate(([lower], table['u'][inside], [upper]))
+        d1 = np.abs(self.evaluate(u[[0, -1]], der=1))
+        phi = np.concatenate(([np.degrees(np.arctan2(d1[0, 0], d1[0, 1]))], table['angle'][inside],
+                              [np.degrees(np.arctan2(d1[1, 0], d1[1, 1]))]))
+
+        # First sample interval in which each target is crossed, a root on the lower bound itself is excluded
+        diff = phi[np.newaxis, :] - angles[:, np.newaxis]
+        crossed = (diff[:, :-1] * diff[:, 1:] < 0.) | (diff[:, 1:] == 0.)
+        found = crossed.any(axis=1)
+        first = np.argmax(crossed, axis=1)
+        result = np.full(angles.shape, np.nan)
+
+        active = np.flatnonzero(found)
+        a, b = u[first[active]], u[first[active] + 1]
+        sign_a = np.sign(diff[active, first[active]])
+        cos, sin = np.cos(np.radians(angles[active])), np.sin(np.radians(angles[active]))
+        x = b.copy()
+        for _ in range(max_iterations):
+            d1, d2 = self.evaluate(x, der=1), self.evaluate(x, der=2)
+            g = cos * np.abs(d1[:, 0]) - sin * np.abs(d1[:, 1])
+            dg = cos * np.sign(d1[:, 0]) * d2[:, 0] - sin * np.sign(d1[:, 1]) * d2[:, 1]
+
+            # Shrinking the bracket towards the root
+            same = np.sign(g) == sign_a
+            a, b = np.where(same, x, a), np.where(same, b, x)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x_new = x - g / dg
+            bisect = ~np.isfinite(x_new) | (x_new <= a) | (x_new >= b)
+            x_new[bisect] = (a[bisect] + b[bisect]) / 2.
+
+            converged = (g == 0.) | (np.abs(x_new - x) < tolerance) | (b - a < tolerance)
+            result[active[converged]] = np.where(g[converged] == 0., x[converged], x_new[converged])
+            keep = ~converged
+            active, a, b, x, sign_a, cos, sin = (arr[keep] for arr in (active, a, b, x_new, sign_a, cos, sin))
+            if active.size == 0:
+                break
+        result[active] = x
+        return result
+
+    @property
+    def arc_length_table(self):
+        """ Cached table of the cumulative arc-length ``s`` and speed ``ds/du`` at a set of parameters ``u``. Every
+        knot span of the spline is split into ``arc_length_subdivisions`` intervals on which the speed ``|dC/du|`` is
+        integrated with ``gauss_points``-point Gauss-Legendre quadrature.
+
+        :rtype: dict
+        """
+        if 'arc_length_table' in self.__cache__.keys():
+            return self.__cache__['arc_length_table']
+        else:
+            knots, _, degree = self.spline
+            breaks = np.unique(knots[degree:-degree])
+            fractions = np.linspace(0., 1., self.arc_length_subdivisions + 1)[:-1]
+            u = np.append((breaks[:-1, np.newaxis] + np.diff(breaks)[:, np.newaxis] * fractions).ravel(), breaks[-1])
+
+            nodes, weights = np.polynomial.legendre.leggauss(self.gauss_points)
+            half, mid = np.diff(u) / 2., (u[:-1] + u[1:]) / 2.
+            d1 = self.evaluate((mid[:, np.newaxis] + half[:, np.newaxis] * nodes).ravel(), der=1)
+            speed = np.hypot(d1[:, 0], d1[:, 1]).reshape(-1, self.gauss_points)
+            s = np.concatenate(([0.], np.cumsum(half * speed.dot(weights))))
+
+            d1 = self.evaluate(u, der=1)
+            table = {'u': u, 's': s, 'speed': np.hypot(d1[:, 0], d1[:, 1])}
+            self.__cache__['arc_length_table'] = table
+            return table
+
+    def length(self, u=None):
+        """ Returns the arc-length measured from the start of the curve
+
+        :param u: Scalar or array-like of parameters (Optional: If not provided the total length is returned)
+        :rtype: float or numpy.ndarray
+        """
+        table = self.arc_length_table
+        if u is None:
+            return table['s'][-1]
+        if 'length_interpolant' not in self.__cache__.keys():
+            self.__cache__['length_interpolant'] = si.CubicHermiteSpline(table['u'], table['s'], table['speed'])
+        return self.__cache__['length_interpolant'](np.clip(u, 0., 1.))
+
+    def u_at_length(self, s):
+        """ Returns the parameters ``u`` located at an arc-length ``s`` from the start of the curve. The inverse of
+        the arc-length table is interpolated with cubic Hermite polynomials using ``du/ds = 1 / |dC/du|``.
+
+        :param s: Scalar or array-like of arc-lengths in the interval [0, :py:meth:`length`]
+        :rtype: numpy.ndarray
+        """
+        table = self.arc_length_table
+        if 'u_interpolant' not in self.__cache__.keys():
+            self.__cache__['u_interpolant'] = si.CubicHermiteSpline(table['s'], table['u'], 1. / table['speed'])
+        return self.__cache__['u_interpolant'](np.clip(s, 0., table['s'][-1]))
+
+    def point_at_length(self, s):
+        """ Returns the points on the curve located at an array of arc-lengths ``s``
+
+        :rtype: numpy.ndarray
+        """
+        return self.points_at_parameters(self.u_at_length(s))
+
+    @property
+    def sample_tree(self):
+        """ Cached KD-tree over ``projection_samples`` points spaced equally in arc-length along the curve together
+        with the parameters ``u`` of the samples
+
+        :rtype: dict
+        """
+        if 'sample_tree' in self.__cache__.keys():
+            return self.__cache__['sample_tree']
+        else:
+            u = self.u_at_length(np.linspace(0., self.length(), self.projection_samples))
+            tree = {'tree': cKDTree(self.points_at_parameters(u)), 'u': u}
+            self.__cache__['sample_tree'] = tree
+            return tree
+
+    def project(self, points, tolerance=1e-12, max_iterations=20):
+        """ Finds the closest point on the curve for a large set of query points at once. An initial guess of the
+        parameter is obtained from the nearest sample in :py:attr:`sample_tree` after which Newton iterations on
+        ``(C(u) - p) . C'(u) = 0`` refine all parameters simultaneously.
+
+        :param points: Array-like of shape (M, 2), (M, 3) or a :py:class:`PointArray` of query points
+        :param float tolerance: Convergence criterion on the largest parameter update
+        :param int max_iterations: Maximum number of Newton iterations
+
+        :return: Dictionary with the parameters ``u`` (M,), foot points ``point`` (M, 2) and ``distance`` (M,) which is
+                 positive on the side the curve normal points to, see :py:meth:`normal`
+        :rtype: dict
+        """
+        p = np.asarray(points, dtype=np.float64).reshape(-1, np.shape(points)[-1])[:, :2]
+        if p.shape[0] == 0:
+            return {'u': np.empty(0), 'point': np.empty((0, 2)), 'distance': np.empty(0)}
+        _, idx = self.sample_tree['tree'].query(p)
+        u = self.sample_tree['u'][idx]
+
+        active = np.arange(p.shape[0])  # Only points that have not converged yet are iterated upon
+        for _ in range(max_iterations):
+            u_active = u[active]
+            delta = self.evaluate(u_active, der=0) - p[active]
+            d1, d2 = self.evaluate(u_active, der=1), self.evaluate(u_active, der=2)
+            f = np.einsum('ij,ij->i', delta, d1)
+            speed_sq = np.einsum('ij,ij->i', d1, d1)
+            df = speed_sq + np.einsum('ij,ij->i', delta, d2)
+            step = f / np.where(df > 0., df, speed_sq)  # Falls back to a Gauss-Newton step away from the minimum
+            u_new = np.clip(u_active - step, 0., 1.)
+            u[active] = u_new
+            active = active[np.abs(u_new - u_active) >= tolerance]
+            if active.size == 0:
+                break
+
+        foot = self.points_at_parameters(u)
+        normals = self.normals(u)
+        delta = p - foot
+        distance = np.hypot(delta[:, 0], delta[:, 1]) * np.where(np.einsum('ij,ij->i', delta, normals) < 0., -1., 1.)
+        return {'u': u, 'point': foot, 'distance': distance}
 
 
 if __name__ == '__main__':
@@ -17,12 +17,17 @@
 
 import os
 from geometry.airfoil import Airfoil
-from geometry.definitions import Point
+from geometry.definitions import Point, PointArray
+from geometry.writer import write_dat, write_npz
 from directories import DIRS
+from utils import Attribute, Input
 
 
 class Domain(object):
 
+    airfoil_in = Input()
+    upstream, top, bottom, wake = Input(), Input(), Input(), Input()
+
     def __init__(self, airfoil_in, upstream=13., top=13., bottom=13., wake=20.):
         """ Constructs the points defining the domain used to simulate the airfoil
 
@@ -40,75 +45,67 @@ class Domain(object):
     def default_directory(self):
         return os.path.join(DIRS['DATA_DIR'], 'geom')
 
-    @property
+    @Attribute
     def x_center(self):
         return self.airfoil_in.center.x
 
-    @property
+    @Attribute
     def x_le(self):
         return self.airfoil_in.leading_edge.x
 
-    @property
+    @Attribute
     def x_te(self):
         return self.airfoil_in.trailing_edge.x
 
-    @property
+    @Attribute
     def pt_1(self):
         return Point(self.x_center, self.top, 0)
 
-    @property
+    @Attribute
     def pt_2(self):
         return Point(self.x_te + self.wake, self.top, 0)
 
-    @property
+    @Attribute
     def pt_3(self):
         return Point(self.pt_2.x, -self.bottom, 0)
 
-    @property
+    @Attribute
     def pt_4(self):
         return Point(self.x_center, -self.bottom, 0)
 
-    @property
+    @Attribute
     def pt_5(self):
         return Point(self.x_le - self.upstream, 0, 0)
 
-    def write_dat(self, filename=None, extension='_DOMAIN.dat'):
-        """ Writes modified airfoil ordinates to .dat file """
+    @Attribute
+    def points(self):
+        """ Domain corner points ``pt_1`` through ``pt_5`` gathered into a single buffer
+
+        :rtype: PointArray
+        """
+        return PointArray.from_points([self.pt_1, self.pt_2, self.pt_3, self.pt_4, self.pt_5])
+
+    @Attribute
+    def segments(self):
+        """ Segments 1-2, 2-3, 3-4 and 4-1 passing through ``pt_5`` that bound the domain
+
+        :rtype: tuple[PointArray]
+        """
+        points = self.points
+        return points[0:2], points[1:3], points[2:4], PointArray.concatenate((points[3:5], points[0:1]))
+
+    def write_dat(self, filename=None, extension='_DOMAIN.dat', binary=False):
+        """ Writes the segments of the domain to .dat file
+
+        :param bool binary: Toggles writing an exact ``.npz`` companion file next to the .dat file
+        """
         name = self.airfoil_in.__name__
         filename = filename if filename is not None else os.path.join(self.default_directory, name + extension)
-
-        def point_format(open_file, point):
-            return open_file.write('  {:1.6f}  {:1.6f}  {:1.6f}\n'.format(point.x, point.y, point.z).replace('-0', '-'))
-
-        pt_1 = self.pt_1
-        pt_2 = self.pt_2
-        pt_3 = self.pt_3
-        pt_4 = self.pt_4
-        pt_5 = self.pt_5
-
-        with open(filename, 'w') as output:
-            output.write('# {} AIRFOIL DOMAIN\n'.format(name))
-
-            # Segment 1-2
-            output.write(' {:d} 0\n'.format(2))
-            point_format(output, pt_1)
-            point_format(output, pt_2)
-
-            # Segment 2-3
-            output.write(' {:d} 0\n'.format(2))
-            point_format(output, pt_2)
-            point_format(output, pt_3)
-
-            # Segment 3-4
-            output.write(' {:d} 0\n'.format(2))
-            point_format(output, pt_3)
-            point_format(output, pt_4)
-
-            # Segment 4-1
-            output.write(' {:d} 0\n'.format(3))
-            point_format(output, pt_4)
-            point_format(output, pt_5)
-            point_format(output, pt_1)
+        header = '{} AIRFOIL DOMAIN'.format(name)
+        curves = self.segments
+        write_dat(filename, curves=curves, header=header)
+        if binary:
+            write_npz(os.path.splitext(filename)[0] + '.npz', curves=curves, header=header)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" library.py stores collections of airfoils in a single binary file that is opened through memory-mapping. The file
+consists of three consecutive parts:
+
+    1. Header: 8 byte magic ``AFLIB001`` followed by the number of airfoils as a little-endian uint64
+    2. Index: One record per airfoil holding its name (64 bytes), the row offset of its points within the coordinate
+       block (uint64), and the number of top and bottom points (2x uint32)
+    3. Coordinate block: Contiguous little-endian float64 array of shape (N, 3) with the top points of an airfoil
+       followed by its bottom points, both running from LE to TE at 0 deg AoA
+
+Only the pages of the airfoils that are actually accessed are read from disk, and worker processes that open the same
+library share these pages through the OS page cache.
+"""
+
+import os
+import numpy as np
+from geometry.definitions import PointArray
+from geometry.parser import read_directory
+
+__all__ = ['AirfoilLibrary']
+
+
+class AirfoilLibrary(object):
+
+    magic = b'AFLIB001'
+    header_size = 16
+    index_dtype = np.dtype([('name', 'S64'), ('offset', '<u8'), ('n_top', '<u4'), ('n_bot', '<u4')])
+    coordinate_dtype = np.dtype('<f8')
+
+    def __init__(self, filename):
+        """ Opens an airfoil library by memory-mapping its index and coordinate block
+
+        :param str filename: Path to the library file written by :py:meth:`write`
+        """
+        self.filename = filename
+        with open(filename, 'rb') as data:
+            header = data.read(self.header_size)
+        if len(header) != self.header_size or header[:8] != self.magic:
+            raise IOError('{} is not a valid airfoil library'.format(filename))
+        count = int(np.frombuffer(header[8:], dtype='<u8')[0])
+
+        coordinate_offset = self.header_size + count * self.index_dtype.itemsize
+        n_rows = (os.path.getsize(filename) - coordinate_offset) // (3 * self.coordinate_dtype.itemsize)
+        if count > 0:
+            self.index = np.memmap(filename, dtype=self.index_dtype, mode='r', offset=self.header_size, shape=(count,))
+            self.coordinates = np.memmap(filename, dtype=self.coordinate_dtype, mode='r', offset=coordinate_offset,
+                                         shape=(n_rows, 3))
+        else:
+            self.index = np.empty(0, dtype=self.index_dtype)
+            self.coordinates = np.empty((0, 3), dtype=self.coordinate_dtype)
+        self.__lookup__ = None
+
+    @property
+    def lookup(self):
+        """ Mapping of airfoil names to their position in the index, built on first access
+
+        :rtype: dict
+        """
+        if self.__lookup__ is None:
+            self.__lookup__ = {name.decode('utf-8'): i for i, name in enumerate(self.index['name'])}
+        return self.__lookup__
+
+    @property
+    def names(self):
+        return sorted(self.lookup.keys())
+
+    def __len__(self):
+        return self.index.shape[0]
+
+    def __contains__(self, name):
+        return name in self.lookup
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, name):
+        """ Returns the ordinates of an airfoil as :py:class:`PointArray` views of the memory-mapped coordinates,
+        thus no data is copied
+
+        :param str name: Name of the airfoil
+        :rtype: dict
+        """
+        try:
+            record = self.index[self.lookup[name]]
+        except KeyError:
+            raise KeyError('{} is not in the airfoil library {}'.format(name, self.filename))
+        start, n_top, n_bot = int(record['offset']), int(record['n_top']), int(record['n_bot'])
+        return {'top': PointArray(self.coordinates[start:start + n_top]),
+                'bot': PointArray(self.coordinates[start + n_top:start + n_top + n_bot])}
+
+    @classmethod
+    def write(cls, filename, airfoils):
+        """ Writes a collection of airfoils to a new library file
+
+        :param str filename: Path of the library file
+        :param dict airfoils: Ordinates, as returned by :py:func:`geometry.parser.read_airfoil`, keyed by airfoil name
+        :rtype: AirfoilLibrary
+        """
+        names = sorted(airfoils.keys())
+        index = np.zeros(len(names), dtype=cls.index_dtype)
+        offset = 0
+        for i, name in enumerate(names):
+            encoded = name.encode('utf-8')
+            if len(encoded) > cls.index_dtype['name'].itemsize:
+                raise ValueError('Airfoil name {} exceeds {} bytes'.format(name, cls.index_dtype['name'].itemsize))
+            n_top, n_bot = len(airfoils[name]['top']), len(airfoils[name]['bot'])
+            index[i] = (encoded, offset, n_top, n_bot)
+            offset += n_top + n_bot
+
+        with open(filename, 'wb') as output:
+            output.write(cls.magic)
+            output.write(np.array([len(names)], dtype='<u8').tobytes())
+            output.write(index.tobytes())
+            for name in names:
+                for key in ('top', 'bot'):
+                    output.write(np.asarray(PointArray.from_points(airfoils[name][key]).xyz,
+                                            dtype=cls.coordinate_dtype).tobytes())
+        return cls(filename)
+
+    @classmethod
+    def build(cls, filename, directory, extension='.dat', processes=None):
+        """ Parses all coordinate files within a directory and writes them to a new library file
+
+        :param str filename: Path of the library file
+        :param str directory: Directory containing the coordinate files
+        :param str extension: Extension of the coordinate files
+        :param int processes: Number of worker processes used for parsing, see
+                              :py:func:`geometry.parser.read_directory`
+        :rtype: AirfoilLibrary
+        """
+        return cls.write(filename, read_directory(directory, extension=extension, processes=processes))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" parser.py contains the single reader of airfoil coordinate files used throughout the project. Three layouts are
+detected automatically:
+
+    * **Selig**: One list of points running from the TE over the top surface to the LE and back over the bottom surface
+    * **Lednicer**: A line holding the number of top and bottom points followed by both surfaces from LE to TE
+    * **Grouped**: Every surface is preceded by a line ``n 0`` holding its number of points, as written by
+      :py:meth:`geometry.airfoil.Airfoil.write_dat` and read by ICEM CFD
+
+Values may be delimited by any mix of whitespace, commas, semicolons or tabs and everything after a ``#`` is a comment.
+"""
+
+import os
+import re
+from multiprocessing import Pool, cpu_count
+import numpy as np
+from geometry.definitions import PointArray
+
+__all__ = ['parse_airfoil', 'read_airfoil', 'read_directory']
+
+_COMMENTS = re.compile(r'#[^\n]*')
+_DELIMITERS = re.compile(r'[,;\t]')
+_NUMERIC_LINES = re.compile(r'^ *[-+]?\.?\d[-+.\deE ]*$', re.MULTILINE)
+
+
+def parse_airfoil(text):
+    """ Parses the contents of an airfoil coordinate file. All numeric values are converted in a single call after
+    which the layout is detected from the row structure alone.
+
+    :param str text: Contents of the coordinate file
+    :return: Top and bottom :py:class:`PointArray` both running from LE to TE
+    :rtype: dict
+    """
+    text = _DELIMITERS.sub(' ', _COMMENTS.sub('', text) if '#' in text else text).replace('\r', '')
+    lines = _NUMERIC_LINES.findall(text)
+    if len(lines) == 0:
+        raise ValueError('No coordinates found')
+
+    widths = np.array([len(line.split()) for line in lines])
+    values = np.array(' '.join(lines).split(), dtype=np.float64)
+    starts = np.concatenate(([0], np.cumsum(widths)[:-1]))
+
+    # Rows consisting of two integers where the first is at least 2 can be point-counts of a surface
+    first = values[starts]
+    second = np.where(widths > 1, values[np.minimum(starts + 1, values.size - 1)], 0.)
+    is_count = (widths == 2) & (first >= 2.) & (first == np.round(first)) & (second == np.round(second))
+
+    groups = _find_groups(first, is_count)
+    header_rows = [start - 1 for start, _ in groups if start > 0 and is_count[start - 1]]
+
+    # Collecting the tokens of the coordinate rows into one (N, w) array
+    is_data = np.ones(widths.size, dtype=bool)
+    is_data[header_rows] = False
+    data_widths = widths[is_data]
+    if data_widths.size == 0 or np.any(data_widths != data_widths[0]) or data_widths[0] not in (2, 3):
+        raise ValueError('Coordinate rows must all have either 2 or 3 columns')
+    points = values[np.repeat(is_data, widths)].reshape(-1, data_widths[0])
+
+    # Converting row indices of the groups to indices of the coordinate array
+    row_to_point = np.cumsum(is_data) - 1
+    surfaces = [points[row_to_point[start]:row_to_point[end - 1] + 1] for start, end in groups]
+
+    if len(surfaces) == 1:  # Selig layout, splitting at the LE
+        le = int(np.argmin(surfaces[0][:, 0]))
+        surfaces = [surfaces[0][:le + 1][::-1], surfaces[0][le:]]
+    elif len(surfaces) != 2:
+        raise ValueError('Expected a top and bottom surface, found {} groups of points'.format(len(surfaces)))
+
+    top, bot = [surface if surface[0, 0] <= surface[-1, 0] else surface[::-1] for surface in surfaces]
+    return {'top': PointArray(top), 'bot': PointArray(bot)}
+
+
+def _find_groups(first, is_count):
+    """ Returns the ``(start, end)`` row ranges of the surfaces for the grouped, Lednicer or Selig layout
+
+    :param numpy.ndarray first: First value of every row
+    :param numpy.ndarray is_count: Mask of rows that can be a point-count
+    :rtype: list[tuple]
+    """
+    n_rows = first.size
+
+    # Grouped: Every group is preceded by its count
+    groups, row = [], 0
+    while row < n_rows and is_count[row]:
+        n = int(first[row])
+        groups.append((row + 1, row + 1 + n))
+        row += n + 1
+    if row == n_rows and len(groups) > 0:
+        return groups
+
+    # Lednicer: A single row with the count of top and bottom points
+    if is_count[0]:
+        return [(1, 1 + int(first[0])), (1 + int(first[0]), n_rows)]
+
+    # Selig: No counts at all
+    return [(0, n_rows)]
+
+
+def read_airfoil(filename):
+    """ Reads an airfoil coordinate file, see :py:func:`parse_airfoil`
+
+    :param str filename: Path to the coordinate file
+    :rtype: dict
+    """
+    with open(filename, 'r') as data:
+        return parse_airfoil(data.read())
+
+
+def read_directory(directory, extension='.dat', processes=None):
+    """ Reads all coordinate files within a directory using a pool of worker processes
+
+    :param str directory: Directory containing the coordinate files
+    :param str extension: Extension of the coordinate files
+    :param int processes: Number of worker processes (Optional: Defaults to the number of CPUs, 1 reads serially)
+
+    :return: Dictionary of the ordinates keyed by the file name w/o extension
+    :rtype: dict
+    """
+    names = sorted(name for name in os.listdir(directory) if name.endswith(extension))
+    filenames = [os.path.join(directory, name) for name in names]
+
+    if processes == 1:
+        ordinates = [read_airfoil(filename) for filename in filenames]
+    else:
+        processes = processes if processes is not None else cpu_count()
+        pool = Pool(processes)
+        try:
+            ordinates = pool.map(read_airfoil, filenames, chunksize=max(1, len(filenames) // (4 * processes)))
+        finally:
+            pool.close()
+            pool.join()
+
+    return {os.path.splitext(name)[0]: ordinate for name, ordinate in zip(names, ordinates)}
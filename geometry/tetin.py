@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" tetin.py writes the geometry of an airfoil, its domain and blocking directly to an ICEM CFD tetin (.tin) file,
+replacing the manual import of the .dat files. Points become ``prescribed_point`` entries and curves are written as
+the ``bspline`` of the fitted :py:class:`geometry.definitions.Curve`, thus the geometry in ICEM is exactly the one
+used throughout this project. Entries are formatted and streamed in chunks such that densified surfaces with tens of
+thousands of points are written at once.
+"""
+
+import os
+import numpy as np
+from geometry.definitions import Curve, PointArray
+
+__all__ = ['TetinWriter', 'write_tin']
+
+# Family colors as used in ICEM/RAE2822.tin
+FAMILIES = (('AIRFOIL', 11586867), ('DOMAIN', 14522931), ('BLOCKING', 3368951))
+
+# Number of entries formatted per write
+CHUNK_SIZE = 2 ** 14
+
+
+class TetinWriter(object):
+
+    def __init__(self, filename, triangulation_tolerance=0.001, tetra_size=1e10):
+        """ Streaming writer of tetin files, use as a context manager such that the header and footer are written:
+
+        >>> with TetinWriter('RAE2822.tin') as tin:
+        ...     tin.family('AIRFOIL', 11586867)
+        ...     tin.curve(airfoil.curve['top'], 'AIRFOIL')
+
+        :param str filename: Path of the output file
+        :param float triangulation_tolerance: Tolerance ICEM uses to triangulate the geometry
+        :param float tetra_size: Maximum tetra size of the curves
+        """
+        self.filename = filename
+        self.triangulation_tolerance = triangulation_tolerance
+        self.tetra_size = tetra_size
+        self.families = []
+        self.n_points, self.n_curves = 0, 0
+        self.output = None
+
+    def __enter__(self):
+        self.output = open(self.filename, 'w')
+        self.output.write('// tetin file version 1.1\n// written by {}\n\n'.format(os.path.basename(__file__)))
+        self.output.write('set_triangulation_tolerance {:g}\n'.format(self.triangulation_tolerance))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.output.write('affix 0\n'
+                                  'define_model {:g} reference_size 1\n'
+                                  'return\n'.format(self.tetra_size))
+        finally:
+            self.output.close()
+
+    def family(self, name, color):
+        """ Defines a family, families have to be defined before they are referenced
+
+        :param str name: Name of the family
+        :param int color: RGB color packed into an integer
+        """
+        if name not in self.families:
+            self.output.write('define_family {} color {:d}\n'.format(name, color))
+            self.families.append(name)
+
+    def points(self, points, family):
+        """ Writes prescribed points, which are named ``pnt<i>`` consecutively over the whole file
+
+        :param PointArray points: Points to write
+        :param str family: Name of the family the points belong to
+        """
+        xyz = PointArray.from_points(points).xyz
+        line = 'prescribed_point %.14g %.14g %.14g family {} name pnt%d\n'.format(family)
+        for start in range(0, xyz.shape[0], CHUNK_SIZE):
+            chunk = xyz[start:start + CHUNK_SIZE]
+            index = np.arange(self.n_points + start, self.n_points + start + chunk.shape[0])
+            self.output.write((line * chunk.shape[0]) % tuple(np.column_stack((chunk, index)).ravel().tolist()))
+        self.n_points += xyz.shape[0]
+
+    def curve(self, curve, family, name=None):
+        """ Writes the B-spline of a curve. The knots are scaled from [0, 1] to the chord-length of the fitted points,
+        which gives ICEM a parameter in units of length
+
+        :param curve: Curve to write, a :py:class:`PointArray` is fitted with the highest degree up to 3 first
+        :type curve: Curve or PointArray
+        :param str family: Name of the family the curve belongs to
+        :param str name: Name of the curve (Optional: Defaults to ``crv<i>``)
+        """
+        if not isinstance(curve, Curve):
+            points = PointArray.from_points(curve)
+            curve = Curve(points, degree=min(3, len(points) - 1))
+        knots, (c_x, c_y), degree = curve.spline
+        n = len(knots) - degree - 1
+        xyz = curve.built_from.xyz
+        chord = np.hypot(np.diff(xyz[:, 0]), np.diff(xyz[:, 1])).sum()
+
+        name = name if name is not None else 'crv{:d}'.format(self.n_curves)
+        self.output.write('define_curve family {} tetra_size {:g} name {}\nbspline\n{:d},{:d},0\n'.format(
+            family, self.tetra_size, name, n, degree + 1))
+
+        knots = np.asarray(knots, dtype=np.float64) * chord
+        rows = [knots[i:i + 5] for i in range(0, knots.size, 5)]
+        self.output.write(''.join(','.join('%.14g' % k for k in row) + '\n' for row in rows))
+
+        control = np.column_stack((c_x[:n], c_y[:n], np.zeros(n)))
+        for start in range(0, n, CHUNK_SIZE):
+            chunk = control[start:start + CHUNK_SIZE]
+            self.output.write(('%.14g,%.14g,%.14g\n' * chunk.shape[0]) % tuple(chunk.ravel().tolist()))
+        self.n_curves += 1
+
+
+def write_tin(filename, airfoil, domain=None, blocking=None, points=True):
+    """ Writes the geometry of an airfoil and optionally its domain and blocking to a tetin file. Each is written to
+    its own family, ``AIRFOIL``, ``DOMAIN`` and ``BLOCKING`` respectively.
+
+    :param str filename: Path of the output file
+    :param geometry.airfoil.Airfoil airfoil: Airfoil, its top and bottom curves are written
+    :param geometry.domain.Domain domain: Domain, its boundary segments are written (Optional)
+    :param geometry.blocking.Blocking blocking: Blocking, its refinement spline is written (Optional)
+    :param bool points: Toggles writing the ordinates and the domain and blocking points as prescribed points
+    """
+    with TetinWriter(filename) as tin:
+        for family, color in FAMILIES:
+            tin.family(family, color)
+
+        if points:
+            tin.points(airfoil.ordinates['top'], 'AIRFOIL')
+            tin.points(airfoil.ordinates['bot'], 'AIRFOIL')
+            if domain is not None:
+                tin.points(domain.points, 'DOMAIN')
+            if blocking is not None:
+                tin.points(blocking.points, 'BLOCKING')
+                tin.points(blocking.refinement_points, 'BLOCKING')
+
+        tin.curve(airfoil.curve['top'], 'AIRFOIL')
+        tin.curve(airfoil.curve['bot'], 'AIRFOIL')
+        if domain is not None:
+            [tin.curve(segment, 'DOMAIN') for segment in domain.segments]
+        if blocking is not None:
+            tin.curve(blocking.refinement_points, 'BLOCKING')
+
+
+if __name__ == '__main__':
+    from geometry.airfoil import Airfoil
+    from geometry.domain import Domain
+    from geometry.blocking import Blocking
+    obj = Blocking(Domain(Airfoil(angle=2.31), upstream=13., top=13., bottom=13., wake=20.))
+    write_tin(os.path.join(obj.default_directory, 'RAE2822.tin'), obj.airfoil_in, obj.domain_in, obj)
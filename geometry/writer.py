@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" writer.py contains the shared writers of the .dat geometry files imported into ICEM CFD. A file consists of an
+optional comment header, loose points, and curves that are each preceded by a line ``n 0`` holding their number of
+points. Coordinates are formatted a whole chunk at a time with array operations instead of one ``str.format`` call
+per point.
+
+Since the text format is limited to a fixed number of decimals, the same content can be written to a binary ``.npz``
+companion file that holds the exact float64 coordinates and is read back with :py:func:`read_npz`.
+"""
+
+import numpy as np
+from geometry.definitions import PointArray
+
+__all__ = ['format_points', 'write_points', 'write_dat', 'write_npz', 'read_npz']
+
+# Number of points formatted per write, bounds the size of the intermediate string for large outputs
+CHUNK_SIZE = 2 ** 16
+
+# Below this number of points the fixed cost of the array operations exceeds that of Python's own formatting
+SMALL_SIZE = 64
+
+
+def format_points(xyz, precision=6):
+    """ Formats an array of points as lines of ``  x  y  z`` identical to ``'%.6f'`` formatting. The leading zero of
+    negative values is removed, i.e. ``-0.5`` is written as ``-.5``, such that all columns keep the same width as the
+    existing ICEM CFD inputs.
+
+    The values are rounded to integers of ``10 ** -precision`` and their digits are laid out in a character array from
+    which the unused columns are masked out afterwards. Values that lie too close to a rounding tie for the scaled
+    float to be trusted are rounded by Python's own formatting instead, thus the output is exact.
+
+    :param numpy.ndarray xyz: Array of points with shape (N, 3)
+    :param int precision: Number of decimals
+    :rtype: str
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    if xyz.shape[0] == 0:
+        return ''
+
+    scale = 10 ** precision
+    magnitude = np.abs(xyz.ravel())
+    if (xyz.shape[0] < SMALL_SIZE or precision < 1 or not np.all(np.isfinite(magnitude)) or
+            magnitude.max() * scale >= 2. ** 52):
+        line = '  {0}  {0}  {0}\n'.format('%.{:d}f'.format(precision))
+        return ((line * xyz.shape[0]) % tuple(xyz.ravel().tolist())).replace('-0.', '-.')
+
+    scaled = magnitude * scale
+    integers = np.rint(scaled).astype(np.int64)
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - .5) < 1e-6 + scaled * 1e-15)
+    for i in ties:
+        integers[i] = int(('%.{:d}f'.format(precision) % magnitude[i]).replace('.', ''))
+    whole, fraction = np.divmod(integers, scale)
+    negative = np.signbit(xyz.ravel())
+
+    # Number of digits of the whole part, a zero whole part is only written for non-negative values
+    n_digits = np.ones(whole.size, dtype=np.int64)
+    for power in range(1, int(whole.max()).bit_length() // 3 + 2):
+        n_digits += whole >= 10 ** power
+    n_digits[negative & (whole == 0)] = 0
+    max_digits = max(int(n_digits.max()), 1)
+
+    # Block of a single value: 2 separating spaces, sign, whole digits, decimal point and fraction digits
+    width = 3 + max_digits + 1 + precision
+    chars = np.zeros((whole.size, width), dtype=np.uint8)
+    chars[:, 0:2] = ord(' ')
+    for k in range(precision):
+        chars[:, width - 1 - k] = ord('0') + (fraction // 10 ** k) % 10
+    chars[:, width - 1 - precision] = ord('.')
+    for k in range(max_digits):
+        column = width - 2 - precision - k
+        chars[:, column] = np.where(k < n_digits, ord('0') + (whole // 10 ** k) % 10, 0)
+    rows = np.flatnonzero(negative)
+    chars[rows, width - 2 - precision - n_digits[rows]] = ord('-')
+
+    lines = np.empty((xyz.shape[0], 3 * width + 1), dtype=np.uint8)
+    lines[:, :-1] = chars.reshape(xyz.shape[0], 3 * width)
+    lines[:, -1] = ord('\n')
+    return lines[lines != 0].tobytes().decode('ascii')
+
+
+def write_points(output, points, precision=6, chunk_size=CHUNK_SIZE):
+    """ Streams points to an open file in chunks of ``chunk_size`` points
+
+    :param output: File opened for writing in text-mode
+    :param points: Points to write
+    :type points: PointArray or collections.Sequence[Point] or numpy.ndarray
+    :param int precision: Number of decimals
+    :param int chunk_size: Number of points formatted at once
+    """
+    xyz = PointArray.from_points(points).xyz
+    for start in range(0, xyz.shape[0], chunk_size):
+        output.write(format_points(xyz[start:start + chunk_size], precision=precision))
+
+
+def write_dat(filename, curves=(), points=None, header=None, precision=6, chunk_size=CHUNK_SIZE):
+    """ Writes a .dat geometry file
+
+    :param str filename: Path of the output file
+    :param curves: Curves written as groups of points each preceded by their point-count
+    :type curves: collections.Sequence[PointArray]
+    :param PointArray points: Loose points written before the curves w/o a point-count (Optional)
+    :param str header: Comment written on the first line (Optional)
+    :param int precision: Number of decimals
+    :param int chunk_size: Number of points formatted at once
+    """
+    with open(filename, 'w') as output:
+        if header is not None:
+            output.write('# {}\n'.format(header))
+        if points is not None:
+            write_points(output, points, precision=precision, chunk_size=chunk_size)
+        for curve in curves:
+            curve = PointArray.from_points(curve)
+            output.write(' {:d} 0\n'.format(len(curve)))
+            write_points(output, curve, precision=precision, chunk_size=chunk_size)
+
+
+def write_npz(filename, curves=(), points=None, header=None):
+    """ Writes the content of a .dat geometry file losslessly to a binary ``.npz`` file, see :py:func:`write_dat`
+
+    :param str filename: Path of the output file
+    :param curves: Curves of the geometry
+    :type curves: collections.Sequence[PointArray]
+    :param PointArray points: Loose points of the geometry (Optional)
+    :param str header: Comment describing the geometry (Optional)
+    """
+    curves = [PointArray.from_points(curve) for curve in curves]
+    np.savez(filename,
+             header=np.array(header if header is not None else ''),
+             points=PointArray.from_points(points if points is not None else np.empty((0, 3))).xyz,
+             curves=PointArray.concatenate(curves).xyz if len(curves) > 0 else np.empty((0, 3)),
+             counts=np.array([len(curve) for curve in curves], dtype=np.int64))
+
+
+def read_npz(filename):
+    """ Reads a binary geometry file written by :py:func:`write_npz`
+
+    :param str filename: Path of the ``.npz`` file
+    :return: Dictionary with the ``header``, loose ``points`` and a list of ``curves``
+    :rtype: dict
+    """
+    with np.load(filename) as data:
+        header, points, curves, counts = str(data['header']), data['points'], data['curves'], data['counts']
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    return {'header': header if header != '' else None,
+            'points': PointArray(points),
+            'curves': [PointArray(curves[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" cgns.py writes and reads structured multi-block grids in the HDF5 layout of CGNS, the native format of CFX-Pre and
+Fluent meshing. Only the nodes of the tree that describe the grid are written::
+
+    /CGNSLibraryVersion
+    /Base                                   CGNSBase_t, cell and physical dimension
+        /<block>                            Zone_t, vertex and cell size
+            /ZoneType                       Structured
+            /GridCoordinates                GridCoordinates_t
+                /CoordinateX, CoordinateY   DataArray_t
+
+Every node is an HDF5 group with the ``name``, ``label``, ``type`` and ``flags`` attributes of the CGNS standard, and
+its data in a dataset named `` data``. CGNS arrays are in Fortran order, thus their datasets hold the reversed shape.
+The coordinates are stored contiguously, such that the reader memory-maps them at their offset in the file, and the
+zones keep the order of the blocks.
+
+Writing and reading requires ``h5py``, which is imported on first use.
+"""
+
+import os
+from collections import OrderedDict
+import numpy as np
+
+__all__ = ['write', 'read']
+
+# Number of j-lines of a block that are copied at once, each is contiguous in the file
+CHUNK_SIZE = 2 ** 8
+
+CGNS_VERSION = 3.3
+
+COORDINATES = ('CoordinateX', 'CoordinateY', 'CoordinateZ')
+
+
+def _h5py():
+    try:
+        import h5py
+    except ImportError:
+        raise ImportError('Reading and writing CGNS files requires h5py, install it by `pip install h5py`')
+    return h5py
+
+
+def _node(parent, name, label, data_type='MT', data=None):
+    """ Creates a CGNS node below ``parent``
+
+    :param str data_type: CGNS data type, ``'MT'`` for no data, ``'I4'``, ``'R4'``, ``'R8'`` or ``'C1'``
+    :rtype: h5py.Group
+    """
+    group = parent.create_group(name, track_order=True)
+    for key, value in (('name', name), ('label', label), ('type', data_type)):
+        group.attrs.create(key, np.bytes_(value), dtype='S33')
+    group.attrs.create('flags', np.array([1], dtype=np.int32))
+    if data is not None:
+        group.create_dataset(' data', data=data)
+    return group
+
+
+def write(filename, blocks, dimension=2, dtype=np.float64):
+    """ Writes blocks of nodes into a CGNS file as zones of a single base
+
+    :param str filename: Path of the file, commonly with a ``.cgns`` extension
+    :param collections.OrderedDict blocks: Nodes of every block keyed by name, each of shape (ni, nj, 2) or (ni, nj, 3),
+                                           see :py:attr:`mesh.generator.MeshGenerator.blocks`
+    :param int dimension: Physical dimension, for 3 the ``CoordinateZ`` is taken from the blocks or set to 0
+    :param dtype: Floating point precision of the coordinates, ``numpy.float64`` or ``numpy.float32``
+    :return: Path of the file
+    :rtype: str
+    """
+    h5py = _h5py()
+    dtype = np.dtype(dtype)
+    data_type = {4: 'R4', 8: 'R8'}[dtype.itemsize]
+
+    directory = os.path.dirname(filename)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with h5py.File(filename, 'w', track_order=True) as root:
+        root.attrs.create('label', np.bytes_('Root Node of HDF5 File'), dtype='S33')
+        root.attrs.create('type', np.bytes_('MT'), dtype='S33')
+        root.attrs.create('flags', np.array([0], dtype=np.int32))
+        root.create_dataset(' format', data=np.frombuffer(b'IEEE_LITTLE_64', dtype=np.int8))
+        root.create_dataset(' hdf5version',
+                            data=np.frombuffer('HDF5 Version {}'.format(h5py.version.hdf5_version).ljust(33, '\0')
+                                               .encode('ascii'), dtype=np.int8))
+        _node(root, 'CGNSLibraryVersion', 'CGNSLibraryVersion_t', 'R4', np.array([CGNS_VERSION], dtype=np.float32))
+        base = _node(root, 'Base', 'CGNSBase_t', 'I4', np.array([2, dimension], dtype=np.int32))
+
+        for name, block in blocks.items():
+            ni, nj = block.shape[:2]
+            # Vertex, cell and boundary vertex size per index direction, as a (2, 3) Fortran array
+            size = np.array([[ni, nj], [ni - 1, nj - 1], [0, 0]], dtype=np.int32)
+            zone = _node(base, name, 'Zone_t', 'I4', size)
+            _node(zone, 'ZoneType', 'ZoneType_t', 'C1', np.frombuffer(b'Structured', dtype=np.int8))
+            coordinates = _node(zone, 'GridCoordinates', 'GridCoordinates_t')
+            for axis, key in enumerate(COORDINATES[:dimension]):
+                array = _node(coordinates, key, 'DataArray_t', data_type)
+                data = array.create_dataset(' data', shape=(nj, ni), dtype=dtype)
+                if axis < block.shape[2]:
+                    for lower in range(0, nj, CHUNK_SIZE):
+                        upper = min(lower + CHUNK_SIZE, nj)
+                        data[lower:upper] = block[:, lower:upper, axis].T
+                else:
+                    data[...] = 0.
+    return filename
+
+
+def read(filename, base='Base', stack=False):
+    """ Opens the grid coordinates of every zone of a structured CGNS base. Coordinates of a contiguous dataset, as
+    written by :py:func:`write`, are memory-mapped at their offset in the file, thus nothing is read until it is used,
+    whereas chunked or compressed datasets of other tools are read through ``h5py``
+
+    :param str filename: Path of the file
+    :param str base: Name of the CGNS base
+    :param bool stack: Toggles copying the coordinates of every zone into a single array in memory of shape
+                       (ni, nj, dimension), e.g. for :py:func:`mesh.quality.summarize`
+    :return: Tuple of the memory-mapped coordinates of shape (ni, nj) of every zone, or the stacked nodes
+    :rtype: collections.OrderedDict
+    """
+    h5py = _h5py()
+    blocks = OrderedDict()
+    with h5py.File(filename, 'r') as root:
+        for name, zone in root[base].items():
+            if zone.attrs.get('label', b'').rstrip(b'\0') != b'Zone_t':
+                continue
+            coordinates = []
+            for key in COORDINATES:
+                if key not in zone['GridCoordinates']:
+                    continue
+                data = zone['GridCoordinates'][key][' data']
+                offset = data.id.get_offset()
+                if offset is None or data.chunks is not None:
+                    coordinates.append(data[...].T)
+                else:
+                    coordinates.append(np.memmap(filename, dtype=data.dtype, mode='r', offset=offset,
+                                                 shape=data.shape).T)
+            blocks[name] = np.stack(coordinates, axis=-1) if stack else tuple(coordinates)
+    return blocks
+
+
+if __name__ == '__main__':
+    from directories import DIRS
+    from mesh.generator import read_blocks
+    directory = os.path.join(DIRS['DATA_DIR'], 'mesh', 'RAE2822')
+    print(write(os.path.join(directory, 'RAE2822.cgns'), read_blocks(directory)))
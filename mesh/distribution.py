@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" distribution.py holds the node distributions, i.e. bunching laws, along the edges of a blocking. Every distribution
+returns the normalized arc-length of ``n`` nodes in the interval [0, 1] with the end points being exact. Spacings are
+normalized with the length of the edge as well.
+
+Reference: Vinokur, M. "On One-Dimensional Stretching Functions for Finite-Difference Calculations", Journal of
+Computational Physics 50, 1983
+"""
+
+import numpy as np
+from scipy.optimize import brentq
+
+__all__ = ['uniform', 'geometric', 'one_sided', 'two_sided']
+
+
+def uniform(n):
+    """ Equally spaced nodes
+
+    :param int n: Number of nodes
+    :rtype: numpy.ndarray
+    """
+    return np.linspace(0., 1., n)
+
+
+def geometric(n, ratio):
+    """ Nodes where every spacing is ``ratio`` times the previous one
+
+    :param int n: Number of nodes
+    :param float ratio: Growth ratio of the spacing
+    :rtype: numpy.ndarray
+    """
+    if ratio == 1.:
+        return uniform(n)
+    s = np.power(float(ratio), np.arange(n)) - 1.
+    return s / s[-1]
+
+
+def _stretching(b):
+    """ Solves ``sinh(d) / d = b``, or ``sin(d) / d = b`` for ``b < 1``, for the stretching factor ``d`` of Vinokur """
+    if abs(b - 1.) < 1e-12:
+        return 0.
+    elif b > 1.:
+        return brentq(lambda d: np.sinh(d) / d - b, 1e-12, np.arcsinh(b) + np.log(b) + 2.)
+    return -brentq(lambda d: np.sin(d) / d - b, 1e-12, np.pi - 1e-12)
+
+
+def one_sided(n, spacing):
+    """ Nodes clustered towards the start with a hyperbolic tangent, the first spacing is exact
+
+    :param int n: Number of nodes
+    :param float spacing: Normalized first spacing, smaller than the uniform spacing ``1 / (n - 1)``
+    :rtype: numpy.ndarray
+    """
+    if n < 3 or spacing >= 1. / (n - 1):
+        if n >= 3 and spacing > 1. / (n - 1) + 1e-12:
+            raise ValueError('A first spacing of {} cannot be reached with {} nodes'.format(spacing, n))
+        return uniform(n)
+
+    xi = np.linspace(0., 1., n)
+
+    def first(d):
+        return 1. + np.tanh(d * (xi[1] - 1.)) / np.tanh(d) - spacing
+
+    d = brentq(first, 1e-9, 1e3)
+    s = 1. + np.tanh(d * (xi - 1.)) / np.tanh(d)
+    s[0], s[-1] = 0., 1.
+    return s
+
+
+def two_sided(n, start, end):
+    """ Nodes clustered towards both ends following the two-sided stretching function of Vinokur, the spacings at the
+    ends are matched to first order
+
+    :param int n: Number of nodes
+    :param float start: Normalized spacing at the start
+    :param float end: Normalized spacing at the end
+    :rtype: numpy.ndarray
+    """
+    if n < 3:
+        return uniform(n)
+
+    a = np.sqrt(end / start)
+    d = _stretching(1. / ((n - 1) * np.sqrt(start * end)))
+    xi = np.linspace(0., 1., n)
+    if d > 0.:
+        u = 0.5 * (1. + np.tanh(d * (xi - 0.5)) / np.tanh(d / 2.))
+    elif d < 0.:
+        u = 0.5 * (1. + np.tan(-d * (xi - 0.5)) / np.tan(-d / 2.))
+    else:
+        u = xi
+    s = u / (a + (1. - a) * u)
+    s[0], s[-1] = 0., 1.
+    return s
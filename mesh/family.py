@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" family.py derives a family of meshes for a grid convergence study from a single
+:py:class:`geometry.blocking.Blocking`. Every level is generated by :py:class:`mesh.generator.MeshGenerator` with the
+same topology and distribution laws, starting from the finest level the number of cells along every edge is divided by
+the refinement ratio per coarser level, and by default the wall, leading and trailing edge spacings are multiplied by
+it.
+
+Levels are generated by a pool of worker processes, each writing its level into its own directory, after which a
+``family.json`` lists the settings, node counts, representative cell size and wall spacing of every level.
+"""
+
+import os
+import json
+from collections import OrderedDict
+from multiprocessing import Pool, cpu_count
+import numpy as np
+from mesh.generator import MeshGenerator, read_blocks
+from utils import Attribute, Input
+
+__all__ = ['LEVELS', 'MeshFamily', 'read_family']
+
+LEVELS = ('coarse', 'medium', 'fine')
+
+# Inputs of the MeshGenerator that are counts of nodes, respectively spacings
+COUNTS = ('n_airfoil', 'n_inner', 'n_outer', 'n_wake')
+SPACINGS = ('first_cell', 'le_spacing', 'te_spacing')
+
+
+def _metadata(directory, walls):
+    """ Node counts, representative cell size and first cell heights of a mesh written to ``directory`` """
+    blocks = read_blocks(directory)
+    area, cells, heights = 0., 0, []
+    for name, block in blocks.items():
+        diagonal_a, diagonal_b = block[1:, 1:] - block[:-1, :-1], block[:-1, 1:] - block[1:, :-1]
+        area += 0.5 * np.abs(diagonal_a[..., 0] * diagonal_b[..., 1] - diagonal_a[..., 1] * diagonal_b[..., 0]).sum()
+        cells += (block.shape[0] - 1) * (block.shape[1] - 1)
+        if name in walls:
+            heights.append(np.hypot(*(block[:, 1] - block[:, 0]).T))
+    heights = np.concatenate(heights) if heights else np.array([np.nan])
+    return {'shapes': OrderedDict((name, list(block.shape[:2])) for name, block in blocks.items()),
+            'nodes': int(sum(block.shape[0] * block.shape[1] for block in blocks.values())),
+            'cells': int(cells),
+            'h': float(np.sqrt(area / cells)),
+            'wall_spacing': {'min': float(heights.min()), 'mean': float(heights.mean()),
+                             'max': float(heights.max())}}
+
+
+def _build(task):
+    """ Generates, and optionally smooths, a single level of the family """
+    level, blocking, settings, directory, walls, smoothing = task
+    MeshGenerator(blocking, **settings).write(directory)
+    if smoothing is not None:
+        from mesh.smoothing import smooth_directory
+        smooth_directory(directory, walls=walls, processes=1, **smoothing)
+    return level, _metadata(directory, walls)
+
+
+class MeshFamily(object):
+
+    blocking_in = Input()
+    levels, ratio, scale_spacing, options = Input(), Input(), Input(), Input()
+
+    def __init__(self, blocking_in, levels=LEVELS, ratio=2., scale_spacing=True, **options):
+        """ Family of consistently refined meshes of a blocking
+
+        :param geometry.blocking.Blocking blocking_in: Blocking, and through it the domain and airfoil, to mesh
+        :param tuple levels: Names of the levels from the coarsest to the finest
+        :param float ratio: Refinement ratio of the number of cells along every edge between two consecutive levels
+        :param bool scale_spacing: Toggles scaling the wall, leading and trailing edge spacing by the ratio, otherwise
+                                   every level keeps the wall spacing of the finest level
+        :param options: Keyword arguments of :py:class:`mesh.generator.MeshGenerator` for the finest level
+        """
+        self.blocking_in = blocking_in
+        self.levels, self.ratio, self.scale_spacing, self.options = levels, ratio, scale_spacing, options
+
+    @property
+    def default_directory(self):
+        return os.path.join(MeshGenerator(self.blocking_in).default_directory,
+                            '{}_family'.format(self.blocking_in.airfoil_in.__name__))
+
+    @Attribute
+    def settings(self):
+        """ Keyword arguments of the :py:class:`mesh.generator.MeshGenerator` of every level, the number of cells along
+        every edge is rounded to the closest integer
+
+        :rtype: collections.OrderedDict
+        """
+        finest = MeshGenerator(self.blocking_in, **self.options)
+        settings = OrderedDict()
+        for level, name in enumerate(self.levels):
+            factor = self.ratio ** (len(self.levels) - 1 - level)
+            counts = dict((key, int(round((getattr(finest, key) - 1) / factor)) + 1) for key in COUNTS)
+            if min(counts.values()) < 3:
+                raise ValueError('The {} level has less than 2 cells along an edge, increase the number of nodes of '
+                                 'the finest level or reduce the refinement ratio'.format(name))
+            spacings = dict((key, getattr(finest, key) * (factor if self.scale_spacing else 1.)) for key in SPACINGS)
+            settings[name] = dict(counts, **spacings)
+        return settings
+
+    def write(self, directory=None, processes=None, smoothing=None, walls=('c_inner',)):
+        """ Generates all levels in parallel, every level is written to ``<directory>/<level>``, see
+        :py:meth:`mesh.generator.MeshGenerator.write`, and described in ``<directory>/family.json``
+
+        :param str directory: Output directory (Optional: Defaults to ``data/mesh/<airfoil_name>_family``)
+        :param int processes: Number of worker processes (Optional: Defaults to the number of CPUs, 1 runs serially)
+        :param dict smoothing: Keyword arguments of :py:func:`mesh.smoothing.winslow` (Optional: If provided every level
+                               is smoothed after it is generated)
+        :param tuple walls: Names of the blocks whose ``j = 0`` edge is a wall
+        :return: Metadata of the family
+        :rtype: collections.OrderedDict
+        """
+        directory = directory if directory is not None else self.default_directory
+        tasks = [(name, self.blocking_in, settings, os.path.join(directory, name), walls, smoothing)
+                 for name, settings in self.settings.items()]
+
+        processes = min(processes if processes is not None else cpu_count(), len(tasks))
+        if processes <= 1:
+            results = [_build(task) for task in tasks]
+        else:
+            pool = Pool(processes)
+            try:
+                results = pool.map(_build, tasks, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+
+        family = OrderedDict([('airfoil', self.blocking_in.airfoil_in.__name__), ('ratio', self.ratio),
+                              ('scale_spacing', self.scale_spacing), ('smoothing', smoothing), ('levels', [])])
+        finer = None
+        for name, metadata in reversed(results):
+            level = OrderedDict([('name', name), ('directory', name), ('settings', self.settings[name])])
+            level.update(metadata)
+            # Effective refinement ratio to the next finer level, following from the number of cells in 2D
+            level['ratio'] = None if finer is None else float(np.sqrt(float(finer['cells']) / level['cells']))
+            family['levels'].insert(0, level)
+            finer = level
+
+        with open(os.path.join(directory, 'family.json'), 'w') as index:
+            json.dump(family, index, indent=2)
+        return family
+
+
+def read_family(directory, mmap_mode='r'):
+    """ Opens every level written by :py:meth:`MeshFamily.write`
+
+    :param str directory: Directory holding ``family.json``
+    :param str mmap_mode: Mode of the memory-maps, see :py:func:`numpy.load`
+    :return: Metadata of the family and the blocks of every level keyed by level name
+    :rtype: tuple
+    """
+    with open(os.path.join(directory, 'family.json')) as index:
+        family = json.load(index, object_pairs_hook=OrderedDict)
+    return family, OrderedDict((level['name'], read_blocks(os.path.join(directory, level['directory']), mmap_mode))
+                               for level in family['levels'])
+
+
+if __name__ == '__main__':
+    from geometry.airfoil import Airfoil
+    from geometry.domain import Domain
+    from geometry.blocking import Blocking
+    mesh_family = MeshFamily(Blocking(Domain(Airfoil(angle=2.31), upstream=13., top=13., bottom=13., wake=20.)),
+                             n_airfoil=257, n_inner=129, n_outer=129, n_wake=193, first_cell=2.5e-6)
+    for family_level in mesh_family.write()['levels']:
+        print('{name}: {cells} cells, h = {h:.3e}, first cell {wall_spacing[mean]:.3e}'.format(**family_level))
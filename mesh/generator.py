@@ -0,0 +1,409 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" generator.py builds the structured multi-block C-mesh around an airfoil from the points of a
+:py:class:`geometry.blocking.Blocking` and its :py:class:`geometry.domain.Domain` without ICEM. The mesh consists of
+six blocks, the refinement spline of the blocking splits the C-block around the airfoil and the two wake blocks into an
+inner and an outer layer:
+
+* ``c_inner``, ``c_outer`` run around the airfoil from the bottom to the top trailing edge
+* ``wake_top_inner``, ``wake_top_outer`` run downstream above the wake cut
+* ``wake_bot_inner``, ``wake_bot_outer`` run downstream below the wake cut
+
+Edges are discretized first, such that blocks sharing an edge share the very same nodes, after which the interior of
+every block is filled by transfinite interpolation, see :py:func:`transfinite`, apart from ``c_inner`` whose grid lines
+leave the airfoil along the surface normal at the height of the first cell, see :py:func:`wall_block`. Blocks are
+arrays of shape (ni, nj, 2) with the ``i`` index running along the airfoil or wake and ``j`` away from it, giving a
+positive cell area everywhere.
+"""
+
+import os
+import json
+from collections import OrderedDict
+import numpy as np
+from numpy.lib.format import open_memmap
+from directories import DIRS
+from geometry.definitions import Curve, PointArray
+from mesh.distribution import one_sided, two_sided
+from utils import Attribute, Input
+
+__all__ = ['Path', 'transfinite', 'wall_block', 'MeshGenerator', 'read_blocks']
+
+# Number of i-lines of a block that are interpolated at once
+CHUNK_SIZE = 2 ** 12
+
+# Aspect ratio of the cells on the wake cut at the outlet, where the cut is far from any wall
+WAKE_ASPECT_RATIO = 1000.
+
+# Blocks whose bottom edge is the airfoil surface, see :py:func:`wall_block`
+WALLS = ('c_inner',)
+
+
+def _fractions(edge):
+    """ Normalized chord-length of the nodes of an edge of shape (n, 2) """
+    s = np.concatenate(([0.], np.cumsum(np.hypot(*np.diff(edge, axis=0).T))))
+    return s / s[-1]
+
+
+def transfinite(bottom, top, left, right, out=None):
+    """ Fills a block by transfinite interpolation of its four edges. The blending functions follow the normalized
+    chord-length of the nodes on opposing edges, thus the node distributions of the edges are carried into the
+    interior of the block (Soni, B.K. "Two- and Three-Dimensional Grid Generation for Internal Flow Applications of
+    Computational Fluid Dynamics", AIAA 85-1526, 1985)
+
+    :param numpy.ndarray bottom: Nodes on ``j = 0`` of shape (ni, 2)
+    :param numpy.ndarray top: Nodes on ``j = nj - 1`` of shape (ni, 2)
+    :param numpy.ndarray left: Nodes on ``i = 0`` of shape (nj, 2)
+    :param numpy.ndarray right: Nodes on ``i = ni - 1`` of shape (nj, 2)
+    :param numpy.ndarray out: Array of shape (ni, nj, 2) the block is written to, e.g. a memory-map (Optional)
+    :rtype: numpy.ndarray
+    """
+    bottom, top, left, right = (np.asarray(edge, dtype=np.float64)[:, :2] for edge in (bottom, top, left, right))
+    ni, nj = bottom.shape[0], left.shape[0]
+    if top.shape[0] != ni or right.shape[0] != nj:
+        raise ValueError('Opposing edges have a different number of nodes, {} and {}'.format(
+            (ni, nj), (top.shape[0], right.shape[0])))
+    out = out if out is not None else np.empty((ni, nj, 2))
+
+    s_b, s_t, s_l, s_r = (_fractions(edge) for edge in (bottom, top, left, right))
+    corners = np.array([bottom[0], bottom[-1], top[0], top[-1]])
+
+    for start in range(0, ni, CHUNK_SIZE):
+        rows = slice(start, min(start + CHUNK_SIZE, ni))
+        d_bt = (s_t[rows] - s_b[rows])[:, np.newaxis]
+        xi = (s_b[rows, np.newaxis] + s_l * d_bt) / (1. - (s_r - s_l) * d_bt)
+        eta = s_l + xi * (s_r - s_l)
+        for k in range(2):
+            out[rows, :, k] = ((1. - eta) * bottom[rows, np.newaxis, k] + eta * top[rows, np.newaxis, k] +
+                               (1. - xi) * left[:, k] + xi * right[:, k] -
+                               (1. - xi) * (1. - eta) * corners[0, k] - xi * (1. - eta) * corners[1, k] -
+                               (1. - xi) * eta * corners[2, k] - xi * eta * corners[3, k])
+    return out
+
+
+def _normals(edge):
+    """ Unit normals of an edge of shape (n, 2), pointing to the left of the direction of the edge """
+    tangent = np.gradient(edge, axis=0)
+    normals = np.column_stack((-tangent[:, 1], tangent[:, 0]))
+    return normals / np.hypot(*normals.T)[:, np.newaxis]
+
+
+def wall_block(bottom, top, left, right, spacing, out=None):
+    """ Fills a block whose bottom edge is a wall. Every j-line leaves the wall along the wall normal ``n`` with a first
+    cell of exactly ``spacing`` and bends over to its node on the top edge,
+
+        r(s) = bottom + s L n + s^2 (top - bottom - L n)
+
+    where ``L`` is the distance between the nodes on the bottom and top edge and ``s`` runs from 0 to 1 following
+    :py:func:`mesh.distribution.one_sided` with a normalized first spacing of ``spacing / L``. The left and right edges
+    are copied as they are, they should leave the wall along its normal as well, see
+    :py:attr:`geometry.blocking.Blocking.pt_2_top`
+
+    :param numpy.ndarray bottom: Nodes on the wall ``j = 0`` of shape (ni, 2)
+    :param numpy.ndarray top: Nodes on ``j = nj - 1`` of shape (ni, 2)
+    :param numpy.ndarray left: Nodes on ``i = 0`` of shape (nj, 2)
+    :param numpy.ndarray right: Nodes on ``i = ni - 1`` of shape (nj, 2)
+    :param float spacing: Height of the first cell on the wall
+    :param numpy.ndarray out: Array of shape (ni, nj, 2) the block is written to, e.g. a memory-map (Optional)
+    :rtype: numpy.ndarray
+    """
+    bottom, top, left, right = (np.asarray(edge, dtype=np.float64)[:, :2] for edge in (bottom, top, left, right))
+    ni, nj = bottom.shape[0], left.shape[0]
+    if top.shape[0] != ni or right.shape[0] != nj:
+        raise ValueError('Opposing edges have a different number of nodes, {} and {}'.format(
+            (ni, nj), (top.shape[0], right.shape[0])))
+    out = out if out is not None else np.empty((ni, nj, 2))
+
+    span = top - bottom
+    lengths = np.hypot(*span.T)
+    normals = _normals(bottom)
+    normals *= np.sign(np.sum(normals * span, axis=1))[:, np.newaxis]  # Towards the top edge
+
+    for start in range(0, ni, CHUNK_SIZE):
+        rows = slice(start, min(start + CHUNK_SIZE, ni))
+        s = np.array([one_sided(nj, spacing / length) for length in lengths[rows]])[..., np.newaxis]
+        offset = lengths[rows, np.newaxis] * normals[rows]
+        out[rows] = (bottom[rows, np.newaxis] + s * offset[:, np.newaxis] +
+                     s ** 2 * (span[rows] - offset)[:, np.newaxis])
+    out[0], out[-1] = left, right
+    return out
+
+
+class Path(object):
+
+    def __init__(self, curves, reverse=False):
+        """ Curves joined end-to-end which are parametrized by their combined arc-length
+
+        :param list[Curve] curves: Curves in order, a :py:class:`PointArray` of 2 points is turned into a straight line
+        :param bool reverse: Toggles running along the path from its end to its start
+        """
+        self.curves = [crv if isinstance(crv, Curve) else Curve(PointArray.from_points(crv), degree=1)
+                       for crv in curves]
+        self.reverse = reverse
+        self.breaks = np.concatenate(([0.], np.cumsum([crv.length() for crv in self.curves])))
+
+    @property
+    def length(self):
+        return self.breaks[-1]
+
+    def points(self, s):
+        """ Returns the points at an array of arc-lengths ``s`` along the path
+
+        :return: Array of shape (n, 2)
+        :rtype: numpy.ndarray
+        """
+        s = np.asarray(s, dtype=np.float64)
+        s = self.length - s if self.reverse else s
+        piece = np.clip(np.searchsorted(self.breaks, s, side='right') - 1, 0, len(self.curves) - 1)
+        points = np.empty((s.size, 2))
+        for i, crv in enumerate(self.curves):
+            mask = piece == i
+            if np.any(mask):
+                points[mask] = crv.point_at_length(s[mask] - self.breaks[i])
+        return points
+
+    def locate(self, point):
+        """ Returns the arc-length along the path of the point closest to ``point`` """
+        p = np.array([point.x, point.y])
+        distances, lengths = [], []
+        for crv in self.curves:
+            if crv.degree == 1:  # Newton's method of :py:meth:`Curve.project` requires a 2nd derivative
+                start, end = crv.built_from.xyz[0, :2], crv.built_from.xyz[-1, :2]
+                t = np.clip(np.dot(p - start, end - start) / np.dot(end - start, end - start), 0., 1.)
+                distances.append(np.hypot(*(start + t * (end - start) - p)))
+                lengths.append(t * crv.length())
+            else:
+                projection = crv.project(p[np.newaxis])
+                distances.append(abs(projection['distance'][0]))
+                lengths.append(float(crv.length(projection['u'][0])))
+        i = int(np.argmin(distances))
+        s = self.breaks[i] + lengths[i]
+        return self.length - s if self.reverse else s
+
+
+def _line(start, end, fractions):
+    """ Nodes on the straight line from ``start`` to ``end``, both arrays of shape (2,) """
+    return start + np.asarray(fractions)[:, np.newaxis] * (end - start)
+
+
+class MeshGenerator(object):
+
+    blocking_in = Input()
+    n_airfoil, n_inner, n_outer, n_wake = Input(), Input(), Input(), Input()
+    first_cell, le_spacing, te_spacing = Input(), Input(), Input()
+
+    def __init__(self, blocking_in, n_airfoil=129, n_inner=65, n_outer=65, n_wake=97, first_cell=1e-5,
+                 le_spacing=1e-3, te_spacing=2e-3):
+        """ Generates the structured C-mesh of a blocking by transfinite interpolation
+
+        :param geometry.blocking.Blocking blocking_in: Blocking, and through it the domain and airfoil, to mesh
+        :param int n_airfoil: Number of nodes on the top and on the bottom surface of the airfoil, each
+        :param int n_inner: Number of nodes from the airfoil up to the refinement spline
+        :param int n_outer: Number of nodes from the refinement spline up to the far-field
+        :param int n_wake: Number of nodes from the trailing edge up to the outlet
+        :param float first_cell: Height of the first cell on the airfoil surface
+        :param float le_spacing: Spacing of the nodes along the airfoil surface at the leading edge
+        :param float te_spacing: Spacing of the nodes along the airfoil surface at the trailing edge
+        """
+        self.blocking_in = blocking_in
+        self.n_airfoil, self.n_inner, self.n_outer, self.n_wake = n_airfoil, n_inner, n_outer, n_wake
+        self.first_cell, self.le_spacing, self.te_spacing = first_cell, le_spacing, te_spacing
+
+    @property
+    def default_directory(self):
+        return os.path.join(DIRS['DATA_DIR'], 'mesh')
+
+    @Attribute
+    def domain_in(self):
+        return self.blocking_in.domain_in
+
+    @Attribute
+    def airfoil_in(self):
+        return self.blocking_in.airfoil_in
+
+    @Attribute
+    def paths(self):
+        """ Airfoil surface, refinement spline and far-field, each running from the bottom to the top trailing edge
+
+        :rtype: dict
+        """
+        blocking, domain = self.blocking_in, self.domain_in
+        far_top, far_bot = blocking.points[2], blocking.points[4]
+        return {'surface': Path([self.airfoil_in.curve['complete']], reverse=True),
+                'refinement': Path([Curve(blocking.refinement_points)]),
+                'farfield': Path([[far_bot, domain.pt_4], Curve(domain.segments[3], degree=2),
+                                  [domain.pt_1, far_top]])}
+
+    @Attribute
+    def surface_fractions(self):
+        """ Normalized arc-length of the nodes along the airfoil from the bottom trailing edge over the leading edge to
+        the top trailing edge, clustered at both edges
+
+        :rtype: numpy.ndarray
+        """
+        surface = self.paths['surface']
+        length, s_le = surface.length, surface.locate(self.airfoil_in.leading_edge)
+        bot = two_sided(self.n_airfoil, self.te_spacing / s_le, self.le_spacing / s_le) * s_le
+        top = s_le + two_sided(self.n_airfoil, self.le_spacing / (length - s_le),
+                               self.te_spacing / (length - s_le)) * (length - s_le)
+        return np.concatenate((bot, top[1:])) / length
+
+    def around(self, key, marker):
+        """ Nodes along one of the :py:attr:`paths`, the leading edge of the surface is mapped onto ``marker`` such that
+        the i-lines of the C-blocks stay close to normal
+
+        :rtype: numpy.ndarray
+        """
+        surface, path = self.paths['surface'], self.paths[key]
+        f_le = surface.locate(self.airfoil_in.leading_edge) / surface.length
+        g_le = path.locate(marker) / path.length
+        return path.points(np.interp(self.surface_fractions, [0., f_le, 1.], [0., g_le, 1.]) * path.length)
+
+    @Attribute
+    def edges(self):
+        """ Nodes of all edges of the blocking, every edge shared by two blocks is held once
+
+        :rtype: dict
+        """
+        blocking, domain = self.blocking_in, self.domain_in
+        xy = lambda point: np.array([point.x, point.y])
+        te, te_top, te_bot = xy(blocking.pt_2), xy(blocking.pt_2_top), xy(blocking.pt_2_bot)
+        out_cut, out_top, far_top, out_bot, far_bot = (xy(point) for point in blocking.points[0:5])
+        refine = self.blocking_in.refine_distance
+
+        inner = one_sided(self.n_inner, self.first_cell / refine)
+        last = (inner[-1] - inner[-2]) * refine
+        outer_top = one_sided(self.n_outer, last / np.hypot(*(far_top - te_top)))
+        outer_bot = one_sided(self.n_outer, last / np.hypot(*(far_bot - te_bot)))
+        # The wake starts with the streamwise spacing of the surface at the trailing edge
+        wake = one_sided(self.n_wake, self.te_spacing / np.hypot(*(out_cut - te)))
+
+        # At the outlet the first cell above and below the cut grows with the last wake cell
+        outlet = max(self.first_cell, (wake[-1] - wake[-2]) * np.hypot(*(out_cut - te)) / WAKE_ASPECT_RATIO)
+        outlet_top = one_sided(self.n_inner, outlet / np.hypot(*(out_top - out_cut)))
+        outlet_bot = one_sided(self.n_inner, outlet / np.hypot(*(out_bot - out_cut)))
+        last_top = (outlet_top[-1] - outlet_top[-2]) * np.hypot(*(out_top - out_cut))
+        last_bot = (outlet_bot[-1] - outlet_bot[-2]) * np.hypot(*(out_bot - out_cut))
+        outlet_far_top = one_sided(self.n_outer, last_top / np.hypot(*(xy(domain.pt_2) - out_top)))
+        outlet_far_bot = one_sided(self.n_outer, last_bot / np.hypot(*(xy(domain.pt_3) - out_bot)))
+
+        return {'surface': self.around('surface', self.airfoil_in.leading_edge),
+                'refinement': self.around('refinement', blocking.pt_le_proj),
+                'farfield': self.around('farfield', domain.pt_5),
+                'te_top': _line(te, te_top, inner), 'te_bot': _line(te, te_bot, inner),
+                'far_top': _line(te_top, far_top, outer_top), 'far_bot': _line(te_bot, far_bot, outer_bot),
+                'out_top': _line(out_cut, out_top, outlet_top), 'out_bot': _line(out_cut, out_bot, outlet_bot),
+                'out_far_top': _line(out_top, xy(domain.pt_2), outlet_far_top),
+                'out_far_bot': _line(out_bot, xy(domain.pt_3), outlet_far_bot),
+                'cut': _line(te, out_cut, wake), 'wake_top': _line(te_top, out_top, wake),
+                'wake_bot': _line(te_bot, out_bot, wake), 'wake_far_top': _line(far_top, xy(domain.pt_2), wake),
+                'wake_far_bot': _line(far_bot, xy(domain.pt_3), wake)}
+
+    @Attribute
+    def topology(self):
+        """ Bottom, top, left and right edge of every block
+
+        :rtype: collections.OrderedDict
+        """
+        e = self.edges
+        return OrderedDict([
+            ('c_inner', (e['surface'], e['refinement'], e['te_bot'], e['te_top'])),
+            ('c_outer', (e['refinement'], e['farfield'], e['far_bot'], e['far_top'])),
+            ('wake_top_inner', (e['cut'], e['wake_top'], e['te_top'], e['out_top'])),
+            ('wake_top_outer', (e['wake_top'], e['wake_far_top'], e['far_top'], e['out_far_top'])),
+            ('wake_bot_inner', (e['wake_bot'], e['cut'], e['te_bot'][::-1], e['out_bot'][::-1])),
+            ('wake_bot_outer', (e['wake_far_bot'], e['wake_bot'], e['far_bot'][::-1], e['out_far_bot'][::-1]))])
+
+    @property
+    def shapes(self):
+        """ Number of nodes ``(ni, nj)`` of every block
+
+        :rtype: collections.OrderedDict
+        """
+        return OrderedDict((name, (edges[0].shape[0], edges[2].shape[0])) for name, edges in self.topology.items())
+
+    @property
+    def cells(self):
+        return sum((ni - 1) * (nj - 1) for ni, nj in self.shapes.values())
+
+    @Attribute
+    def blocks(self):
+        """ Nodes of every block in memory, each an array of shape (ni, nj, 2)
+
+        :rtype: collections.OrderedDict
+        """
+        return OrderedDict((name, self.fill(name)) for name in self.topology)
+
+    def fill(self, name, out=None):
+        """ Fills a single block, the blocks on the airfoil surface by :py:func:`wall_block` and all others by
+        :py:func:`transfinite`
+
+        :param str name: Name of the block, see :py:attr:`topology`
+        :param numpy.ndarray out: Array of shape (ni, nj, 2) the block is written to (Optional)
+        :rtype: numpy.ndarray
+        """
+        if name in WALLS:
+            return wall_block(*self.topology[name], spacing=self.first_cell, out=out)
+        return transfinite(*self.topology[name], out=out)
+
+    def write(self, directory=None):
+        """ Writes every block straight into a memory-mapped ``<block>.npy`` file, thus the mesh never has to fit into
+        memory at once. An ``index.json`` lists the blocks in order together with their shape.
+
+        :param str directory: Output directory (Optional: Defaults to ``data/mesh/<airfoil_name>``)
+        :return: Paths of the block files
+        :rtype: collections.OrderedDict
+        """
+        directory = (directory if directory is not None else
+                     os.path.join(self.default_directory, self.airfoil_in.__name__))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        filenames = OrderedDict()
+        for name, edges in self.topology.items():
+            filenames[name] = os.path.join(directory, name + '.npy')
+            ni, nj = edges[0].shape[0], edges[2].shape[0]
+            block = open_memmap(filenames[name], mode='w+', dtype=np.float64, shape=(ni, nj, 2))
+            self.fill(name, out=block)
+            block.flush()
+            del block
+
+        with open(os.path.join(directory, 'index.json'), 'w') as index:
+            json.dump({'blocks': [{'name': name, 'shape': list(shape) + [2]} for name, shape in self.shapes.items()],
+                       'cells': self.cells}, index, indent=2)
+        return filenames
+
+
+def read_blocks(directory, mmap_mode='r'):
+    """ Opens the blocks written by :py:meth:`MeshGenerator.write` as memory-maps
+
+    :param str directory: Directory holding ``index.json``
+    :param str mmap_mode: Mode of the memory-maps, see :py:func:`numpy.load` (Optional: ``None`` reads into memory)
+    :rtype: collections.OrderedDict
+    """
+    with open(os.path.join(directory, 'index.json')) as index:
+        names = [block['name'] for block in json.load(index)['blocks']]
+    return OrderedDict((name, np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode)) for name in names)
+
+
+if __name__ == '__main__':
+    from geometry.airfoil import Airfoil
+    from geometry.domain import Domain
+    from geometry.blocking import Blocking
+    generator = MeshGenerator(Blocking(Domain(Airfoil(angle=2.31), upstream=13., top=13., bottom=13., wake=20.)))
+    generator.write()
+    print('{} cells written'.format(generator.cells))
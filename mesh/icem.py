@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" icem.py reads ICEM CFD blocking (.blk) and tetin (.tin) files without opening ICEM. A first pass over a file only
+records the byte-offsets of its sections, after which a requested section is read and converted to arrays on its own.
+
+A blocking file consists of top-level sections such as ``GRID 0 9`` or ``NODES new_numbering`` which are followed by
+a body in braces. The ``GRID`` sections hold the index lines of the blocking per direction, each with the number of
+nodes on the segment that follows it, whereas the ``SUPERBLOCKS`` reference these segments. Together they suffice to
+count the cells of the mesh.
+
+A tetin file consists of commands such as ``define_curve`` or ``prescribed_point`` that start at the first column,
+every command extends up to the next one.
+"""
+
+import os
+import re
+import glob
+from multiprocessing import Pool, cpu_count
+import numpy as np
+from utils import Attribute
+
+__all__ = ['BlockingFile', 'TetinFile', 'audit']
+
+_BLK_SECTION = re.compile(br'^([A-Z][A-Z_]*)[ \t]*([^\r\n]*)\r?$', re.MULTILINE)
+_TIN_COMMAND = re.compile(br'^([a-z][a-z_0-9]*)[ \t]*([^\r\n]*)\r?$', re.MULTILINE)
+
+
+def _tokenize(text):
+    """ Splits the body of a section into tokens where braces always form their own token """
+    return text.replace('{', ' { ').replace('}', ' } ').split()
+
+
+def _nest(tokens):
+    """ Converts a flat list of tokens into nested lists following the braces
+
+    :rtype: list
+    """
+    stack = [[]]
+    for token in tokens:
+        if token == '{':
+            stack.append([])
+        elif token == '}':
+            group = stack.pop()
+            stack[-1].append(group)
+        else:
+            stack[-1].append(token)
+    return stack[0]
+
+
+class _IndexedFile(object):
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def read(self, start, end):
+        with open(self.filename, 'rb') as data:
+            data.seek(start)
+            return data.read(end - start).decode('latin-1')
+
+    def sections(self, name):
+        """ Returns the entries of a section in the index, every entry holds the arguments on the header line and
+        the ``start`` and ``end`` byte-offset of its body
+
+        :rtype: list[dict]
+        """
+        return self.index.get(name, [])
+
+    def __contains__(self, name):
+        return name in self.index
+
+    @property
+    def names(self):
+        return list(self.index.keys())
+
+
+class BlockingFile(_IndexedFile):
+
+    def __init__(self, filename):
+        """ Lazily parsed ICEM CFD blocking file
+
+        :param str filename: Path to the .blk file
+        """
+        super(BlockingFile, self).__init__(filename)
+
+    @Attribute
+    def index(self):
+        """ Byte-offset index of the top-level sections, built by a single pass over the file that only tracks the
+        depth of the braces
+
+        :rtype: dict
+        """
+        with open(self.filename, 'rb') as data:
+            text = data.read()
+
+        index = {}
+        braces = np.zeros(len(text) + 1, dtype=np.int64)
+        opening = np.frombuffer(text, dtype=np.uint8) == ord('{')
+        closing = np.frombuffer(text, dtype=np.uint8) == ord('}')
+        braces[1:] = np.cumsum(opening.astype(np.int64) - closing)  # Depth before every byte
+        closing_offsets = np.flatnonzero(closing)
+
+        for match in _BLK_SECTION.finditer(text):
+            if braces[match.start()] != 0:
+                continue  # Upper-case lines such as family names inside a body
+            body = re.match(br'\s*\{', text[match.end():match.end() + 64])
+            if body is not None:
+                start = match.end() + body.end()
+                # The body ends at the first closing brace that returns to depth 0
+                candidates = closing_offsets[closing_offsets >= start]
+                end = int(candidates[np.argmax(braces[candidates + 1] == 0)])
+            else:
+                start = end = match.end()
+            entry = {'args': match.group(2).decode('latin-1').split(), 'start': start, 'end': end}
+            index.setdefault(match.group(1).decode('latin-1'), []).append(entry)
+        return index
+
+    def body(self, name, i=0):
+        entry = self.sections(name)[i]
+        return self.read(entry['start'], entry['end'])
+
+    @Attribute
+    def families(self):
+        """ Names of the families defined in the blocking
+
+        :rtype: list[str]
+        """
+        return [line.split()[0] for line in self.body('FAMILIES').splitlines() if line.strip()]
+
+    @Attribute
+    def prepoints(self):
+        """ Prescribed points the blocking is associated with
+
+        :return: Dictionary of the point ``id`` (N,), coordinates ``xyz`` (N, 3) and ``name`` (N,)
+        :rtype: dict
+        """
+        rows = [line.split() for line in self.body('PREPOINTS').splitlines() if line.strip()]
+        return {'id': np.array([int(row[0]) for row in rows], dtype=np.int64),
+                'xyz': np.array([row[1:4] for row in rows], dtype=np.float64).reshape(-1, 3),
+                'name': np.array([row[4] if len(row) > 4 else '' for row in rows])}
+
+    @Attribute
+    def grid(self):
+        """ Index lines of the blocking per direction, ``GRID d`` holds the location of every index line and the number
+        of nodes on the segment up to the next index line
+
+        :return: Dictionary keyed by direction holding an array of shape (n, 2) with the location and node count
+        :rtype: dict
+        """
+        grid = {}
+        for i, entry in enumerate(self.sections('GRID')):
+            values = np.array(self.body('GRID', i).split(), dtype=np.float64).reshape(-1, 2)
+            grid[int(entry['args'][0])] = values
+        return grid
+
+    @Attribute
+    def nodes(self):
+        """ Vertices of the blocking
+
+        :return: Dictionary of the coordinates ``xyz`` (N, 3), vertex ``number`` (N,) and index line ``ijk`` (N, 3)
+        :rtype: dict
+        """
+        lines = [line for line in self.body('NODES').splitlines() if line.strip()]
+        head = np.array([line.split(None, 6)[:6] for line in lines], dtype=np.float64).reshape(-1, 6)
+        ijk = np.array([line[line.index('{') + 1:].split()[:3] for line in lines], dtype=np.int64).reshape(-1, 3)
+        return {'xyz': head[:, :3], 'number': head[:, 5].astype(np.int64), 'ijk': ijk}
+
+    @Attribute
+    def edges(self):
+        """ Edges of the blocking with a node distribution, i.e. the ``EDGE_RATIOS`` section
+
+        :return: Dictionary of the vertex numbers ``nodes`` (N, 2) and the remaining ``parameters`` (N, 7) of the
+                 bunching law such as the spacing and ratio at both ends
+        :rtype: dict
+        """
+        if 'EDGE_RATIOS' not in self:
+            return {'nodes': np.empty((0, 2), dtype=np.int64), 'parameters': np.empty((0, 7))}
+        values = np.array(self.body('EDGE_RATIOS').split(), dtype=np.float64).reshape(-1, 9)
+        return {'nodes': values[:, :2].astype(np.int64), 'parameters': values[:, 2:]}
+
+    @Attribute
+    def superblocks(self):
+        """ Blocks of the blocking
+
+        :return: List of dictionaries holding the block ``id``, the number of vertices ``shape`` along each axis, the
+                 ``family`` index (-1 for dead blocks), the ``segments`` as ``(direction, segment)`` per axis and the
+                 vertex numbers ``vertices``
+        :rtype: list[dict]
+        """
+        blocks = []
+        for group in _nest(_tokenize(self.body('SUPERBLOCKS'))):
+            shape = tuple(int(n) for n in group[1:4])
+            ranges = [token for token in group[5:] if not isinstance(token, list) and ':' in token]
+            ranges = [tuple(int(i) for i in token.split(':')[:2]) for token in ranges]
+            vertices = next(token for token in group[5:] if isinstance(token, list))
+            bounds = np.cumsum([0] + [n - 1 for n in shape])
+            blocks.append({'id': int(group[0]), 'shape': shape, 'family': int(group[4]),
+                           'segments': [ranges[bounds[axis]:bounds[axis + 1]] for axis in range(len(shape))],
+                           'vertices': np.array(vertices, dtype=np.int64)})
+        return blocks
+
+    @Attribute
+    def dimension(self):
+        """ Settings of the ``DIMENSION`` line, e.g. ``DIMENSION geometry 3 mesh 3 third 2`` where ``third`` is the
+        direction of the index lines along which a planar mesh is extruded
+
+        :rtype: dict
+        """
+        if 'DIMENSION' not in self:
+            return {}
+        args = self.sections('DIMENSION')[0]['args']
+        return dict((key, int(value)) for key, value in zip(args[::2], args[1::2]))
+
+    def block_cells(self, dimension=2):
+        """ Estimates the number of cells of every block from the node counts of the segments it spans
+
+        :param int dimension: 2 for a planar mesh, which leaves out the block axis that spans the extrusion direction
+                              given by ``third`` of the ``DIMENSION`` line, or 3 to count all block axes
+        :return: Cells per block of shape (n_blocks,)
+        :rtype: numpy.ndarray
+        """
+        grid, third = self.grid, self.dimension.get('third')
+        cells = []
+        for block in self.superblocks:
+            axes = block['segments']
+            if dimension < len(axes):
+                # The extrusion axis is not necessarily the last one, it is found by its direction where possible
+                planar = [axis for axis in axes if not all(direction == third for direction, _ in axis)]
+                axes = planar if len(planar) == dimension else axes[:dimension]
+            n = 1
+            for axis in axes:
+                n *= sum(int(grid[direction][segment, 1]) - 1 for direction, segment in axis)
+            cells.append(n)
+        return np.array(cells, dtype=np.int64)
+
+    def cell_count(self, dimension=2):
+        """ Estimated number of cells in all live blocks, i.e. blocks that are not assigned to the dead family """
+        live = np.array([block['family'] >= 0 for block in self.superblocks], dtype=bool)
+        return int(self.block_cells(dimension)[live].sum())
+
+    def summary(self):
+        """ Summarizes the blocking for an audit
+
+        :rtype: dict
+        """
+        live = sum(block['family'] >= 0 for block in self.superblocks)
+        return {'filename': self.filename, 'blocks': len(self.superblocks), 'live_blocks': live,
+                'vertices': self.nodes['xyz'].shape[0], 'edges': self.edges['nodes'].shape[0],
+                'cells': self.cell_count()}
+
+
+class TetinFile(_IndexedFile):
+
+    def __init__(self, filename):
+        """ Lazily parsed ICEM CFD tetin file
+
+        :param str filename: Path to the .tin file
+        """
+        super(TetinFile, self).__init__(filename)
+
+    @Attribute
+    def index(self):
+        """ Byte-offset index of the commands, the body of a command extends from its header line to the next command
+
+        :rtype: dict
+        """
+        with open(self.filename, 'rb') as data:
+            text = data.read()
+
+        matches = list(_TIN_COMMAND.finditer(text))
+        index = {}
+        for match, following in zip(matches, matches[1:] + [None]):
+            end = following.start() if following is not None else len(text)
+            entry = {'args': match.group(2).decode('latin-1').split(), 'start': match.end(), 'end': end}
+            index.setdefault(match.group(1).decode('latin-1'), []).append(entry)
+        return index
+
+    @Attribute
+    def families(self):
+        return [entry['args'][0] for entry in self.sections('define_family')]
+
+    @Attribute
+    def points(self):
+        """ Prescribed points
+
+        :return: Dictionary of the coordinates ``xyz`` (N, 3), ``family`` (N,) and ``name`` (N,)
+        :rtype: dict
+        """
+        args = [entry['args'] for entry in self.sections('prescribed_point')]
+        return {'xyz': np.array([arg[:3] for arg in args], dtype=np.float64).reshape(-1, 3),
+                'family': np.array([arg[arg.index('family') + 1] for arg in args]),
+                'name': np.array([arg[arg.index('name') + 1] for arg in args])}
+
+    @Attribute
+    def curves(self):
+        """ B-spline curves keyed by name, every curve is a dictionary holding its ``family``, ``knots``, ``degree``
+        and ``control`` points (N, 3)
+
+        :rtype: dict
+        """
+        curves = {}
+        headers, bodies = self.sections('define_curve'), self.sections('bspline')
+        for header, body in zip(headers, bodies):
+            lines = self.read(body['start'], body['end']).split()
+            n, order = [int(value) for value in lines[0].split(',')[:2]]
+            values = np.array(','.join(lines[1:]).split(','), dtype=np.float64)
+            args = header['args']
+            curves[args[args.index('name') + 1]] = {'family': args[args.index('family') + 1],
+                                                    'knots': values[:n + order], 'degree': order - 1,
+                                                    'control': values[n + order:n + order + 3 * n].reshape(n, 3)}
+        return curves
+
+
+def _summarize(filename):
+    return BlockingFile(filename).summary()
+
+
+def audit(directory, pattern='*.blk*', processes=None):
+    """ Summarizes all blocking files within a directory using a pool of worker processes, see
+    :py:meth:`BlockingFile.summary`
+
+    :param str directory: Directory containing the blocking files
+    :param str pattern: Glob pattern of the blocking files
+    :param int processes: Number of worker processes (Optional: Defaults to the number of CPUs, 1 reads serially)
+    :rtype: list[dict]
+    """
+    filenames = sorted(glob.glob(os.path.join(directory, pattern)))
+    if processes == 1:
+        return [_summarize(filename) for filename in filenames]
+
+    processes = processes if processes is not None else cpu_count()
+    pool = Pool(processes)
+    try:
+        return pool.map(_summarize, filenames, chunksize=max(1, len(filenames) // (4 * processes)))
+    finally:
+        pool.close()
+        pool.join()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" plot3d.py writes and reads structured multi-block grids as binary Plot3D files in the whole-grid, Fortran
+unformatted layout without iblanking, as read by ICEM, Pointwise, Tecplot and ParaView. Every Fortran record is
+enclosed by a 4-byte marker holding the length of the record in bytes:
+
+* the number of blocks
+* ``ni, nj`` per block in 2D, or ``ni, nj, nk`` in 3D
+* per block all ``x``, then all ``y`` (and ``z``) of the nodes with ``i`` running fastest
+
+The coordinates are never formatted in Python, the file is sized up-front and every block is copied into a
+memory-map of its record, whereas the reader returns views onto a memory-map of the file.
+"""
+
+import os
+from collections import OrderedDict
+import numpy as np
+
+__all__ = ['write', 'read']
+
+# Number of j-lines of a block that are copied at once, each is contiguous in the file
+CHUNK_SIZE = 2 ** 8
+
+# Largest record a 4-byte Fortran record marker can describe
+_MAX_RECORD = 2 ** 31 - 1
+
+
+def _marker(nbytes, byteorder='<'):
+    if nbytes > _MAX_RECORD:
+        raise ValueError('A record of {} bytes exceeds the limit of Fortran unformatted files'.format(nbytes))
+    return np.array([nbytes], dtype=byteorder + 'i4').tobytes()
+
+
+def _record(data, byteorder='<'):
+    """ Encloses a 1D integer array by record markers """
+    data = np.asarray(data, dtype=byteorder + 'i4').tobytes()
+    return _marker(len(data), byteorder) + data + _marker(len(data), byteorder)
+
+
+def write(filename, blocks, dimension=2, dtype=np.float64):
+    """ Writes blocks of nodes into a single multi-block Plot3D file
+
+    :param str filename: Path of the file, commonly with an ``.xyz`` or ``.p3d`` extension
+    :param blocks: Nodes of every block, either keyed by name as :py:attr:`mesh.generator.MeshGenerator.blocks` or a
+                   sequence, each of shape (ni, nj, 2) or (ni, nj, 3)
+    :type blocks: collections.OrderedDict or list
+    :param int dimension: Writes a 2D file for 2, or a 3D file of a single k-layer at ``z = 0`` for 3
+    :param dtype: Floating point precision of the coordinates, ``numpy.float64`` or ``numpy.float32``
+    :return: Path of the file
+    :rtype: str
+    """
+    if dimension not in (2, 3):
+        raise ValueError('Plot3D files are either 2D or 3D, not {}D'.format(dimension))
+    blocks = list(blocks.values()) if isinstance(blocks, dict) else list(blocks)
+    dtype = np.dtype(dtype).newbyteorder('<')
+    shapes = [block.shape[:2] + ((1,) if dimension == 3 else ()) for block in blocks]
+
+    header = _record([len(blocks)]) + _record(np.ravel(shapes))
+    offsets, offset = [], len(header)
+    for shape in shapes:
+        offsets.append(offset)
+        offset += 2 * 4 + dimension * int(np.prod(shape)) * dtype.itemsize
+
+    directory = os.path.dirname(filename)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(filename, 'wb') as f:
+        f.write(header)
+        for start, shape in zip(offsets, shapes):
+            nbytes = dimension * int(np.prod(shape)) * dtype.itemsize
+            f.seek(start)
+            f.write(_marker(nbytes))
+            f.seek(start + 4 + nbytes)
+            f.write(_marker(nbytes))
+
+    for block, start, shape in zip(blocks, offsets, shapes):
+        ni, nj = shape[:2]
+        record = np.memmap(filename, dtype=dtype, mode='r+', offset=start + 4, shape=(dimension, nj, ni))
+        for axis in range(dimension):
+            for lower in range(0, nj, CHUNK_SIZE):
+                upper = min(lower + CHUNK_SIZE, nj)
+                record[axis, lower:upper] = block[:, lower:upper, axis].T if axis < block.shape[2] else 0.
+        record.flush()
+        del record
+    return filename
+
+
+def read(filename, names=None, mmap_mode='r'):
+    """ Opens the blocks of a binary multi-block Plot3D file as memory-maps, the byte order, the dimension and the
+    precision follow from the record markers. Blocks of a 3D file with a single k-layer are returned without the k-axis
+
+    :param str filename: Path of the file
+    :param list names: Names of the blocks, in the order of the file (Optional: Defaults to ``block_<n>``)
+    :param str mmap_mode: Mode of the memory-map, see :py:class:`numpy.memmap` (Optional: ``None`` reads into memory)
+    :return: Views of the nodes of every block, of shape (ni, nj, 2) or (ni, nj, nk, 3)
+    :rtype: collections.OrderedDict
+    """
+    with open(filename, 'rb') as f:
+        head = f.read(16)
+        byteorder = '<' if np.frombuffer(head, dtype='<i4', count=1)[0] == 4 else '>'
+        if np.frombuffer(head, dtype=byteorder + 'i4', count=1)[0] != 4:
+            raise ValueError('{} is not a binary multi-block Plot3D file'.format(filename))
+        n_blocks = int(np.frombuffer(head, dtype=byteorder + 'i4', count=1, offset=4)[0])
+        dimension = int(np.frombuffer(head, dtype=byteorder + 'i4', count=1, offset=12)[0]) // (4 * n_blocks)
+        if dimension not in (2, 3):
+            raise ValueError('{} is not a binary multi-block Plot3D file'.format(filename))
+        shapes = np.frombuffer(f.read(4 * dimension * n_blocks), dtype=byteorder + 'i4').reshape(n_blocks, dimension)
+        start = 16 + 4 * dimension * n_blocks + 4
+        f.seek(start)
+        itemsize = int(np.frombuffer(f.read(4), dtype=byteorder + 'i4')[0]) // (dimension * int(np.prod(shapes[0])))
+
+    dtype = np.dtype('{}f{}'.format(byteorder, itemsize))
+    names = names if names is not None else ['block_{}'.format(n) for n in range(n_blocks)]
+    if len(names) != n_blocks:
+        raise ValueError('{} names are given for {} blocks'.format(len(names), n_blocks))
+
+    blocks = OrderedDict()
+    for name, shape in zip(names, shapes):
+        size = dimension * int(np.prod(shape))
+        if mmap_mode is None:
+            with open(filename, 'rb') as f:
+                f.seek(start + 4)
+                record = np.fromfile(f, dtype=dtype, count=size)
+        else:
+            record = np.memmap(filename, dtype=dtype, mode=mmap_mode, offset=start + 4, shape=(size,))
+        # Fortran order of (ni, nj[, nk], dimension) is C order of the reversed shape
+        nodes = record.reshape((dimension,) + tuple(shape[::-1])).T
+        blocks[name] = nodes[:, :, 0] if dimension == 3 and shape[2] == 1 else nodes
+        start += 2 * 4 + size * itemsize
+    return blocks
+
+
+if __name__ == '__main__':
+    from directories import DIRS
+    from mesh.generator import read_blocks
+    directory = os.path.join(DIRS['DATA_DIR'], 'mesh', 'RAE2822')
+    print(write(os.path.join(directory, 'RAE2822.xyz'), read_blocks(directory)))
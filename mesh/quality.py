@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" quality.py measures the quality of the cells of structured 2D blocks, either generated by
+:py:class:`mesh.generator.MeshGenerator` or exported from ICEM. All metrics are computed
+for every cell at once from the four corners ``(i, j)``, ``(i + 1, j)``, ``(i + 1, j + 1)`` and ``(i, j + 1)``:
+
+* ``determinant``, smallest over largest corner Jacobian as reported by ICEM, 1 for a parallelogram and <= 0 if folded
+* ``aspect_ratio``, ratio of the longer over the shorter mean edge length
+* ``skewness``, equiangle skewness, 0 for right angles up to 1 for a degenerate cell
+* ``min_angle``, smallest corner angle in degree
+* ``growth_ratio``, largest size ratio with a neighbouring cell along ``i`` or ``j``
+* ``wall_orthogonality``, deviation of the grid lines from the wall normal in degree, only for cells on a wall
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+__all__ = ['METRICS', 'LIMITS', 'cell_metrics', 'summarize', 'passes', 'report']
+
+# Per metric whether a large or small value is worse, and the histogram bins
+METRICS = OrderedDict([
+    ('determinant', ('min', np.linspace(-1., 1., 21))),
+    ('aspect_ratio', ('max', np.logspace(0., 5., 11))),
+    ('skewness', ('max', np.linspace(0., 1., 11))),
+    ('min_angle', ('min', np.linspace(0., 90., 10))),
+    ('growth_ratio', ('max', np.array([1., 1.05, 1.1, 1.15, 1.2, 1.3, 1.5, 2., 3., 5.]))),
+    ('wall_orthogonality', ('max', np.linspace(0., 90., 10)))])
+
+# Number of i-lines of cells that are processed at once
+CHUNK_SIZE = 64
+
+# Default quality gate, since the flow around the RAE2822 does not separate aspect ratios up to 10,000 are acceptable
+LIMITS = {'determinant': 0.2, 'aspect_ratio': 1e4, 'skewness': 0.9, 'min_angle': 10., 'growth_ratio': 1.5,
+          'wall_orthogonality': 15.}
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _dot(a, b):
+    return a[..., 0] * b[..., 0] + a[..., 1] * b[..., 1]
+
+
+def _growth(size, axis):
+    """ Largest ratio between the ``size`` of every cell and its neighbours along ``axis`` """
+    ratio = np.ones_like(size)
+    if size.shape[axis] > 1:
+        lower, upper = [slice(None)] * 2, [slice(None)] * 2
+        lower[axis], upper[axis] = slice(None, -1), slice(1, None)
+        lower, upper = tuple(lower), tuple(upper)
+        step = size[upper] / size[lower]
+        step = np.maximum(step, 1. / step)
+        ratio[lower] = np.maximum(ratio[lower], step)
+        ratio[upper] = np.maximum(ratio[upper], step)
+    return ratio
+
+
+def _corner_metrics(r):
+    """ Metrics of the cells of a strip of nodes that follow from the corners alone, see :py:func:`cell_metrics` """
+    p00, p10, p11, p01 = r[:-1, :-1], r[1:, :-1], r[1:, 1:], r[:-1, 1:]
+    bottom, right, top, left = p10 - p00, p11 - p10, p11 - p01, p01 - p00
+
+    # Corners in counter-clockwise order, each between the edge to the next and the edge to the previous corner
+    edges = ((bottom, left), (right, -bottom), (-top, -right), (-left, top))
+    jacobian = np.stack([_cross(a, b) for a, b in edges])
+    angles = np.degrees(np.arctan2(jacobian, np.stack([_dot(a, b) for a, b in edges])))
+
+    lengths = [np.hypot(edge[..., 0], edge[..., 1]) for edge in (bottom, right, top, left)]
+    size_i, size_j = (lengths[0] + lengths[2]) / 2., (lengths[1] + lengths[3]) / 2.
+    min_angle, max_angle = angles.min(axis=0), angles.max(axis=0)
+    return {'determinant': jacobian.min(axis=0) / np.abs(jacobian).max(axis=0),
+            'aspect_ratio': np.maximum(size_i, size_j) / np.minimum(size_i, size_j),
+            'skewness': np.maximum((max_angle - 90.) / 90., (90. - min_angle) / 90.),
+            'min_angle': min_angle, 'size_i': size_i, 'size_j': size_j,
+            'wall_orthogonality': np.maximum(np.abs(90. - angles[0, :, 0]), np.abs(90. - angles[1, :, 0]))}
+
+
+def cell_metrics(block, wall=False):
+    """ Computes all :py:data:`METRICS` for every cell of a block. Cells are processed in strips of ``CHUNK_SIZE``
+    i-lines such that the intermediate arrays of a strip stay small
+
+    :param numpy.ndarray block: Nodes of shape (ni, nj, 2) or (ni, nj, 3) of which only x and y are used
+    :param bool wall: Toggles computing the ``wall_orthogonality`` of the cells on the ``j = 0`` edge
+    :return: Dictionary of arrays of shape (ni - 1, nj - 1), the wall orthogonality is of shape (ni - 1,)
+    :rtype: collections.OrderedDict
+    """
+    block = np.asarray(block)
+    ni, nj = block.shape[:2]
+    keys = ('determinant', 'aspect_ratio', 'skewness', 'min_angle', 'size_i', 'size_j')
+    cells = dict((key, np.empty((ni - 1, nj - 1))) for key in keys)
+    cells['wall_orthogonality'] = np.empty(ni - 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, ni - 1, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, ni - 1)
+            strip = _corner_metrics(block[start:stop + 1, :, :2].astype(np.float64))
+            for key, value in strip.items():
+                cells[key][start:stop] = value
+
+        metrics = OrderedDict((key, cells[key]) for key in keys[:4])
+        metrics['growth_ratio'] = np.maximum(_growth(cells['size_i'], 0), _growth(cells['size_j'], 1))
+    if wall:
+        metrics['wall_orthogonality'] = cells['wall_orthogonality']
+    return metrics
+
+
+def summarize(blocks, walls=('c_inner',)):
+    """ Summarizes the quality of all blocks of a mesh, for every metric the extremes, the mean, a histogram over all
+    cells and the location of the worst cell are given
+
+    :param collections.OrderedDict blocks: Nodes of every block keyed by name, see
+                                           :py:attr:`mesh.generator.MeshGenerator.blocks`
+    :param tuple walls: Names of the blocks whose ``j = 0`` edge is a wall
+    :rtype: collections.OrderedDict
+    """
+    metrics = OrderedDict((name, cell_metrics(block, wall=name in walls)) for name, block in blocks.items())
+    summary = OrderedDict()
+    for key, (worse, bins) in METRICS.items():
+        values = [(name, metric[key]) for name, metric in metrics.items() if key in metric]
+        if not values:
+            continue
+        counts = sum(np.histogram(np.clip(value, bins[0], bins[-1]), bins=bins)[0] for _, value in values)
+
+        pick = np.nanargmax if worse == 'max' else np.nanargmin
+        extremes = [value.flat[pick(value)] for _, value in values]
+        name, value = values[int(pick(extremes))]
+        index = np.unravel_index(pick(value), value.shape)
+        index = index + (0,) if value.ndim == 1 else index  # Wall cells are on j = 0
+        corners = np.asarray(blocks[name])[index[0]:index[0] + 2, index[1]:index[1] + 2, :2]
+
+        summary[key] = {'min': float(min(np.nanmin(v) for _, v in values)),
+                        'max': float(max(np.nanmax(v) for _, v in values)),
+                        'mean': float(sum(np.nansum(v) for _, v in values) / sum(v.size for _, v in values)),
+                        'histogram': (counts, bins),
+                        'worst': {'block': name, 'index': tuple(int(i) for i in index),
+                                  'value': float(value[index[:value.ndim]]),
+                                  'center': corners.reshape(-1, 2).mean(axis=0)}}
+    return summary
+
+
+def passes(summary, limits=None):
+    """ Gates a mesh on the worst value of every metric
+
+    :param collections.OrderedDict summary: Quality summary, see :py:func:`summarize`
+    :param dict limits: Limits of the metrics (Optional: Defaults to :py:data:`LIMITS`)
+    :return: Whether the mesh passes and a list of the metrics that fail
+    :rtype: tuple
+    """
+    limits = limits if limits is not None else LIMITS
+    failed = []
+    for key, limit in limits.items():
+        if key in summary:
+            worst = summary[key]['worst']['value']
+            if np.isnan(worst) or (worst < limit if METRICS[key][0] == 'min' else worst > limit):
+                failed.append(key)
+    return not failed, failed
+
+
+def report(summary):
+    """ Formats a quality summary as text
+
+    :rtype: str
+    """
+    lines = []
+    for key, item in summary.items():
+        worst = item['worst']
+        lines.append('{:<20} min {:<12.6g} mean {:<12.6g} max {:<12.6g} worst in {} at {} ({:.4f}, {:.4f})'.format(
+            key, item['min'], item['mean'], item['max'], worst['block'], worst['index'], *worst['center']))
+        counts, bins = item['histogram']
+        total = float(max(counts.sum(), 1))
+        for count, low, high in zip(counts, bins[:-1], bins[1:]):
+            lines.append('    [{:>9.4g}, {:>9.4g}) {:>10d} {}'.format(low, high, count,
+                                                                     '#' * int(round(40 * count / total))))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import os
+    from directories import DIRS
+    from mesh.generator import read_blocks
+    print(report(summarize(read_blocks(os.path.join(DIRS['DATA_DIR'], 'mesh', 'RAE2822')))))
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" smoothing.py improves the interior of the blocks of a structured mesh by solving the Winslow equations
+
+    alpha * (r_xixi + phi * r_xi) - 2 * beta * r_xieta + gamma * (r_etaeta + psi * r_eta) = 0
+
+with ``alpha = |r_eta|^2``, ``beta = r_xi . r_eta`` and ``gamma = |r_xi|^2``. The control functions ``phi`` and ``psi``
+of Thomas and Middlecoff are taken from the initial, algebraic, mesh, ``phi`` from its boundaries and ``psi`` from the
+stretching of every j-line, thus the node distributions of the edges and the wall-normal clustering are kept while the
+grid lines straighten and become orthogonal. Boundary nodes are never moved, which keeps the blocks matching at their
+interfaces and allows every block to be smoothed by its own worker process.
+
+Reference: Thompson, J.F., Soni, B.K. and Weatherill, N.P. "Handbook of Grid Generation", CRC Press, 1999, Chapter 4
+"""
+
+import os
+from timeit import default_timer as timer
+from collections import OrderedDict
+from multiprocessing import Pool, cpu_count
+import numpy as np
+from scipy.linalg import solve_banded
+
+__all__ = ['control_functions', 'winslow', 'smooth_blocks', 'smooth_directory']
+
+
+def _derivatives(edge):
+    """ First and second central differences along the first axis of an edge of shape (n, 2), or of a stack of edges of
+    shape (n, m, 2), copied onto the end nodes """
+    d1, d2 = np.zeros_like(edge), np.zeros_like(edge)
+    d1[1:-1] = (edge[2:] - edge[:-2]) / 2.
+    d2[1:-1] = edge[2:] - 2. * edge[1:-1] + edge[:-2]
+    d1[0], d1[-1], d2[0], d2[-1] = d1[1], d1[-2], d2[1], d2[-2]
+    return d1, d2
+
+
+def _dot(a, b):
+    return np.einsum('...k,...k->...', a, b)
+
+
+def _cross(a, b):
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def _control(edge):
+    d1, d2 = _derivatives(edge)
+    return -_dot(d1, d2) / _dot(d1, d1)
+
+
+def control_functions(block, wall=False):
+    """ Control functions of the Winslow equations. ``phi`` follows Thomas and Middlecoff, it is taken from the
+    ``j = 0`` and ``j = nj - 1`` edges and interpolated linearly along ``j``. ``psi`` follows from the stretching of the
+    j-lines of the block itself, it is chosen such that the residual of the initial block is parallel to ``r_xi``,
+
+        psi = -r_xi x (alpha * r_xixi - 2 * beta * r_xieta + gamma * r_etaeta) / (gamma * r_xi x r_eta)
+
+    which reduces to Thomas and Middlecoff on straight, orthogonal grid lines. Thus the wall-normal clustering is kept
+    where it varies along the wall and where the curvature of the wall pulls the j-lines towards it, such as at the
+    leading edge, whereas the nodes remain free to move along the i-lines.
+
+    :param numpy.ndarray block: Nodes of shape (ni, nj, 2)
+    :param bool wall: Toggles blending ``phi`` towards the ``j = 0`` edge into the value for which the initial block
+                      satisfies the equations exactly, see :py:data:`WALL_LAYER`
+    :return: Arrays ``phi`` and ``psi`` of shape (ni, nj)
+    :rtype: tuple[numpy.ndarray]
+    """
+    nj = block.shape[1]
+    eta = np.linspace(0., 1., nj)
+    phi = (1. - eta) * _control(block[:, 0])[:, np.newaxis] + eta * _control(block[:, -1])[:, np.newaxis]
+
+    r_xi, r_xixi = _derivatives(block)
+    r_eta, r_etaeta = (d.transpose(1, 0, 2) for d in _derivatives(block.transpose(1, 0, 2)))
+    r_xieta = _derivatives(r_xi.transpose(1, 0, 2))[0].transpose(1, 0, 2)
+    alpha, beta, gamma = _dot(r_eta, r_eta), _dot(r_xi, r_eta), _dot(r_xi, r_xi)
+    residual = (alpha[..., np.newaxis] * r_xixi - 2. * beta[..., np.newaxis] * r_xieta +
+                gamma[..., np.newaxis] * r_etaeta)
+    jacobian = _cross(r_xi, r_eta)
+    psi = -_cross(r_xi, residual) / (gamma * jacobian)
+    if wall:
+        weight = np.exp(-eta / WALL_LAYER)
+        phi = weight * -_cross(residual, r_eta) / (alpha * jacobian) + (1. - weight) * phi
+    return phi, psi
+
+
+def _interior(n, parity, lowest=1):
+    """ Slices of the interior nodes of the given parity from ``lowest`` onwards along an axis of ``n`` nodes and of
+    their neighbours """
+    start = lowest if lowest % 2 == parity else lowest + 1
+    return slice(start, n - 1, 2), slice(start - 1, n - 2, 2), slice(start + 1, n, 2)
+
+
+# Fraction of the j-lines over which the control functions of a wall block decay to those of Thomas and Middlecoff
+WALL_LAYER = 0.2
+
+# Rate at which ``psi`` is corrected to hold the second cell on a wall and the number of j-lines over which the
+# correction decays by a factor e, see :py:func:`_hold`
+HOLD_RATE, HOLD_DECAY = 0.1, 4.
+
+# Smallest number of nodes along an axis of a coarsened block, see :py:func:`winslow`
+COARSEST = 17
+
+# Sub-lattices of the nodes by parity of ``(i, j)``, red nodes have an even and black nodes an odd ``i + j``
+RED, BLACK = ((1, 1), (0, 0)), ((1, 0), (0, 1))
+
+
+def _sweep(r, source, phi, psi, omega, lattices, first=1):
+    """ Updates the interior nodes of ``r`` on the given sub-lattices from the neighbouring nodes in ``source``, which
+    is ``r`` itself for Gauss-Seidel, and returns the largest displacement relative to the local grid spacing. Nodes
+    before ``j = first`` are held fixed """
+    ni, nj = r.shape[:2]
+    change = 0.
+    for parity_i, parity_j in lattices:
+        c_i, m_i, p_i = _interior(ni, parity_i)
+        c_j, m_j, p_j = _interior(nj, parity_j, first)
+        center = source[c_i, c_j]
+        if center.size == 0:
+            continue
+        east, west, north, south = source[p_i, c_j], source[m_i, c_j], source[c_i, p_j], source[c_i, m_j]
+        cross = (source[p_i, p_j] - source[p_i, m_j] - source[m_i, p_j] + source[m_i, m_j]) / 4.
+        r_xi, r_eta = (east - west) / 2., (north - south) / 2.
+        alpha = np.einsum('ijk,ijk->ij', r_eta, r_eta)[..., np.newaxis]
+        gamma = np.einsum('ijk,ijk->ij', r_xi, r_xi)[..., np.newaxis]
+        beta = np.einsum('ijk,ijk->ij', r_xi, r_eta)[..., np.newaxis]
+        target = (alpha * (east + west + phi[c_i, c_j, np.newaxis] * r_xi) +
+                  gamma * (north + south + psi[c_i, c_j, np.newaxis] * r_eta) -
+                  2. * beta * cross) / (2. * (alpha + gamma))
+        delta = omega * (target - center)
+        scale = np.sqrt(np.minimum(alpha, gamma))[..., 0]
+        change = max(change, float(np.max(np.hypot(delta[..., 0], delta[..., 1]) / scale)))
+        r[c_i, c_j] = center + delta
+    return change
+
+
+def _tridiagonal(lower, diagonal, upper, rhs):
+    """ Solves a stack of independent tridiagonal systems along axis 1 at once. The coefficients are of shape (m, n) and
+    the right-hand sides of shape (m, n, k), the systems are joined into a single banded system of size m * n as
+    ``lower[:, 0]`` and ``upper[:, -1]`` are zero """
+    m, n = diagonal.shape
+    banded = np.empty((3, m * n))
+    banded[0, 1:], banded[1], banded[2, :-1] = upper.ravel()[:-1], diagonal.ravel(), lower.ravel()[1:]
+    banded[0, 0], banded[2, -1] = 0., 0.
+    return solve_banded((1, 1), banded, rhs.reshape(m * n, -1), overwrite_ab=True, overwrite_b=True,
+                        check_finite=False).reshape(rhs.shape)
+
+
+def _line_sweep(r, phi, psi, omega, parity, first=1, lowest=1):
+    """ Updates the interior nodes of every other i-line of ``r`` in place by solving the Winslow equations implicitly
+    along the line, i.e. along ``j``, and returns the largest displacement relative to the local grid spacing. Lines
+    along ``i`` are swept by passing the transposed block and control functions.
+
+    :param int first: First node of the lines that is updated, nodes before it are held fixed
+    :param int lowest: First line that is updated, lines before it are held fixed
+    """
+    ni, nj = r.shape[:2]
+    c_i, m_i, p_i = _interior(ni, parity, lowest)
+    center, east, west = r[c_i], r[p_i], r[m_i]
+    if center.shape[0] == 0 or first > nj - 2:
+        return 0.
+    rows = slice(first, nj - 1)
+    north, south = center[:, first + 1:], center[:, first - 1:-2]
+
+    r_xi, r_eta = (east[:, rows] - west[:, rows]) / 2., (north - south) / 2.
+    alpha = np.einsum('ijk,ijk->ij', r_eta, r_eta)
+    gamma = np.einsum('ijk,ijk->ij', r_xi, r_xi)
+    beta = np.einsum('ijk,ijk->ij', r_xi, r_eta)
+    cross = (east[:, first + 1:] - east[:, first - 1:-2] - west[:, first + 1:] + west[:, first - 1:-2]) / 4.
+    psi_line = psi[c_i, rows]
+
+    lower, upper = -gamma * (1. - psi_line / 2.), -gamma * (1. + psi_line / 2.)
+    rhs = (alpha[..., np.newaxis] * (east[:, rows] + west[:, rows] + phi[c_i, rows, np.newaxis] * r_xi) -
+           2. * beta[..., np.newaxis] * cross)
+    rhs[:, 0] -= lower[:, 0, np.newaxis] * center[:, first - 1]
+    rhs[:, -1] -= upper[:, -1, np.newaxis] * center[:, -1]
+    lower[:, 0], upper[:, -1] = 0., 0.
+
+    old = center[:, rows]
+    delta = omega * (_tridiagonal(lower, 2. * (alpha + gamma), upper, rhs) - old)
+    scale = np.sqrt(np.minimum(alpha, gamma))
+    r[c_i, rows] = old + delta
+    return float(np.max(np.hypot(delta[..., 0], delta[..., 1]) / scale))
+
+
+def _hold(r, psi, targets):
+    """ Corrects ``psi`` in place such that the height of the second cell on the wall approaches its height in the
+    initial block, the correction is largest on the wall and decays into the block (Hilgenstock, A. "A Fast Method for
+    the Elliptic Generation of Three-Dimensional Grids with Full Boundary Control", Numerical Grid Generation in
+    Computational Fluid Mechanics '88, 1988). Together with the first interior line, which is held on the wall normals,
+    this keeps the first cell heights, the growth ratio on the wall and the orthogonality of the initial block """
+    heights = np.hypot(*(r[1:-1, 2] - r[1:-1, 1]).T)
+    error = np.clip((targets - heights) / targets, -0.1, 0.1)
+    decay = np.exp(-np.arange(psi.shape[1] - 1) / HOLD_DECAY)
+    psi[1:-1, 1:] += HOLD_RATE * error[:, np.newaxis] * decay
+
+
+def winslow(block, iterations=500, omega=1.6, tolerance=1e-3, wall=False, method='line', levels=4, out=None):
+    """ Smooths a block by relaxation sweeps over the Winslow equations, see the module docstring. Strongly
+    stretched blocks, such as boundary-layer blocks, converge far quicker with line relaxation as the stiff direction
+    of such a block is solved implicitly. Large blocks are first smoothed on a coarser block holding every other node,
+    the displacement of the coarse nodes is then interpolated onto the initial block such that the sweeps on the fine
+    block only have to remove the local error (nested iteration)
+
+    :param numpy.ndarray block: Nodes of shape (ni, nj, 2), boundary nodes are kept fixed
+    :param int iterations: Maximum number of sweeps
+    :param float omega: Relaxation factor, values between 1 and 2 over-relax
+    :param float tolerance: Convergence criterion on the largest displacement of a sweep relative to the local spacing
+    :param bool wall: Toggles keeping the grid lines orthogonal to the ``j = 0`` edge, the first interior line is then
+                      placed along the wall normals at the height of the first cell of the initial block and the
+                      height of the second cell is held by correcting ``psi``, see :py:func:`_hold`
+    :param str method: Relaxation method, ``'line'`` for alternating zebra line SOR, ``'point'`` for red-black point
+                       SOR or ``'jacobi'`` for (weighted) point Jacobi
+    :param int levels: Maximum number of coarser blocks, a block is only coarsened if both ``ni - 1`` and ``nj - 1`` are
+                       even and it keeps at least ``COARSEST`` nodes along both axes
+    :param numpy.ndarray out: Array the smoothed block is written to, e.g. ``block`` itself or a memory-map (Optional)
+    :return: The smoothed block and a dictionary holding the number of ``iterations``, the final ``residual`` and
+             whether the sweeps ``converged``
+    :rtype: tuple
+    """
+    if method not in ('line', 'point', 'jacobi'):
+        raise ValueError('{} is not a valid relaxation method'.format(method))
+    block = np.asarray(block, dtype=np.float64)
+    r = block.copy()
+    ni, nj = r.shape[:2]
+    if levels > 0 and (ni - 1) % 2 == 0 and (nj - 1) % 2 == 0 and min(ni, nj) >= 2 * COARSEST - 1:
+        coarse, _ = winslow(r[::2, ::2], iterations, omega, tolerance, wall, method, levels - 1)
+        displacement = np.zeros_like(r)
+        displacement[::2, ::2] = coarse - r[::2, ::2]
+        displacement[1::2, ::2] = (displacement[:-1:2, ::2] + displacement[2::2, ::2]) / 2.
+        displacement[:, 1::2] = (displacement[:, :-1:2] + displacement[:, 2::2]) / 2.
+        r += displacement
+
+    phi, psi = control_functions(block, wall)
+    r_t, phi_t, psi_t = r.transpose(1, 0, 2), phi.T, psi.T
+
+    first = 2 if wall else 1  # The j = 1 line at a wall is held fixed
+    if wall:
+        tangents, _ = _derivatives(r[:, 0])
+        normals = np.column_stack((-tangents[1:-1, 1], tangents[1:-1, 0]))
+        normals /= np.hypot(normals[:, 0], normals[:, 1])[:, np.newaxis]
+        heights = np.hypot(*(block[1:-1, 1] - block[1:-1, 0]).T)
+        r[1:-1, 1] = r[1:-1, 0] + normals * heights[:, np.newaxis]
+        targets = np.hypot(*(block[1:-1, 2] - block[1:-1, 1]).T)
+
+    residual, iteration = np.inf, 0
+    for iteration in range(1, iterations + 1):
+        if method == 'line':
+            # Alternating between lines along j and along i
+            residual = max([_line_sweep(r, phi, psi, omega, parity, first=first) for parity in (1, 0)] +
+                           [_line_sweep(r_t, psi_t, phi_t, omega, parity, lowest=first) for parity in (1, 0)])
+        elif method == 'point':
+            residual = max(_sweep(r, r, phi, psi, omega, RED, first), _sweep(r, r, phi, psi, omega, BLACK, first))
+        else:
+            residual = _sweep(r, r.copy(), phi, psi, omega, RED + BLACK, first)
+        if wall:
+            _hold(r, psi, targets)
+        if residual < tolerance:
+            break
+
+    if out is not None:
+        out[...] = r
+        r = out
+    return r, {'iterations': iteration, 'residual': residual, 'converged': bool(residual < tolerance)}
+
+
+def _smooth(task):
+    """ Smooths a single block, given either as an array or as the path of a ``.npy`` file that is updated in place """
+    name, block, options = task
+    start = timer()
+    if isinstance(block, str):
+        block = np.load(block, mmap_mode='r+')
+        _, info = winslow(block, out=block, **options)
+        block.flush()
+        block = None
+    else:
+        block, info = winslow(block, **options)
+    info['time'] = timer() - start
+    return name, block, info
+
+
+def _run(tasks, processes):
+    processes = min(processes if processes is not None else cpu_count(), len(tasks))
+    if processes <= 1:
+        return [_smooth(task) for task in tasks]
+    pool = Pool(processes)
+    try:
+        return pool.map(_smooth, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def smooth_blocks(blocks, walls=('c_inner',), processes=None, **options):
+    """ Smooths all blocks of a mesh with a pool of worker processes, one block per task
+
+    :param collections.OrderedDict blocks: Nodes of every block keyed by name, see
+                                           :py:attr:`mesh.generator.MeshGenerator.blocks`
+    :param tuple walls: Names of the blocks whose ``j = 0`` edge is a wall, see :py:func:`winslow`
+    :param int processes: Number of worker processes (Optional: Defaults to the number of CPUs, 1 smooths serially)
+    :param options: Keyword arguments of :py:func:`winslow`
+    :return: Smoothed blocks and the convergence information of every block
+    :rtype: tuple[collections.OrderedDict]
+    """
+    tasks = [(name, block, dict(options, wall=name in walls)) for name, block in blocks.items()]
+    results = _run(tasks, processes)
+    return (OrderedDict((name, block) for name, block, _ in results),
+            OrderedDict((name, info) for name, _, info in results))
+
+
+def smooth_directory(directory, walls=('c_inner',), processes=None, **options):
+    """ Smooths the blocks written by :py:meth:`mesh.generator.MeshGenerator.write` in place, every worker process
+    memory-maps its own block such that no nodes are sent between processes
+
+    :param str directory: Directory holding the ``index.json`` of the mesh
+    :return: Convergence information of every block
+    :rtype: collections.OrderedDict
+    """
+    from mesh.generator import read_blocks
+    names = list(read_blocks(directory).keys())
+    tasks = [(name, os.path.join(directory, name + '.npy'), dict(options, wall=name in walls)) for name in names]
+    return OrderedDict((name, info) for name, _, info in _run(tasks, processes))
+
+
+if __name__ == '__main__':
+    from directories import DIRS
+    for block_name, block_info in smooth_directory(os.path.join(DIRS['DATA_DIR'], 'mesh', 'RAE2822')).items():
+        print('{}: {}'.format(block_name, block_info))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" spacing.py plans the wall-normal spacing of the mesh before any flow solution exists. The wall shear stress is
+estimated from the turbulent skin friction of a flat plate with the length of the chord, after which the height of the
+first cell follows from the target y+ as in :py:mod:`analysis.yplus`
+
+    y / c = y+ * (mu_w / mu) * sqrt(T_w / T) / (Re * sqrt(Cf / 2))
+
+where the wall quantities hold at the adiabatic wall temperature ``T_w``. Heights are normalized by the chord, the
+same as the geometry, thus only the Reynolds and Mach number are needed.
+"""
+
+from collections import OrderedDict
+import numpy as np
+from scipy.optimize import brentq
+from analysis.inflow import gamma, t_total, mach as MACH, Re, S
+from mesh.distribution import geometric, one_sided
+from utils import Attribute, Input
+
+__all__ = ['SpacingPlanner', 'skin_friction']
+
+# Recovery factor of a turbulent boundary layer, ~Pr^(1/3)
+RECOVERY_FACTOR = 0.89
+
+
+def skin_friction(reynolds, mach=0., correlation='schlichting'):
+    """ Local turbulent skin friction coefficient of a flat plate
+
+    :param reynolds: Reynolds number based on the distance to the leading edge, array-like
+    :param mach: Mach number, array-like, the incompressible value is reduced by ``(1 + 0.144 M^2)^-0.65``
+    :param str correlation: ``'schlichting'``, ``(2 log10(Re) - 0.65)^-2.3``, ``'white'``, ``0.455 / ln(0.06 Re)^2``
+                            or ``'prandtl'``, ``0.0576 Re^-1/5``
+    :rtype: numpy.ndarray
+    """
+    reynolds = np.asarray(reynolds, dtype=np.float64)
+    if correlation == 'schlichting':
+        cf = (2. * np.log10(reynolds) - 0.65) ** -2.3
+    elif correlation == 'white':
+        cf = 0.455 / np.log(0.06 * reynolds) ** 2
+    elif correlation == 'prandtl':
+        cf = 0.0576 * reynolds ** -0.2
+    else:
+        raise ValueError('{} is not a valid skin friction correlation'.format(correlation))
+    return cf * (1. + 0.144 * np.asarray(mach, dtype=np.float64) ** 2) ** -0.65
+
+
+class SpacingPlanner(object):
+
+    y_plus, reynolds, mach, growth_ratio = Input(), Input(), Input(), Input()
+    correlation = Input()
+
+    parameters = ('y_plus', 'reynolds', 'mach', 'growth_ratio')
+
+    def __init__(self, y_plus=(1.,), reynolds=(Re,), mach=(MACH,), growth_ratio=(1.2,), correlation='schlichting'):
+        """ Plans the wall-normal spacing for every combination of the given values at once, all results are arrays of
+        shape ``(len(y_plus), len(reynolds), len(mach), len(growth_ratio))``
+
+        :param collections.Sequence y_plus: Target y+ of the first cell
+        :param collections.Sequence reynolds: Reynolds numbers based on the chord
+        :param collections.Sequence mach: Free-stream Mach numbers
+        :param collections.Sequence growth_ratio: Ratios of the heights of adjacent cells in the boundary layer
+        :param str correlation: Skin friction correlation, see :py:func:`skin_friction`
+        """
+        self.y_plus, self.reynolds, self.mach, self.growth_ratio = y_plus, reynolds, mach, growth_ratio
+        self.correlation = correlation
+
+    @Attribute
+    def grid(self):
+        """ Every parameter broadcast to the shape of the results
+
+        :rtype: dict
+        """
+        values = [np.atleast_1d(np.asarray(getattr(self, key), dtype=np.float64)) for key in self.parameters]
+        return dict(zip(self.parameters, np.meshgrid(*values, indexing='ij')))
+
+    @property
+    def shape(self):
+        return self.grid['y_plus'].shape
+
+    @Attribute
+    def skin_friction(self):
+        return skin_friction(self.grid['reynolds'], self.grid['mach'], self.correlation)
+
+    @Attribute
+    def temperature_ratio(self):
+        """ Ratio of the adiabatic wall temperature over the static free-stream temperature """
+        return 1. + RECOVERY_FACTOR * (gamma - 1.) / 2. * self.grid['mach'] ** 2
+
+    @Attribute
+    def viscosity_ratio(self):
+        """ Ratio of the dynamic viscosity at the wall over the free-stream viscosity following Sutherland's Law, the
+        free-stream temperature follows from the total temperature of :py:mod:`analysis.inflow` """
+        t_static = t_total / (1. + (gamma - 1.) / 2. * self.grid['mach'] ** 2)
+        ratio = self.temperature_ratio
+        return ratio ** 1.5 * (t_static + S) / (ratio * t_static + S)
+
+    @Attribute
+    def first_cell(self):
+        """ Height of the first cell normalized by the chord
+
+        :rtype: numpy.ndarray
+        """
+        return (self.grid['y_plus'] * self.viscosity_ratio * np.sqrt(self.temperature_ratio) /
+                (self.grid['reynolds'] * np.sqrt(self.skin_friction / 2.)))
+
+    @Attribute
+    def boundary_layer(self):
+        """ Turbulent boundary-layer thickness at the trailing edge normalized by the chord, ``0.37 Re^-1/5`` """
+        return 0.37 * self.grid['reynolds'] ** -0.2
+
+    def layers(self, height=None):
+        """ Number of cells with a geometric growth from the first cell up to ``height``
+
+        :param height: Height normalized by the chord, scalar or array (Optional: Defaults to the boundary layer)
+        :rtype: numpy.ndarray
+        """
+        height = self.boundary_layer if height is None else np.broadcast_to(height, self.shape)
+        ratio, first = self.grid['growth_ratio'], self.first_cell
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = np.where(ratio == 1., height / first, np.log1p(height / first * (ratio - 1.)) / np.log(ratio))
+        return np.ceil(n - 1e-9).astype(np.int64)
+
+    def distribution(self, index, length, law='geometric', n=None):
+        """ Normalized wall-normal node distribution of a single combination over an edge of ``length``, which can be
+        passed straight to the edges of :py:class:`mesh.generator.MeshGenerator`
+
+        :param tuple index: Index of the combination into the result arrays, see :py:meth:`plan`
+        :param float length: Length of the edge normalized by the chord, e.g. the refinement distance of the blocking
+        :param str law: ``'geometric'`` grows every cell by the same ratio, which is lowered from the growth ratio such
+                        that a whole number of cells closes ``length`` exactly. ``'tanh'`` clusters ``n`` nodes with
+                        the same first cell by :py:func:`mesh.distribution.one_sided`
+        :param int n: Number of nodes of the ``'tanh'`` law (Optional: Defaults to the geometric number of nodes)
+        :rtype: numpy.ndarray
+        """
+        first, ratio = self.first_cell[index] / length, self.grid['growth_ratio'][index]
+        cells = max(int(self.layers(length)[index]), 1)
+
+        def closure(g):
+            return (first * cells if g == 1. else first * np.expm1(cells * np.log(g)) / (g - 1.)) - 1.
+
+        # The rounded up number of cells overshoots the length at the growth ratio, thus the closing ratio is lower
+        closing = brentq(closure, 1e-3, ratio) if cells > 1 and closure(ratio) > 0. else ratio
+        if law == 'geometric':
+            return geometric(cells + 1, closing)
+        elif law == 'tanh':
+            return one_sided(n if n is not None else cells + 1, first)
+        raise ValueError('{} is not a valid distribution law'.format(law))
+
+    def plan(self, length=None, law='geometric'):
+        """ Plans every combination at once
+
+        :param float length: Length of the wall-normal edge normalized by the chord (Optional: If provided the node
+                             distribution over the edge is included)
+        :param str law: Distribution law, see :py:meth:`distribution`
+        :return: One dictionary per combination holding the parameters, the ``first_cell`` height, the number of
+                 boundary-layer ``layers`` and optionally the ``nodes`` of the distribution
+        :rtype: list[collections.OrderedDict]
+        """
+        layers = self.layers()
+        rows = []
+        for index in np.ndindex(*self.shape):
+            row = OrderedDict((key, float(self.grid[key][index])) for key in self.parameters)
+            row['first_cell'], row['layers'] = float(self.first_cell[index]), int(layers[index])
+            if length is not None:
+                row['nodes'] = self.distribution(index, length, law)
+            rows.append(row)
+        return rows
+
+    def generator_options(self, length, index=(0, 0, 0, 0)):
+        """ Options of :py:class:`mesh.generator.MeshGenerator` for a combination, the inner layer of the mesh gets the
+        planned first cell and as many nodes as the geometric law needs over ``length``
+
+        :param float length: Thickness of the inner layer normalized by the chord, i.e. the refinement distance
+        :rtype: dict
+        """
+        return {'first_cell': float(self.first_cell[index]), 'n_inner': self.distribution(index, length).size}
+
+
+if __name__ == '__main__':
+    planner = SpacingPlanner(y_plus=(0.5, 1.), reynolds=(3e6, 6e6, 9e6), mach=(0.729,), growth_ratio=(1.1, 1.2))
+    for case in planner.plan():
+        print(', '.join('{} = {:.6g}'.format(key, value) for key, value in case.items()))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Checks that copies of an instance never share the cached values of :py:class:`utils.Attribute` """
+
+import copy
+import pickle
+import numpy as np
+from geometry.airfoil import Airfoil
+from utils import Attribute, Input
+
+
+class Square(object):
+
+    side = Input()
+
+    def __init__(self, side):
+        self.side = side
+
+    @Attribute
+    def area(self):
+        return self.side ** 2
+
+
+def test_shallow_copy():
+    original = Square(2.)
+    assert original.area == 4.
+    duplicate = copy.copy(original)
+    duplicate.side = 3.
+    assert duplicate.area == 9.
+    assert original.area == 4.
+
+
+def test_deep_copy_and_pickle():
+    original = Square(2.)
+    assert original.area == 4.
+    for duplicate in (copy.deepcopy(original), pickle.loads(pickle.dumps(original))):
+        duplicate.side = 3.
+        assert duplicate.area == 9.
+        assert original.area == 4.
+
+
+def test_shallow_copy_airfoil():
+    original = Airfoil()
+    ordinates = original.ordinates
+    duplicate = copy.copy(original)
+    duplicate.angle = 5.
+    assert duplicate.ordinates is not ordinates
+    assert original.angle == 0.
+    assert original.ordinates is ordinates
+    np.testing.assert_array_equal(original.ordinates['top'].xyz, Airfoil().ordinates['top'].xyz)
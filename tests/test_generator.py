@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Checks the mesh generated with the default settings against the quality gate of :py:mod:`mesh.quality` """
+
+import numpy as np
+import pytest
+from geometry.airfoil import Airfoil
+from geometry.domain import Domain
+from geometry.blocking import Blocking
+from mesh.generator import MeshGenerator
+from mesh.quality import summarize, passes
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return MeshGenerator(Blocking(Domain(Airfoil(angle=2.31), upstream=13., top=13., bottom=13., wake=20.)))
+
+
+def test_default_mesh_passes(generator):
+    assert passes(summarize(generator.blocks)) == (True, [])
+
+
+def test_first_cell_height(generator):
+    block = generator.blocks['c_inner']
+    heights = np.hypot(*(block[:, 1] - block[:, 0]).T)
+    np.testing.assert_allclose(heights, generator.first_cell, rtol=1e-3)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Checks the cell counts of the blocking files of ``ICEM/GoodMesh`` against the mesh written by ICEM """
+
+import os
+from mesh.icem import BlockingFile
+
+COARSE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ICEM', 'GoodMesh',
+                      'RAE2822_Coarse.blk')
+
+
+def test_extrusion_direction():
+    assert BlockingFile(COARSE).dimension == {'geometry': 3, 'mesh': 3, 'third': 2}
+
+
+def test_block_cells_skip_extrusion_axis():
+    blocking = BlockingFile(COARSE)
+    cells = dict((block['id'], n) for block, n in zip(blocking.superblocks, blocking.block_cells()))
+    assert cells[58] == 551  # The extrusion direction is the first block axis of block 58
+
+
+def test_cell_count():
+    assert BlockingFile(COARSE).cell_count() == 5508
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018 San Kilkis
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Checks that Winslow smoothing keeps the wall clustering of the boundary-layer block """
+
+import numpy as np
+import pytest
+from geometry.airfoil import Airfoil
+from geometry.domain import Domain
+from geometry.blocking import Blocking
+from mesh.generator import MeshGenerator
+from mesh.quality import summarize, passes
+from mesh.smoothing import winslow, smooth_blocks
+
+
+def _heights(block):
+    """ Heights of the first two cells on the wall of shape (ni, 2) """
+    return np.hypot(*np.diff(block[:, :3], axis=1).transpose(2, 0, 1))
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return MeshGenerator(Blocking(Domain(Airfoil(angle=2.31), upstream=13., top=13., bottom=13., wake=20.)))
+
+
+@pytest.fixture(scope='module')
+def smoothed(generator):
+    block, info = winslow(generator.blocks['c_inner'], wall=True)
+    assert info['converged']
+    return block
+
+
+def test_first_cell_height(generator, smoothed):
+    np.testing.assert_allclose(_heights(smoothed)[:, 0], _heights(generator.blocks['c_inner'])[:, 0], rtol=1e-6)
+
+
+def test_wall_growth_ratio(generator, smoothed):
+    initial, final = _heights(generator.blocks['c_inner']), _heights(smoothed)
+    np.testing.assert_allclose(final[:, 1] / final[:, 0], initial[:, 1] / initial[:, 0], rtol=1e-2)
+
+
+def test_smoothed_mesh_passes(generator):
+    blocks, _ = smooth_blocks(generator.blocks, processes=1)
+    assert passes(summarize(blocks)) == (True, [])
@@ -1 +1 @@
-from attribute import Attribute
+from attribute import Attribute, Input, statistics, reset_statistics
@@ -1,63 +1,266 @@
+import threading
+import weakref
+from timeit import default_timer as timer
+
+__all__ = ['Attribute', 'Input', 'SettableProperty', 'statistics', 'reset_statistics']
+
+# Guards the bookkeeping of the dependency graphs of all instances, it is never held while a value is computed
+_LOCK = threading.RLock()
+
+# Per-thread stacks of the nodes currently being computed, the top of the stack records what is read, and of the time
+# spent in the attributes these nodes computed in turn
+_LOCAL = threading.local()
+
+_MISSING = object()
+
 
 class SettableProperty(property):
 
     __setattr__ = property.fset
 
 
+class _Node(object):
+    """ Vertex of the dependency graph holding the state of a single attribute of a single instance. Dependents are
+    referenced weakly, thus an instance that reads the attributes of another instance does not keep itself alive
+    through the other instance's graph """
+
+    __slots__ = ['value', 'valid', 'stale', 'lock', 'dependencies', 'dependents', '__weakref__']
+
+    def __init__(self):
+        self.value, self.valid, self.stale = None, False, False
+        self.lock = threading.RLock()  # Held while the value is computed, thus every value is computed once
+        self.dependencies, self.dependents = set(), weakref.WeakSet()
+
+    def release(self):
+        """ Forgets the recorded dependencies of this node """
+        for dependency in self.dependencies:
+            dependency.dependents.discard(self)
+        self.dependencies = set()
+
+    def invalidate(self):
+        """ Invalidates all nodes that depend on this node, transitively. A node that is being computed at the same time
+        is marked stale, such that the value it computes from the old state is not cached """
+        stack = list(self.dependents)
+        while stack:
+            node = stack.pop()
+            if node.valid:
+                node.value, node.valid = None, False
+                node.release()
+                stack.extend(node.dependents)
+            else:
+                node.stale = True
+
+
+class _Graph(object):
+    """ Per-instance store of the nodes keyed by attribute name. Cached values are rebuilt on demand, thus the graph is
+    deliberately emptied when an instance is pickled or copied. A graph is bound to its owner by a weak reference, a
+    shallow copy of an instance shares the graph of the original through its ``__dict__`` and thus gets a new one """
+
+    __slots__ = ['nodes', 'owner']
+
+    def __init__(self, owner=None):
+        self.nodes = {}
+        self.owner = weakref.ref(owner) if owner is not None else None
+
+    def __reduce__(self):
+        return _Graph, ()
+
+    def __copy__(self):
+        return _Graph()
+
+
+def _node(instance, name):
+    graph = instance.__dict__.get('__reactive__')
+    if graph is None or graph.owner is None or graph.owner() is not instance:
+        graph = instance.__dict__['__reactive__'] = _Graph(instance)
+    node = graph.nodes.get(name)
+    if node is None:
+        node = graph.nodes.setdefault(name, _Node())
+    return node
+
+
+def _stack():
+    stack = getattr(_LOCAL, 'stack', None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+def _frames():
+    frames = getattr(_LOCAL, 'frames', None)
+    if frames is None:
+        frames = _LOCAL.frames = []
+    return frames
+
+
+def _track(node):
+    """ Records that the attribute currently being computed, if any, reads ``node`` """
+    stack = _stack()
+    if stack:
+        caller = stack[-1]
+        caller.dependencies.add(node)
+        node.dependents.add(caller)
+
+
+def _changed(old, new):
+    if old is new:
+        return False
+    try:
+        return bool(old != new)
+    except (TypeError, ValueError):  # Arrays and other objects w/o a single truth value
+        return True
+
+
+class Input(object):
+    """ A descriptor for a plain instance attribute that is read by :py:class:`Attribute` values. Assigning a new value
+    invalidates every cached :py:class:`Attribute` that read it, directly or through other attributes.
+
+    >>> class Wing(object):
+    ...     span = Input()
+    ...
+    ...     @Attribute
+    ...     def half_span(self):
+    ...         return self.span / 2.
+    """
+
+    def __init__(self, name=None):
+        self.__name__ = name
+
+    def __set_name__(self, owner, name):
+        self.__name__ = name
+
+    def name(self, owner):
+        """ Returns the attribute name, looked up on the owner class if not given explicitly (Python 2) """
+        if self.__name__ is None:
+            for cls in owner.__mro__:
+                for key, value in vars(cls).items():
+                    if value is self:
+                        self.__name__ = key
+        return self.__name__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        name = self.name(owner)
+        with _LOCK:
+            _track(_node(instance, name))
+        try:
+            return instance.__dict__[name]
+        except KeyError:
+            raise AttributeError("'{}' object has no attribute '{}'".format(owner.__name__, name))
+
+    def __set__(self, instance, value):
+        name = self.name(type(instance))
+        with _LOCK:
+            old = instance.__dict__.get(name, _MISSING)
+            instance.__dict__[name] = value
+            if old is _MISSING or _changed(old, value):
+                _node(instance, name).invalidate()
+
+
 class Attribute(object):
-    """ A decorator that is used for lazy evaluation of an object attribute.
-    property should represent immutable data, as it replaces itself.
+    """ A decorator that is used for lazy evaluation of an object attribute. While the value is computed every
+    :py:class:`Input` and :py:class:`Attribute` that is read, also those of other instances, is recorded. Once one of
+    these changes the value is invalidated and computed again upon the next access, thus only the values affected by a
+    change are recomputed. Assigning to the attribute overrides its value until it is deleted.
+
+    Every value is computed while holding a lock of its own, thus attributes of different instances, or different
+    attributes of one instance, are computed concurrently from multiple threads whereas a single value is computed once.
+    Hit, miss and compute-time counts are kept per attribute, the compute-time excludes the time spent computing the
+    attributes that are read, see :py:func:`statistics`.
 
-    .. NOTE: I AM NOT THE ORIGINAL AUTHOR, THIS IS FROM JACK MANEY'S REPO
+    .. NOTE: Based on the lazy property of Jack Maney's repo
 
     https://github.com/jackmaney/lazy-property/blob/master/lazy_property/__init__.py
     """
 
-    __slots__ = ['method', '__name__']
+    registry = []
 
     def __init__(self, method):
         self.method = method
         self.__name__ = method.__name__
+        self.__doc__ = method.__doc__
+        self.qualname = getattr(method, '__qualname__', method.__name__)
+        self.hits, self.misses, self.compute_time = 0, 0, 0.
+        Attribute.registry.append(self)
 
-    # def __init__(self, method, fget=None, fset=None, fdel=None, doc=None):
-    #     self.method = method
-    #     self.cache_name = "_{}".format(self.method.__name__)
-    #
-    #     doc = doc or method.__doc__
-    #     super(self.__class__, self).__init__(fget=fget, fset=fset, fdel=fdel, doc=doc)
-    #
-    #     update_wrapper(self, method)
-#
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        value = self.method(instance)
-        setattr(instance, self.__name__, value)
-        return value
-
-    # def __get__(self, instance, owner=None):
-    #
-    #     if instance is None:
-    #         return self
-    #
-    #     if hasattr(instance, self.cache_name):
-    #         result = getattr(instance, self.cache_name)
-    #     else:
-    #         if self.fget is not None:
-    #             result = self.fget(instance)
-    #         else:
-    #             result = self.method(instance)
-    #
-    #         setattr(instance, self.cache_name, result)
-    #
-    #     return result
-    #
-    # def __set__(self, instance, value):
-    #
-    #     if instance is None:
-    #         raise AttributeError
-    #
-    #     if self.fset is None:
-    #         setattr(instance, self.cache_name, value)
-    #     else:
-    #         self.fset(instance, value)
\ No newline at end of file
+        with _LOCK:
+            node = _node(instance, self.__name__)
+            _track(node)
+            if node.valid:
+                self.hits += 1
+                return node.value
+
+        with node.lock:
+            with _LOCK:
+                if node.valid:  # Computed by another thread in the meantime
+                    self.hits += 1
+                    return node.value
+                self.misses += 1
+                node.stale = False
+
+            stack, frames = _stack(), _frames()
+            stack.append(node)
+            frames.append(0.)
+            start = timer()
+            try:
+                value = self.method(instance)
+            except Exception:
+                with _LOCK:
+                    node.release()
+                raise
+            finally:
+                stack.pop()
+                elapsed = timer() - start
+                children = frames.pop()
+                if frames:
+                    frames[-1] += elapsed
+                with _LOCK:
+                    self.compute_time += elapsed - children
+
+            with _LOCK:
+                if node.stale:  # An input that was read changed while computing, the value is outdated already
+                    node.release()
+                else:
+                    node.value, node.valid = value, True
+            return value
+
+    def __set__(self, instance, value):
+        with _LOCK:
+            node = _node(instance, self.__name__)
+            node.release()
+            node.value, node.valid = value, True
+            node.invalidate()
+
+    def __delete__(self, instance):
+        with _LOCK:
+            node = _node(instance, self.__name__)
+            node.release()
+            node.value, node.valid = None, False
+            node.invalidate()
+
+    @property
+    def statistics(self):
+        """ Number of cache ``hits``, ``misses`` and the total ``compute_time`` in seconds of this attribute
+
+        :rtype: dict
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'compute_time': self.compute_time}
+
+
+def statistics():
+    """ Returns the :py:attr:`Attribute.statistics` of all attributes keyed by their qualified name
+
+    :rtype: dict
+    """
+    with _LOCK:
+        return {attribute.qualname: attribute.statistics for attribute in Attribute.registry}
+
+
+def reset_statistics():
+    with _LOCK:
+        for attribute in Attribute.registry:
+            attribute.hits, attribute.misses, attribute.compute_time = 0, 0, 0.